@@ -0,0 +1,107 @@
+"""Запуск бенчмарков и сравнение с сохранённым baseline.
+
+Из корня репозитория:
+
+    PYTHONPATH=src python -m benchmarks                  # все кейсы
+    PYTHONPATH=src python -m benchmarks --quick -k stv   # быстрый прогон части кейсов
+    PYTHONPATH=src python -m benchmarks --update-baseline
+
+Результаты пишутся в benchmarks/results/latest.json. Медиана каждого замера
+сравнивается с benchmarks/baseline.json; замедление больше --threshold
+считается регрессией, и процесс завершается с кодом 1.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.cases import CASES, Options
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+
+def run(opts: Options, only: list[str]) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name, fn in CASES.items():
+        if only and not any(k in name for k in only):
+            continue
+        print(f"[{name}]", file=sys.stderr, flush=True)
+        for res in fn(opts):
+            results[res.name] = res.summary()
+            print(f"  {res.name:<40} median {res.summary()['median'] * 1e3:10.3f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "created_at": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "quick": opts.quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions = []
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"  {name:<40} (нет в baseline)")
+            continue
+        ratio = res["median"] / base["median"] if base["median"] else float("inf")
+        mark = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"  {name:<40} {base['median'] * 1e3:10.3f} -> {res['median'] * 1e3:10.3f} ms  x{ratio:5.2f} {mark}")
+        if mark:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", dest="only", action="append", default=[], help="фильтр по имени кейса")
+    parser.add_argument("--quick", action="store_true", help="меньше повторов и тиков")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое замедление медианы")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    current = run(Options(quick=args.quick), args.only)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(current, indent=2, ensure_ascii=False))
+
+    if args.update_baseline:
+        previous = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        merged = {
+            "meta": current["meta"],
+            "results": {**previous.get("results", {}), **current["results"]},
+        }
+        args.baseline.write_text(json.dumps(merged, indent=2, ensure_ascii=False))
+        print(f"baseline обновлён: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"baseline не найден ({args.baseline}), сравнение пропущено")
+        return 0
+
+    regressions = compare(current, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"регрессии: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
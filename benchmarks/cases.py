@@ -0,0 +1,540 @@
+"""Бенчмарки ML-пайплайна и ingest.
+
+Каждый кейс — функция, возвращающая список Result; регистрируется декоратором
+`@case`. Тяжёлая подготовка (прогрев сервиса до нужной длины записи) кешируется
+между кейсами в пределах одного запуска.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import pickle
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.common.cache import ReadCache
+from app.common.sqlite import create_reader_engine, create_writer_engine
+from app.common.write_behind import WriteBehindWriter
+from app.modules.core.settings import ReadCacheSettings, SQLiteSettings, WriteBehindSettings
+from app.modules.ingest.infra.routes.medical_signals import SignalProcessor
+from app.modules.ml.infrastucture.di import MODEL_HYPOXIA_CONFIG_PATH, MODEL_STV_CONFIG_PATH
+from app.modules.ml.infrastucture.services.features import extract_window_features
+from app.modules.ml.infrastucture.services.fetal_monitoring import (
+    FetalMonitoringService,
+    finalize_results,
+)
+from app.modules.ml.infrastucture.services.utils import calculate_stv, rolling_stv_mean_10min
+from benchmarks.synthetic import SyntheticCTG, generate_ctg
+
+# длительности накопленной записи для StreamingPipeline.step: 1 мин, 20 мин, 2 ч
+STEP_POINTS = (60, 1200, 7200)
+RECORDING_SECONDS = max(STEP_POINTS)
+SEED = 20251001
+BENCH_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class Result:
+    name: str
+    samples: list[float]           # секунды на одну операцию
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, Any]:
+        arr = np.asarray(self.samples)
+        return {
+            "unit": "s/op",
+            "n": int(arr.size),
+            "median": float(np.median(arr)),
+            "mean": float(arr.mean()),
+            "min": float(arr.min()),
+            "p95": float(np.percentile(arr, 95)),
+            **self.extra,
+        }
+
+
+@dataclass
+class Options:
+    quick: bool = False
+
+    @property
+    def repeat(self) -> int:
+        return 5 if self.quick else 15
+
+    @property
+    def step_ticks(self) -> int:
+        # не меньше 60, чтобы в выборку попали стадии, работающие раз в минуту
+        return 60 if self.quick else 180
+
+
+CASES: dict[str, Callable[[Options], list[Result]]] = {}
+
+
+def case(name: str) -> Callable:
+    def deco(fn: Callable[[Options], list[Result]]) -> Callable[[Options], list[Result]]:
+        CASES[name] = fn
+        return fn
+    return deco
+
+
+def measure(fn: Callable[[], Any], repeat: int, number: int = 1) -> list[float]:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        out.append((time.perf_counter() - t0) / number)
+    return out
+
+
+# --- общие данные ---------------------------------------------------------------
+
+_cache: dict[str, Any] = {}
+
+
+def recording() -> SyntheticCTG:
+    if "ctg" not in _cache:
+        _cache["ctg"] = generate_ctg(RECORDING_SECONDS + 600, seed=SEED)
+    return _cache["ctg"]
+
+
+def make_service() -> FetalMonitoringService:
+    with open(MODEL_HYPOXIA_CONFIG_PATH, "rb") as f:
+        hypoxia_cfg = pickle.load(f)
+    with open(MODEL_STV_CONFIG_PATH, "rb") as f:
+        stv_cfg = pickle.load(f)
+    return FetalMonitoringService(hypoxia_cfg, stv_cfg)
+
+
+def replay(service: FetalMonitoringService, ctg: SyntheticCTG, until_sec: int) -> None:
+    """Догоняет сервис до until_sec секунд накопленной записи без замеров."""
+    for batch in ctg.batches(service.ctx.now_t, until_sec):
+        service.process_stream(*batch)
+
+
+# --- кейсы ----------------------------------------------------------------------
+
+@case("pipeline.step")
+def bench_pipeline_step(opts: Options) -> list[Result]:
+    ctg = recording()
+    service = make_service()
+    results = []
+    for seconds in STEP_POINTS:
+        replay(service, ctg, seconds)
+        batches = list(ctg.batches(seconds, seconds + opts.step_ticks))
+        samples = []
+        for batch in batches:
+            t0 = time.perf_counter()
+            service.pipeline.step(*batch)
+            samples.append(time.perf_counter() - t0)
+        results.append(Result(f"pipeline.step[{seconds}s]", samples))
+    _cache["service"] = service
+    return results
+
+
+@case("pipeline.worker")
+def bench_pipeline_worker(opts: Options) -> list[Result]:
+    """Суммарная стоимость секунды на воркере с несколькими сессиями.
+
+    Сессии идут синхронно (как при одновременном старте мониторинга), поэтому
+    пик определяется тем, сколько минутных стадий сработало в одну секунду.
+    """
+    ctg = recording()
+    n_sessions = 4 if opts.quick else 8
+    seconds = 1200
+    services = [make_service() for _ in range(n_sessions)]
+    for service in services:
+        replay(service, ctg, seconds)
+    samples = []
+    for batch in ctg.batches(seconds, seconds + opts.step_ticks):
+        t0 = time.perf_counter()
+        for service in services:
+            service.pipeline.step(*batch)
+        samples.append(time.perf_counter() - t0)
+    return [Result(
+        f"pipeline.worker[{n_sessions}x{seconds}s]",
+        samples,
+        extra={"sessions": n_sessions, "max": float(max(samples))},
+    )]
+
+
+@case("extract_features")
+def bench_extract_features(opts: Options) -> list[Result]:
+    ctg = recording()
+    window = 600  # window_size моделей
+    lo, hi = (1200 - window) * ctg.fs, 1200 * ctg.fs
+    fhr, uc = ctg.fhr[lo:hi], ctg.uterus[lo:hi]
+    return [Result(
+        f"extract_features[{window}s]",
+        measure(lambda: extract_window_features(fhr, uc, 1200), opts.repeat),
+    )]
+
+
+@case("finalize_results")
+def bench_finalize_results(opts: Options) -> list[Result]:
+    ctg = recording()
+    service = _cache.get("service")
+    if service is None:
+        service = make_service()
+        replay(service, ctg, RECORDING_SECONDS)
+    ctx = service.ctx
+    return [Result(
+        f"finalize_results[{RECORDING_SECONDS}s]",
+        measure(lambda: finalize_results(ctx), opts.repeat),
+    )]
+
+
+@case("stv")
+def bench_stv(opts: Options) -> list[Result]:
+    ctg = recording()
+    results = []
+    for seconds in (1200, RECORDING_SECONDS):
+        fhr = ctg.fhr[: seconds * ctg.fs]
+        results.append(Result(
+            f"calculate_stv[{seconds}s]",
+            measure(lambda: calculate_stv(fhr, fs=ctg.fs), opts.repeat, number=5),
+        ))
+        results.append(Result(
+            f"rolling_stv_mean_10min[{seconds}s]",
+            measure(lambda: rolling_stv_mean_10min(fhr, fs=ctg.fs), opts.repeat),
+        ))
+    return results
+
+
+@case("ingest.parse")
+def bench_ingest_parse(opts: Options) -> list[Result]:
+    messages = generate_ctg(600, seed=SEED).messages()
+
+    def run() -> None:
+        processor = SignalProcessor()
+        for msg in messages:
+            processor.parse(msg)
+
+    samples = [s / len(messages) for s in measure(run, opts.repeat)]
+    return [Result(
+        "ingest.parse",
+        samples,
+        extra={"msgs_per_sec": float(1.0 / np.median(samples))},
+    )]
+
+
+# холодный старт воркера: импорт app.main и первый запрос к /health в новом процессе
+_STARTUP_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+heavy = [m for m in ("numpy", "pandas", "scipy", "sklearn", "catboost") if m in sys.modules]
+from starlette.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    status = client.get("/health").status_code
+    t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_request": (t1 - t0) + (t3 - t2), "status": status, "heavy": heavy}))
+"""
+_IMPORTTIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| app\.main$", re.M)
+
+
+@case("startup")
+def bench_startup(opts: Options) -> list[Result]:
+    imports, first_requests, heavy = [], [], []
+    for _ in range(3 if opts.quick else 7):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _STARTUP_SCRIPT],
+            capture_output=True, text=True, check=True,
+        )
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        if run["status"] != 200:
+            raise RuntimeError(f"/health returned {run['status']}")
+        match = _IMPORTTIME.search(proc.stderr)
+        imports.append(int(match.group(1)) / 1e6 if match else run["import"])
+        first_requests.append(run["first_request"])
+        heavy = run["heavy"]
+    return [
+        Result("startup.import[app.main]", imports, extra={"heavy_modules": heavy}),
+        Result("startup.first_request", first_requests),
+    ]
+
+
+# --- SQLite: конкурентные чтения и записи --------------------------------------
+
+_DB_SCHEMA = """
+CREATE TABLE ctg_results (
+    id INTEGER PRIMARY KEY, ctg_id INTEGER NOT NULL, bpm FLOAT, stv FLOAT, created_at TEXT NOT NULL
+)
+"""
+_DB_INSERT = text("INSERT INTO ctg_results (ctg_id, bpm, stv, created_at) VALUES (:ctg_id, 140, 3, '2025-01-01')")
+_DB_SELECT = text("SELECT count(*), avg(bpm) FROM ctg_results WHERE ctg_id = :ctg_id")
+
+
+async def _db_workload(reader, write, seconds: float, readers: int, writers: int) -> dict[str, Any]:
+    """readers/writers корутин по кругу читают и пишут в течение seconds секунд."""
+    from sqlalchemy.exc import OperationalError
+
+    latency: dict[str, list[float]] = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def read(params: dict[str, Any]) -> None:
+        async with reader.connect() as conn:
+            await conn.execute(_DB_SELECT, params)
+
+    async def loop(kind: str, op, i: int) -> None:
+        n = 0
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                await op({"ctg_id": (i + n) % 50})
+            except OperationalError:  # database is locked
+                errors[kind] += 1
+                continue
+            latency[kind].append(time.perf_counter() - t0)
+            n += 1
+
+    await asyncio.gather(
+        *(loop("write", write, i) for i in range(writers)),
+        *(loop("read", read, i) for i in range(readers)),
+    )
+    return {"latency": latency, "errors": errors}
+
+
+@case("db.sqlite")
+def bench_db_sqlite(opts: Options) -> list[Result]:
+    """Пропускная способность SQLite при параллельных чтениях и записях.
+
+    default — движок с настройками по умолчанию (rollback journal, общий пул),
+    каждая запись — своя транзакция;
+    tuned — профиль app.common.sqlite: WAL и прагмы, пул читателей и один писатель;
+    write_behind — tuned, а записи идут через WriteBehindWriter, как в приложении.
+
+    В tuned каждая запись — своя транзакция в очереди к единственному соединению
+    писателя, поэтому её латентность — это ожидание writers чужих транзакций;
+    default быстрее в медиане за счёт хвоста (busy-ожидание лока). Приложение так
+    не пишет: одиночные INSERT'ы склеивает WriteBehindWriter.
+    """
+
+    seconds = 1.0 if opts.quick else 3.0
+    readers, writers = 8, 16
+    results = []
+    for profile in ("default", "tuned", "write_behind"):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite+aiosqlite:///{tmp}/bench.db"
+
+            async def run() -> dict[str, Any]:
+                if profile == "default":
+                    reader = writer = create_async_engine(url)
+                else:
+                    settings = SQLiteSettings()
+                    reader, writer = create_reader_engine(url, settings), create_writer_engine(url, settings)
+                async with writer.begin() as conn:
+                    await conn.execute(text(_DB_SCHEMA))
+
+                wb = None
+                if profile == "write_behind":
+                    wb = WriteBehindWriter(async_sessionmaker(bind=writer), WriteBehindSettings())
+                    wb.start()
+
+                    async def write(params: dict[str, Any]) -> None:
+                        await wb.submit(_DB_INSERT, params)
+                else:
+                    async def write(params: dict[str, Any]) -> None:
+                        async with writer.begin() as conn:
+                            await conn.execute(_DB_INSERT, params)
+                try:
+                    return await _db_workload(reader, write, seconds, readers, writers)
+                finally:
+                    if wb is not None:
+                        await wb.close()
+                    await reader.dispose()
+                    await writer.dispose()
+
+            out = asyncio.run(run())
+        for kind in ("read", "write"):
+            samples = out["latency"][kind] or [float("nan")]
+            results.append(Result(
+                f"db.sqlite.{kind}[{profile}]",
+                samples,
+                extra={
+                    "ops_per_sec": len(out["latency"][kind]) / seconds,
+                    "locked_errors": out["errors"][kind],
+                    "readers": readers,
+                    "writers": writers,
+                },
+            ))
+    return results
+
+
+# --- индексы: поиск по засеянной БД ----------------------------------------------
+
+_LOOKUP_RECORDINGS = 100_000
+_LOOKUP_PATIENTS = 2_000
+_LOOKUP_QUERIES = {
+    # PatientRepository.get_ctgs
+    "ctg_history.by_patient": ("SELECT id FROM ctg_history WHERE patient_id = ?", "patient"),
+    # SQLAlchemyCTGHistoryRepository.get_archive_path
+    "ctg_history.archive_path": ("SELECT archive_path FROM ctg_history WHERE patient_id = ?", "patient"),
+    # CTGRepository.list_results (записи одного пациента)
+    "ctg_results.by_ctg": ("SELECT * FROM ctg_results WHERE ctg_id IN (?, ?, ?, ?, ?)", "ctgs"),
+    # итоги за сутки
+    "ctg_results.by_created_at": (
+        "SELECT ctg_id, bpm, stv FROM ctg_results WHERE created_at >= ? AND created_at < ?", "day"
+    ),
+    # PatientRepository.list_patients: страница по префиксу имени (name_key — casefold имени)
+    "patients.by_name_prefix": (
+        "SELECT id, full_name FROM patients WHERE name_key >= ? AND name_key < ? "
+        "ORDER BY name_key, id LIMIT 101", "name"
+    ),
+}
+
+
+def _migrate(db_path: str, revision: str) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(str(BENCH_ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(BENCH_ROOT / "src" / "migrations"))
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    command.upgrade(cfg, revision)
+
+
+def _seed_recordings(db_path: str) -> None:
+    """Засевает БД на ревизии 3b9d51a0c2e4; новые колонки заполнят миграции."""
+    import datetime
+    import sqlite3
+
+    rng = np.random.default_rng(SEED)
+    start = datetime.datetime(2025, 1, 1)
+    days = rng.integers(0, 365, _LOOKUP_RECORDINGS)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO patients (id, full_name) VALUES (?, ?)",
+            ((i, f"patient {i}") for i in range(1, _LOOKUP_PATIENTS + 1)),
+        )
+        conn.executemany(
+            "INSERT INTO ctg_history (id, patient_id, dir_path, archive_path) VALUES (?, ?, ?, ?)",
+            (
+                (i, int(p), f"/logs/{p}/{i}.csv", f"/archives/{p}.zip")
+                for i, p in enumerate(rng.integers(1, _LOOKUP_PATIENTS + 1, _LOOKUP_RECORDINGS), 1)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO ctg_results (ctg_id, gest_age, bpm, stv, created_at) VALUES (?, '38+2 нед', 140, 3, ?)",
+            (
+                (i, (start + datetime.timedelta(days=int(d), seconds=i % 86400)).isoformat(" "))
+                for i, d in enumerate(days, 1)
+            ),
+        )
+
+
+def _lookup_params(kind: str, rng: np.random.Generator) -> tuple:
+    if kind == "patient":
+        return (int(rng.integers(1, _LOOKUP_PATIENTS + 1)),)
+    if kind == "ctgs":
+        return tuple(int(x) for x in rng.integers(1, _LOOKUP_RECORDINGS + 1, 5))
+    if kind == "name":
+        prefix = f"patient {int(rng.integers(1, _LOOKUP_PATIENTS + 1))}"
+        return (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    day = f"2025-{int(rng.integers(1, 13)):02d}-{int(rng.integers(1, 29)):02d}"
+    return (day, day + " 23:59:59.999")
+
+
+@case("db.lookup")
+def bench_db_lookup(opts: Options) -> list[Result]:
+    """Горячие запросы по patients/ctg_history/ctg_results до и после миграций с индексами."""
+    import sqlite3
+
+    number = 20 if opts.quick else 50
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = f"{tmp}/lookup.db"
+        _migrate(db_path, "3b9d51a0c2e4")
+        _seed_recordings(db_path)
+        for stage, revision in (("before", None), ("after", "head")):
+            if revision is not None:
+                _migrate(db_path, revision)
+            with sqlite3.connect(db_path) as conn:
+                for name, (sql, kind) in _LOOKUP_QUERIES.items():
+                    rng = np.random.default_rng(SEED)
+                    params = [_lookup_params(kind, rng) for _ in range(opts.repeat * number)]
+                    it = iter(params)
+                    try:
+                        plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params[0]).fetchall()
+                    except sqlite3.OperationalError:  # колонки ещё нет на этой ревизии (name_key)
+                        continue
+                    results.append(Result(
+                        f"db.lookup.{name}[{stage}]",
+                        measure(lambda: conn.execute(sql, next(it)).fetchall(), opts.repeat, number),
+                        extra={"rows": _LOOKUP_RECORDINGS, "plan": plan[-1][-1]},
+                    ))
+    return results
+
+
+# --- кэш чтения: запросы дашборда ------------------------------------------------
+
+_DASHBOARD_HOT_PATIENTS = 200
+
+
+@case("db.read_cache")
+def bench_db_read_cache(opts: Options) -> list[Result]:
+    """Запрос карточки пациента на дашборде: карточка, доп. информация, первая страница КТГ.
+
+    direct — репозитории напрямую, как до кэша; cached — через Cached*Repository;
+    cached+writes — то же, но на каждые 20 чтений приходит новый итог КТГ
+    (invalidate_ctg сбрасывает обзор её пациента).
+    """
+    from app.modules.core.infra.adapters.cached import CachedCTGRepository, CachedPatientRepository
+    from app.modules.core.infra.adapters.ctg import CTGRepository
+    from app.modules.core.infra.adapters.patient import PatientRepository
+
+    number = 200 if opts.quick else 1000
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = f"{tmp}/dashboard.db"
+        _migrate(db_path, "3b9d51a0c2e4")
+        _seed_recordings(db_path)
+        _migrate(db_path, "head")
+
+        for profile in ("direct", "cached", "cached+writes"):
+            async def run() -> tuple[list[float], dict[str, Any]]:
+                engine = create_reader_engine(f"sqlite+aiosqlite:///{db_path}", SQLiteSettings())
+                sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+                cache = ReadCache(ReadCacheSettings())
+                rng = np.random.default_rng(SEED)
+                patient_ids = rng.integers(1, _DASHBOARD_HOT_PATIENTS + 1, opts.repeat * number)
+                samples = []
+                try:
+                    it = iter(patient_ids)
+                    for _ in range(opts.repeat):
+                        t0 = time.perf_counter()
+                        for i in range(number):
+                            patient_id = int(next(it))
+                            async with sessions() as session:
+                                patients, ctgs = PatientRepository(session), CTGRepository(session, None)
+                                if profile != "direct":
+                                    patients = CachedPatientRepository(patients, cache)
+                                    ctgs = CachedCTGRepository(ctgs, cache)
+                                await patients.get_by_id(patient_id)
+                                await patients.get_additional_info(patient_id)
+                                page = await ctgs.list_patient_overview(patient_id, limit=50)
+                            if profile == "cached+writes" and i % 20 == 0 and page.items:
+                                cache.invalidate_ctg(page.items[0].id)
+                        samples.append((time.perf_counter() - t0) / number)
+                finally:
+                    await engine.dispose()
+                return samples, cache.to_dict()
+
+            samples, stats = asyncio.run(run())
+            extra = {"hot_patients": _DASHBOARD_HOT_PATIENTS, "rows": _LOOKUP_RECORDINGS}
+            if profile != "direct":
+                extra["hit_ratio"] = stats["hit_ratio"]
+            results.append(Result(f"db.read_cache.dashboard[{profile}]", samples, extra=extra))
+    return results
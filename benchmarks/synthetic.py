@@ -0,0 +1,79 @@
+"""Детерминированные синтетические сигналы КТГ для бенчмарков.
+
+Одинаковые seed и длительность всегда дают одинаковые массивы, поэтому
+результаты разных прогонов сравнимы между собой.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+FS = 5
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticCTG:
+    time_sec: np.ndarray
+    fhr: np.ndarray
+    uterus: np.ndarray
+    fs: int = FS
+
+    @property
+    def seconds(self) -> int:
+        return len(self.time_sec) // self.fs
+
+    def to_frame(self, start_sec: int = 0, end_sec: int | None = None) -> pd.DataFrame:
+        lo = start_sec * self.fs
+        hi = None if end_sec is None else end_sec * self.fs
+        return pd.DataFrame({
+            "time_sec": self.time_sec[lo:hi],
+            "value_bpm": self.fhr[lo:hi],
+            "value_uterus": self.uterus[lo:hi],
+        })
+
+    def batches(
+            self, start_sec: int = 0, end_sec: int | None = None
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Посекундные пачки (time_sec, fhr, uc) по fs точек — ровно то, что пайплайн получает за тик."""
+        end_sec = self.seconds if end_sec is None else end_sec
+        for sec in range(start_sec, end_sec):
+            lo, hi = sec * self.fs, (sec + 1) * self.fs
+            yield self.time_sec[lo:hi], self.fhr[lo:hi], self.uterus[lo:hi]
+
+    def messages(self, missing_every: int = 50) -> list[dict[str, Any]]:
+        """Сообщения в формате вебсокета ingest; каждое missing_every-е без значений."""
+        out = []
+        for i, (ts, bpm, uc) in enumerate(zip(self.time_sec, self.fhr, self.uterus)):
+            if missing_every and i % missing_every == 0:
+                out.append({"type": "signal", "timestamp": f"{ts:.1f}", "bpm": None, "uterus": ""})
+            else:
+                out.append({"type": "signal", "timestamp": float(ts), "bpm": float(bpm), "uterus": float(uc)})
+        return out
+
+
+def generate_ctg(seconds: int, fs: int = FS, seed: int = 0) -> SyntheticCTG:
+    """Базальный ритм с дрейфом и вариабельностью, акцелерации, децелерации и схватки."""
+    rng = np.random.default_rng(seed)
+    n = seconds * fs
+    t = np.arange(n) / fs
+
+    fhr = (
+        140
+        + 4 * np.sin(2 * np.pi * t / 1800)   # медленный дрейф базального ритма
+        + 5 * np.sin(2 * np.pi * t / 40)     # долговременная вариабельность
+        + rng.normal(0, 2, n)                # кратковременная вариабельность
+    )
+    for start in range(300, seconds, 420):
+        fhr[(t >= start) & (t < start + 25)] += 25
+    for start in range(500, seconds, 700):
+        fhr[(t >= start) & (t < start + 40)] -= 30
+
+    uterus = 10 + rng.normal(0, 1, n)
+    for start in range(120, seconds, 240):
+        mask = (t >= start) & (t < start + 60)
+        uterus[mask] += 40 * np.sin(np.pi * (t[mask] - start) / 60)
+
+    return SyntheticCTG(time_sec=t, fhr=fhr, uterus=np.clip(uterus, 0, None), fs=fs)
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import structlog
@@ -10,22 +11,43 @@ from .logger import setup_logger
 from .middlewares import HTTPLogMiddleware
 
 from app.modules.core.infra.routes.base import router as core_router
+from app.modules.core.infra.routes.health import router as health_router
 from app.common.provider import create_di_container, get_container
 from app.modules.ingest.infra.routes.base import router as ingest_router
 from app.modules.streaming.presentation.router.streaming_router import streaming_router
 from app.modules.ml.presentation.router.analizing import router as analizing_router
+from app.modules.ml.presentation.router.metrics import router as ml_metrics_router
+from app.modules.ml.presentation.router.notifications import router as ml_notifications_router
 from app.modules.core.infra.routes.ctg_graphic import router as ctg_graphic_router
+from app.modules.ml.settings import warmup_settings
 
 ROUTERS: list[tuple[APIRouter, str | None]] = [
+    (health_router, None),
     (core_router, "/http/crud"),
     (ingest_router, "/ws/ingest"),
     (streaming_router, "/ws/streaming"),
     (analizing_router, "/ml"),
+    (ml_metrics_router, "/ml"),
+    (ml_notifications_router, "/ml"),
     (ctg_graphic_router, "/ctg_graphic"),
 ]
 
+def _log_warmup(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        structlog.get_logger('ml').error('ml_warmup_failed', exc_info=task.exception())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # ML-стек грузится и прогревается в фоне: CRUD и /health отвечают сразу
+    # после старта, /ready — только когда модели готовы к первой сессии
+    app.state.ml_warmup = None
+    if warmup_settings.enabled:
+        # импорт здесь, а не на уровне модуля: сам di тянет обработчик и numpy
+        from app.modules.ml.infrastucture.di import warm_up as warm_up_ml
+
+        app.state.ml_warmup = asyncio.create_task(asyncio.to_thread(warm_up_ml))
+        app.state.ml_warmup.add_done_callback(_log_warmup)
     try:
         yield
     finally:
@@ -0,0 +1,167 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from app.modules.core.settings import ReadCacheSettings
+
+T = TypeVar('T')
+
+# теги записей: по ним кэш сбрасывается при изменении данных
+PATIENTS_TAG = ('patients',)    # страницы списка пациентов
+CTG_LISTS_TAG = ('ctg_lists',)  # любой список КТГ любого пациента
+LAST_RESULTS_TAG = ('last_results',)  # страницы пациентов с последним итогом КТГ
+
+
+def patient_tag(patient_id: int) -> tuple[str, int]:
+    """Карточка пациента и дополнительная информация."""
+    return 'patient', patient_id
+
+
+def patient_ctgs_tag(patient_id: int) -> tuple[str, int]:
+    """Списки КТГ пациента (id, обзор с итогами — все страницы)."""
+    return 'patient_ctgs', patient_id
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    expires: float
+    tags: tuple[Hashable, ...]
+
+
+class ReadCache:
+    """Кэш чтения в памяти процесса: TTL + вытеснение давно не читанных (LRU).
+
+    Ключ — кортеж, первый элемент которого — пространство имён (по нему
+    считаются попадания и промахи). Записи помечаются тегами и сбрасываются
+    целиком по тегу: invalidate_* вызываются после коммита записи, поэтому
+    следующий запрос уже читает из БД свежие данные. TTL ограничивает
+    устаревание, если об изменении не сообщили (другой процесс, ручная правка).
+
+    Результат, загруженный, пока шла инвалидация, не кэшируется: иначе
+    запрос, начатый до записи, положил бы в кэш старые данные уже после сброса.
+
+    Живёт в APP-scope контейнера, один на процесс.
+    """
+
+    def __init__(self, settings: ReadCacheSettings, clock: Callable[[], float] = time.monotonic):
+        self.settings = settings
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._tagged: dict[Hashable, set[Hashable]] = {}
+        # владелец КТГ: новый итог приходит с ctg_id, а сбрасывать нужно списки пациента;
+        # забытый владелец не ломает инвалидацию, а только расширяет её до CTG_LISTS_TAG
+        self._ctg_owner: OrderedDict[int, int] = OrderedDict()
+        self._epoch = 0
+
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+            self,
+            key: tuple,
+            load: Callable[[], Awaitable[T]],
+            tags: Iterable[Hashable] = (),
+            cache_none: bool = True,
+    ) -> T:
+        namespace = key[0]
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > self._clock():
+                self._entries.move_to_end(key)
+                self.hits[namespace] = self.hits.get(namespace, 0) + 1
+                return entry.value
+            self._drop(key)
+            self.expirations += 1
+        self.misses[namespace] = self.misses.get(namespace, 0) + 1
+
+        epoch = self._epoch
+        value = await load()
+        if epoch == self._epoch and (value is not None or cache_none):
+            self._put(key, value, tuple(tags))
+        return value
+
+    def remember_ctgs(self, patient_id: int, ctg_ids: Iterable[int | None]) -> None:
+        for ctg_id in ctg_ids:
+            if ctg_id is not None:
+                self._ctg_owner[ctg_id] = patient_id
+                self._ctg_owner.move_to_end(ctg_id)
+        while len(self._ctg_owner) > self.settings.max_ctg_owners:
+            self._ctg_owner.popitem(last=False)
+
+    def invalidate_patient(self, patient_id: int | None = None) -> None:
+        """Изменена карточка пациента; None — добавлен новый (меняется только список)."""
+        if patient_id is None:
+            self.invalidate(PATIENTS_TAG)
+        else:
+            self.invalidate(patient_tag(patient_id), PATIENTS_TAG)
+
+    def invalidate_patient_ctgs(self, patient_id: int) -> None:
+        """У пациента новая запись КТГ."""
+        self.invalidate(patient_ctgs_tag(patient_id))
+
+    def invalidate_ctg(self, ctg_id: int) -> None:
+        """У КТГ новый итог: меняется порядок и содержимое обзора её пациента."""
+        owner = self._ctg_owner.get(ctg_id)
+        # владелец неизвестен — такую КТГ не видел ни один закэшированный список,
+        # но пациент мог быть закэширован до её появления в другом процессе
+        self.invalidate(CTG_LISTS_TAG if owner is None else patient_ctgs_tag(owner), LAST_RESULTS_TAG)
+
+    def invalidate(self, *tags: Hashable) -> None:
+        self._epoch += 1
+        self.invalidations += 1
+        for tag in tags:
+            for key in self._tagged.pop(tag, ()):
+                self._drop(key)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._entries.clear()
+        self._tagged.clear()
+        self._ctg_owner.clear()
+
+    def _put(self, key: Hashable, value: Any, tags: tuple[Hashable, ...]) -> None:
+        self._drop(key)
+        self._entries[key] = _Entry(value, self._clock() + self.settings.ttl, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.settings.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def to_dict(self) -> dict[str, Any]:
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return {
+            "enabled": self.settings.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.settings.max_entries,
+            "ctg_owners": len(self._ctg_owner),
+            "ttl": self.settings.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "by_namespace": {
+                namespace: {"hits": self.hits.get(namespace, 0), "misses": self.misses.get(namespace, 0)}
+                for namespace in sorted(self.hits.keys() | self.misses.keys())
+            },
+        }
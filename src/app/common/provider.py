@@ -1,16 +1,37 @@
 import os
-from collections.abc import Container, Iterable, AsyncIterable
+from collections.abc import Container, AsyncIterable
 from os import PathLike
 from typing import Literal
 
+import httpx
 from dishka import Provider, Scope, provide, make_container, make_async_container, AsyncContainer
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 
+from app.modules.core.infra.adapters.cached import CachedCTGRepository, CachedPatientRepository
 from app.modules.core.infra.adapters.ctg import CTGRepository
 from app.modules.core.infra.adapters.patient import PatientRepository
-from app.modules.core.settings import DatabaseSettings
+from app.common.cache import ReadCache
+from app.common.sqlite import (
+    WriterEngine,
+    WriterSession,
+    create_reader_engine,
+    create_writer_engine,
+    is_sqlite,
+)
+from app.common.write_behind import WriteBehindWriter
+from app.modules.core.settings import (
+    DatabaseSettings,
+    HTTPClientSettings,
+    ReadCacheSettings,
+    SQLiteSettings,
+    WriteBehindSettings,
+)
 from app.modules.core.usecases.ports.ctg import CTGPort
 from app.modules.core.usecases.ports.patients import PatientPort
+from app.modules.ml.application.interfaces.notifications import NotificationPort
+from app.modules.ml.application.interfaces.results import ResultPort
+from app.modules.ml.infrastucture.services.notification_repo import NotificationRepository
+from app.modules.ml.infrastucture.services.result_repo import ResultRepository
 
 _ENV_PATH = os.environ.get("ENV_PATH", None)
 
@@ -27,29 +48,122 @@ class SettingsProvider(Provider):
     def db_settings(self) -> DatabaseSettings:
         return DatabaseSettings(_env_file=self._env_file)
 
+    @provide
+    def http_client_settings(self) -> HTTPClientSettings:
+        return HTTPClientSettings(_env_file=self._env_file)
+
+    @provide
+    def write_behind_settings(self) -> WriteBehindSettings:
+        return WriteBehindSettings(_env_file=self._env_file)
+
+    @provide
+    def sqlite_settings(self) -> SQLiteSettings:
+        return SQLiteSettings(_env_file=self._env_file)
+
+    @provide
+    def read_cache_settings(self) -> ReadCacheSettings:
+        return ReadCacheSettings(_env_file=self._env_file)
+
 
 class DatabaseProvider(Provider):
     @provide(scope=Scope.APP)
-    def engine(self, settings: DatabaseSettings) -> Iterable[AsyncEngine]:
-        engine = create_async_engine(settings.db_url, pool_pre_ping=True)
+    async def engine(
+            self, settings: DatabaseSettings, sqlite_settings: SQLiteSettings
+    ) -> AsyncIterable[AsyncEngine]:
+        if is_sqlite(settings.db_url):
+            engine = create_reader_engine(settings.db_url, sqlite_settings)
+        else:
+            engine = create_async_engine(settings.db_url, pool_pre_ping=True)
         yield engine
+        await engine.dispose()
+
+    @provide(scope=Scope.APP)
+    async def writer_engine(
+            self, settings: DatabaseSettings, sqlite_settings: SQLiteSettings, engine: AsyncEngine
+    ) -> AsyncIterable[WriterEngine]:
+        # у SQLite один писатель на файл — отдельное соединение, остальным СУБД хватает общего пула
+        if not is_sqlite(settings.db_url):
+            yield WriterEngine(engine)
+            return
+        writer_engine = create_writer_engine(settings.db_url, sqlite_settings)
+        yield WriterEngine(writer_engine)
+        await writer_engine.dispose()
 
     @provide(scope=Scope.APP)
     def session_factory(self, engine: AsyncEngine) -> async_sessionmaker:
         return async_sessionmaker(bind=engine, expire_on_commit=False)
 
+    @provide(scope=Scope.APP)
+    async def write_behind(
+            self, engine: WriterEngine, settings: WriteBehindSettings
+    ) -> AsyncIterable[WriteBehindWriter]:
+        # очередь дописывается при закрытии контейнера в lifespan
+        writer = WriteBehindWriter(async_sessionmaker(bind=engine, expire_on_commit=False), settings)
+        writer.start()
+        yield writer
+        await writer.close()
+
+    @provide(scope=Scope.APP)
+    def read_cache(self, settings: ReadCacheSettings) -> ReadCache:
+        return ReadCache(settings)
+
     @provide(scope=Scope.REQUEST)
     async def session(self, session_factory: async_sessionmaker) -> AsyncIterable[AsyncSession]:
         async with session_factory() as session:
             yield session
 
+    @provide(scope=Scope.REQUEST)
+    async def writer_session(self, engine: WriterEngine) -> AsyncIterable[WriterSession]:
+        # соединение берётся только при первом запросе и отдаётся после коммита
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield WriterSession(session)
+
     @provide(scope=Scope.REQUEST, provides=PatientPort)
-    async def patient_repo(self, session: AsyncSession) -> PatientRepository:
-        return PatientRepository(session)
+    async def patient_repo(self, session: AsyncSession, cache: ReadCache) -> PatientPort:
+        repo = PatientRepository(session)
+        return CachedPatientRepository(repo, cache) if cache.settings.enabled else repo
 
     @provide(scope=Scope.REQUEST, provides=CTGPort)
-    async def ctg_repo(self, session: AsyncSession) -> CTGPort:
-        return CTGRepository(session)
+    async def ctg_repo(self, session: AsyncSession, writer: WriteBehindWriter, cache: ReadCache) -> CTGPort:
+        repo = CTGRepository(session, writer)
+        return CachedCTGRepository(repo, cache) if cache.settings.enabled else repo
+
+    @provide(scope=Scope.REQUEST, provides=NotificationPort)
+    async def notification_repo(
+            self, session: AsyncSession, writer_session: WriterSession
+    ) -> NotificationRepository:
+        return NotificationRepository(session, writer_session)
+
+    @provide(scope=Scope.REQUEST, provides=ResultPort)
+    async def result_repo(self, writer: WriteBehindWriter, cache: ReadCache) -> ResultRepository:
+        return ResultRepository(writer, cache)
+
+
+class HTTPClientProvider(Provider):
+    """Один пул соединений на приложение для исходящих HTTP-запросов.
+
+    Клиент закрывается вместе с контейнером в `lifespan`.
+    """
+
+    @provide(scope=Scope.APP)
+    async def http_client(self, settings: HTTPClientSettings) -> AsyncIterable[httpx.AsyncClient]:
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        # повторяются только неудачные подключения, поэтому это безопасно и для POST
+        transport = httpx.AsyncHTTPTransport(retries=settings.retries, limits=limits)
+        async with httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                connect=settings.connect_timeout,
+                read=settings.read_timeout,
+                write=settings.write_timeout,
+                pool=settings.pool_timeout,
+            ),
+        ) as client:
+            yield client
 
 
 _sync_container: Container | None = None
@@ -60,7 +174,9 @@ def create_di_container() -> None:
     if _sync_container is None:
         _sync_container = make_container(SettingsProvider(env_file=_ENV_PATH), DatabaseProvider())
     if _async_container is None:
-        _async_container = make_async_container(SettingsProvider(env_file=_ENV_PATH), DatabaseProvider())
+        _async_container = make_async_container(
+            SettingsProvider(env_file=_ENV_PATH), DatabaseProvider(), HTTPClientProvider()
+        )
 
 def get_container(di_type: Literal['sync', 'async']) -> Container | AsyncContainer:
     match di_type:
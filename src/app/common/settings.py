@@ -17,6 +17,8 @@ class AppSettings(BaseSettings):
 
     run_mode: RunMode = 'dev'
     emulator_uri: HttpUrl
+    max_upload_size: int = 256 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
 
 class HTTPServerSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file_encoding='utf-8', extra='ignore')
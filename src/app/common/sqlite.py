@@ -0,0 +1,55 @@
+from typing import NewType
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.modules.core.settings import SQLiteSettings
+
+# движок для пакетной записи (WriteBehindWriter); для SQLite — отдельный, с одним соединением
+WriterEngine = NewType("WriterEngine", AsyncEngine)
+# сессия запроса поверх WriterEngine — для записей, которые не идут через WriteBehindWriter
+WriterSession = NewType("WriterSession", AsyncSession)
+
+
+def is_sqlite(db_url: str) -> bool:
+    return db_url.startswith("sqlite")
+
+
+def apply_pragmas(engine: AsyncEngine, settings: SQLiteSettings) -> None:
+    """Настраивает каждое новое соединение пула через событие connect."""
+    pragmas = (
+        f"PRAGMA journal_mode={settings.journal_mode}",
+        f"PRAGMA synchronous={settings.synchronous}",
+        f"PRAGMA busy_timeout={settings.busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.mmap_size}",
+        f"PRAGMA cache_size=-{settings.cache_size_kib}",
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_reader_engine(db_url: str, settings: SQLiteSettings) -> AsyncEngine:
+    """Пул соединений для запросов; в WAL читатели работают параллельно с писателем."""
+    # pool_pre_ping не нужен: файл локальный, соединения не рвутся
+    engine = create_async_engine(
+        db_url,
+        pool_size=settings.reader_pool_size,
+        max_overflow=settings.reader_max_overflow,
+    )
+    apply_pragmas(engine, settings)
+    return engine
+
+
+def create_writer_engine(db_url: str, settings: SQLiteSettings) -> AsyncEngine:
+    """Одно соединение на запись: транзакции идут по очереди через пул,
+    а не конкурируют за write-lock файла."""
+    engine = create_async_engine(db_url, pool_size=1, max_overflow=0)
+    apply_pragmas(engine, settings)
+    return engine
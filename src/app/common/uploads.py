@@ -0,0 +1,58 @@
+import uuid
+from collections.abc import AsyncIterator
+
+from fastapi import UploadFile
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+async def iter_upload(upload_file: UploadFile, chunk_size: int, max_size: int) -> AsyncIterator[bytes]:
+    """Читает загруженный файл порциями, контролируя предельный размер."""
+    if upload_file.size is not None and upload_file.size > max_size:
+        raise UploadTooLarge
+
+    total = 0
+    while chunk := await upload_file.read(chunk_size):
+        total += len(chunk)
+        if total > max_size:
+            raise UploadTooLarge
+        yield chunk
+
+
+class MultipartStream:
+    """Тело multipart/form-data из одного файла, отдаваемое в httpx порциями.
+
+    httpx буферизует `files=` целиком в памяти, поэтому тело собирается вручную
+    и передаётся как асинхронный генератор (chunked transfer encoding).
+    """
+
+    def __init__(
+            self,
+            field_name: str,
+            upload_file: UploadFile,
+            chunk_size: int,
+            max_size: int,
+    ) -> None:
+        self._field_name = field_name
+        self._upload_file = upload_file
+        self._chunk_size = chunk_size
+        self._max_size = max_size
+        self._boundary = uuid.uuid4().hex
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self._boundary}'
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        filename = (self._upload_file.filename or self._field_name).replace('"', '')
+        file_content_type = self._upload_file.content_type or 'application/octet-stream'
+        yield (
+            f'--{self._boundary}\r\n'
+            f'Content-Disposition: form-data; name="{self._field_name}"; filename="{filename}"\r\n'
+            f'Content-Type: {file_content_type}\r\n\r\n'
+        ).encode()
+        async for chunk in iter_upload(self._upload_file, self._chunk_size, self._max_size):
+            yield chunk
+        yield f'\r\n--{self._boundary}--\r\n'.encode()
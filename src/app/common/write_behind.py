@@ -0,0 +1,194 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Executable
+
+from app.modules.core.settings import WriteBehindSettings
+
+logger = structlog.get_logger('db')
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    stmt: Executable
+    params: dict[str, Any]
+    returning: bool
+    future: asyncio.Future
+
+
+def _set(item: _PendingWrite, result: Any = None, exc: BaseException | None = None) -> None:
+    if item.future.done():  # вызывающий уже не ждёт (отменён)
+        return
+    if exc is not None:
+        item.future.set_exception(exc)
+    else:
+        item.future.set_result(result)
+
+
+class WriteBehindWriter:
+    """Копит одиночные INSERT'ы и пишет их пачками в одной транзакции.
+
+    Вызывающий получает управление, когда его строка закоммичена, но коммит
+    общий для всех, кто встал в очередь, пока писался предыдущий сброс (и ещё
+    flush_interval, если он задан) — в SQLite это один захват write-lock вместо N.
+    Без нагрузки строка пишется сразу, под нагрузкой пачки растут сами. Если пачка упала, она откатывается и
+    пишется заново по одной строке: исключение получает только тот, чья строка
+    не записалась, остальные — свой результат.
+
+    Записи с одинаковым statement уходят одним executemany; если нужен
+    RETURNING (id новой строки), строка выполняется отдельно внутри той же
+    транзакции. Statement должен быть одним и тем же объектом (константа модуля),
+    параметры — только через params.
+
+    Живёт в APP-scope контейнера: close() вызывается при закрытии контейнера
+    в lifespan и дописывает всё, что осталось в очереди.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, settings: WriteBehindSettings):
+        self._session_factory = session_factory
+        self.settings = settings
+        self._pending: list[_PendingWrite] = []
+        self._has_work = asyncio.Event()
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+        self.flushes = 0
+        self.rows = 0
+        self.errors = 0
+        self._latencies: deque[float] = deque(maxlen=settings.latency_window)
+        self._max_latency = 0.0
+        self._max_batch = 0
+
+    def start(self) -> None:
+        if self._task is None and not self._closed:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        self._closed = True
+        self._has_work.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def submit(self, stmt: Executable, params: dict[str, Any], returning: bool = False) -> Any:
+        """Ставит строку в очередь и ждёт коммита её пачки.
+
+        Возвращает scalar из RETURNING, если returning=True, иначе None.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingWrite(stmt, params, returning, future))
+        if self._task is None:
+            # фоновый цикл не запущен или уже остановлен — пишем сразу
+            await self.flush()
+        else:
+            self._has_work.set()
+            if len(self._pending) >= self.settings.max_batch:
+                self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        while not self._closed:
+            await self._has_work.wait()
+            if not self._closed and self.settings.flush_interval > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.settings.flush_interval)
+                except TimeoutError:
+                    pass
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            self._has_work.clear()
+            self._full.clear()
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+
+            started = time.perf_counter()
+            try:
+                results = await self._write(batch)
+            except Exception as exc:
+                self.errors += 1
+                logger.exception('db_write_behind_failed', rows=len(batch))
+                if len(batch) == 1:
+                    _set(batch[0], exc=exc)
+                else:
+                    await self._write_each(batch)
+                return
+
+            seconds = time.perf_counter() - started
+            self._observe(len(batch), seconds)
+            for item, result in zip(batch, results):
+                _set(item, result)
+
+    async def _write_each(self, batch: list[_PendingWrite]) -> None:
+        """Повтор упавшей пачки: каждая строка в своей транзакции."""
+        started = time.perf_counter()
+        written = 0
+        for item in batch:
+            try:
+                (result,) = await self._write([item])
+            except Exception as exc:
+                logger.warning('db_write_behind_row_failed', error=repr(exc))
+                _set(item, exc=exc)
+            else:
+                written += 1
+                _set(item, result)
+        if written:
+            self._observe(written, time.perf_counter() - started)
+
+    async def _write(self, batch: list[_PendingWrite]) -> list[Any]:
+        results: list[Any] = [None] * len(batch)
+        groups: dict[int, list[int]] = {}
+        for i, item in enumerate(batch):
+            if not item.returning:
+                groups.setdefault(id(item.stmt), []).append(i)
+
+        async with self._session_factory() as session:
+            for i, item in enumerate(batch):
+                if item.returning:
+                    results[i] = (await session.execute(item.stmt, item.params)).scalar_one()
+            for idx in groups.values():
+                await session.execute(batch[idx[0]].stmt, [batch[i].params for i in idx])
+            await session.commit()
+        return results
+
+    def _observe(self, rows: int, seconds: float) -> None:
+        self.flushes += 1
+        self.rows += rows
+        self._latencies.append(seconds)
+        self._max_latency = max(self._max_latency, seconds)
+        self._max_batch = max(self._max_batch, rows)
+        logger.debug('db_write_behind_flush', rows=rows, seconds=round(seconds, 4))
+        if seconds >= self.settings.slow_flush:
+            logger.warning('db_write_behind_slow_flush', rows=rows, seconds=round(seconds, 4))
+
+    def to_dict(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def quantile(q: float) -> float | None:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "rows": self.rows,
+            "errors": self.errors,
+            "max_batch": self._max_batch,
+            "flush_seconds": {
+                "window": len(latencies),
+                "mean": sum(latencies) / len(latencies) if latencies else None,
+                "p50": quantile(0.5),
+                "p95": quantile(0.95),
+                "max": self._max_latency,
+            },
+        }
@@ -38,3 +38,19 @@ class CTGHistory:
     dir_path: PathLike
     archive_path: PathLike | None
     result: CTGResult | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CTGCursor:
+    """Позиция keyset-пагинации: дата итога в том виде, как она хранится в БД, и id КТГ.
+
+    day=None — КТГ ещё без итога (такие идут первыми).
+    """
+    day: str | None
+    ctg_id: int
+
+
+@dataclass(slots=True)
+class CTGOverviewPage:
+    items: list[CTGHistory]
+    next_cursor: CTGCursor | None = None
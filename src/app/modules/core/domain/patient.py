@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+from app.modules.core.domain.ctg import CTGResult
+
 
 @dataclass(frozen=True, slots=True)
 class PatientAdditionalInfo:
@@ -16,3 +18,20 @@ class Patient:
     id: int
     fio: str
     additional_info: PatientAdditionalInfo | None = None
+    last_result: CTGResult | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PatientCursor:
+    """Позиция keyset-пагинации списка пациентов: последний выданный (full_name, id).
+
+    Список упорядочен по full_name.casefold(), курсор сравнивается в том же виде.
+    """
+    full_name: str
+    id: int
+
+
+@dataclass(slots=True)
+class PatientPage:
+    items: list[Patient]
+    next_cursor: PatientCursor | None = None
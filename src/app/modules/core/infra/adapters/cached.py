@@ -0,0 +1,98 @@
+from dataclasses import replace
+from typing import Sequence
+
+from app.common.cache import (
+    CTG_LISTS_TAG,
+    LAST_RESULTS_TAG,
+    PATIENTS_TAG,
+    ReadCache,
+    patient_ctgs_tag,
+    patient_tag,
+)
+from app.modules.core.domain.ctg import CTGCursor, CTGHistory, CTGOverviewPage, CTGResult
+from app.modules.core.domain.patient import Patient, PatientAdditionalInfo, PatientCursor, PatientPage
+from app.modules.core.usecases.ports.ctg import CTGPort
+from app.modules.core.usecases.ports.patients import PatientPort
+
+
+class CachedPatientRepository(PatientPort):
+    """PatientPort поверх ReadCache: читает из БД только при промахе."""
+
+    def __init__(self, repo: PatientPort, cache: ReadCache):
+        self._repo = repo
+        self._cache = cache
+
+    async def get_by_id(self, patient_id: int) -> Patient | None:
+        # отсутствие не кэшируется: о новом пациенте storage_server сообщает без id
+        patient = await self._cache.get_or_load(
+            ('patient', patient_id),
+            lambda: self._repo.get_by_id(patient_id),
+            tags=(patient_tag(patient_id),),
+            cache_none=False,
+        )
+        # get_patient дописывает additional_info в объект — отдаём копию
+        return None if patient is None else replace(patient)
+
+    async def get_additional_info(self, patient_id: int) -> PatientAdditionalInfo | None:
+        return await self._cache.get_or_load(
+            ('patient_info', patient_id),
+            lambda: self._repo.get_additional_info(patient_id),
+            tags=(patient_tag(patient_id),),
+        )
+
+    async def get_ctgs(self, patient_id: int) -> Sequence[int]:
+        async def load() -> Sequence[int]:
+            ctg_ids = await self._repo.get_ctgs(patient_id)
+            self._cache.remember_ctgs(patient_id, ctg_ids)
+            return ctg_ids
+
+        return await self._cache.get_or_load(
+            ('patient_ctgs', patient_id), load, tags=(patient_ctgs_tag(patient_id), CTG_LISTS_TAG)
+        )
+
+    async def list_patients(
+            self,
+            limit: int,
+            cursor: PatientCursor | None = None,
+            prefix: str | None = None,
+            with_last_result: bool = False,
+    ) -> PatientPage:
+        return await self._cache.get_or_load(
+            ('patients', limit, cursor, prefix, with_last_result),
+            lambda: self._repo.list_patients(limit, cursor, prefix, with_last_result),
+            tags=(PATIENTS_TAG, LAST_RESULTS_TAG) if with_last_result else (PATIENTS_TAG,),
+        )
+
+
+class CachedCTGRepository(CTGPort):
+    """CTGPort поверх ReadCache: кэшируется обзор КТГ пациента, запись сбрасывает его."""
+
+    def __init__(self, repo: CTGPort, cache: ReadCache):
+        self._repo = repo
+        self._cache = cache
+
+    async def list_ctg(self, ctg_ids: list[int]) -> list[CTGHistory]:
+        return await self._repo.list_ctg(ctg_ids)
+
+    async def list_results(self, ctg_ids: list[int]) -> list[CTGResult]:
+        return await self._repo.list_results(ctg_ids)
+
+    async def list_patient_overview(
+            self, patient_id: int, limit: int | None = None, cursor: CTGCursor | None = None
+    ) -> CTGOverviewPage:
+        async def load() -> CTGOverviewPage:
+            page = await self._repo.list_patient_overview(patient_id, limit=limit, cursor=cursor)
+            self._cache.remember_ctgs(patient_id, (item.id for item in page.items))
+            return page
+
+        return await self._cache.get_or_load(
+            ('ctg_overview', patient_id, limit, cursor),
+            load,
+            tags=(patient_ctgs_tag(patient_id), CTG_LISTS_TAG),
+        )
+
+    async def add_history(self, history: CTGHistory, patient_id: int) -> int | None:
+        ctg_id = await self._repo.add_history(history, patient_id)
+        self._cache.invalidate_patient_ctgs(patient_id)
+        self._cache.remember_ctgs(patient_id, (ctg_id,))
+        return ctg_id
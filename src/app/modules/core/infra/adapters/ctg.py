@@ -1,75 +1,99 @@
-import datetime
-
-from sqlalchemy import text, bindparam
+from sqlalchemy import and_, func, insert, or_, select, type_coerce, String
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.core.domain.ctg import CTGHistory, CTGResult
+from app.common.write_behind import WriteBehindWriter
+from app.modules.core.domain.ctg import CTGCursor, CTGHistory, CTGOverviewPage, CTGResult
+from app.modules.core.infra.tables import Projection, ctg_history, ctg_results
 from app.modules.core.usecases.ports.ctg import CTGPort
 
+_HISTORY = Projection(ctg_history, CTGHistory, dir_path="file_path")
+# общая с PatientRepository (последний итог в списке пациентов)
+RESULT = Projection(ctg_results, CTGResult, deceleration="decelerations", timestamp="created_at")
+
+_INSERT_HISTORY = (
+    insert(ctg_history)
+    .returning(ctg_history.c.id)
+)
+
+# последний итог каждой КТГ
+_latest = ctg_results.alias("latest")
+_LATEST_RESULT_ID = (
+    select(func.max(_latest.c.id))
+    .where(_latest.c.ctg_id == ctg_history.c.id)
+    .correlate(ctg_history)
+    .scalar_subquery()
+)
+# дата итога в том виде, как хранится (для курсора), без разбора в datetime
+_RESULT_DAY = type_coerce(ctg_results.c.created_at, String)
+
 
 class CTGRepository(CTGPort):
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, writer: WriteBehindWriter):
         self._session = session
+        self._writer = writer
 
     async def list_ctg(self, ctg_ids: list[int]) -> list[CTGHistory]:
-        stmt = text(
-            """
-            SELECT *
-            FROM ctg_history
-            WHERE ctg_history.id IN :ids
-            """
-        ).bindparams(bindparam("ids", expanding=True))
+        stmt = (
+            select(*_HISTORY.columns)
+            .where(ctg_history.c.id.in_(ctg_ids))
+        )
+        res = await self._session.execute(stmt)
+        return _HISTORY.build_many(res.all())
 
-        res = (await self._session.execute(stmt, {"ids": ctg_ids})).all()
+    async def list_results(self, ctg_ids: list[int]) -> list[CTGResult]:
+        stmt = (
+            select(*RESULT.columns)
+            .where(ctg_results.c.ctg_id.in_(ctg_ids))
+        )
+        res = await self._session.execute(stmt)
+        return RESULT.build_many(res.all())
 
-        ctg_history = [
-            CTGHistory(
-                id=row[0],
-                dir_path=row[2],
-                archive_path=row[3]
-            )
-            for row in res
-        ]
-        return ctg_history
+    async def list_patient_overview(
+            self, patient_id: int, limit: int | None = None, cursor: CTGCursor | None = None
+    ) -> CTGOverviewPage:
+        # КТГ пациента с последним итогом; сначала КТГ без итога, затем по дате итога
+        created_at = ctg_results.c.created_at
+        stmt = (
+            select(*_HISTORY.columns, *RESULT.columns, _RESULT_DAY)
+            .select_from(ctg_history.outerjoin(ctg_results, ctg_results.c.id == _LATEST_RESULT_ID))
+            .where(ctg_history.c.patient_id == patient_id)
+            .order_by(created_at.is_(None).desc(), created_at.desc(), ctg_history.c.id.desc())
+        )
+        if cursor is not None and cursor.day is None:
+            stmt = stmt.where(or_(created_at.is_not(None), ctg_history.c.id < cursor.ctg_id))
+        elif cursor is not None:
+            day = type_coerce(created_at, String)
+            stmt = stmt.where(or_(
+                day < cursor.day,
+                and_(day == cursor.day, ctg_history.c.id < cursor.ctg_id),
+            ))
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)  # лишняя строка — признак следующей страницы
 
-    async def list_results(self, ctg_ids: list[int]) -> list[CTGResult]:
-        stmt = text(
-            """
-            SELECT *
-            FROM ctg_results
-            WHERE ctg_results.ctg_id IN :ids
-            """
-        ).bindparams(bindparam("ids", expanding=True))
+        rows = (await self._session.execute(stmt)).all()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = CTGCursor(day=rows[-1][-1], ctg_id=rows[-1][0])
 
-        res = (await self._session.execute(stmt, {"ids": ctg_ids})).all()
-        ctg_results = [
-            CTGResult(
-                ctg_id=row[1], gest_age=row[2], bpm=row[3], uc=row[4], figo=row[5], figo_prognosis=row[6],
-                bhr=row[7], amplitude_oscillations=row[8], oscillation_frequency=row[9], ltv=row[10],
-                stv=row[11], stv_little=row[12], accelerations=row[13], deceleration=row[14],
-                uterine_contractions=row[15], fetal_movements=row[16], fetal_movements_little=row[17],
-                accelerations_little=row[18], deceleration_little=row[19], high_variability=row[20],
-                low_variability=row[21], loss_signals=row[22], timestamp=datetime.datetime.fromisoformat(row[23])
-            )
-            for row in res
-        ]
-        return ctg_results
+        items = []
+        n = len(_HISTORY)
+        for row in rows:
+            history = _HISTORY.build(row)
+            if row[-1] is not None:
+                history.result = RESULT.build(row[n:-1])
+            items.append(history)
+        return CTGOverviewPage(items=items, next_cursor=next_cursor)
 
-    async def add_history(self, ctg_history: CTGHistory, patient_id: int) -> int | None:
-        stmt = text(
-            """
-            INSERT INTO ctg_history (patient_id, file_path, archive_path)
-            VALUES (:patient_id, :file_path, :archive_path) RETURNING id
-            """
-        )
-        id = (await self._session.execute(
-            stmt,
+    async def add_history(self, history: CTGHistory, patient_id: int) -> int | None:
+        # id нужен сразу (CurrentCtgID), поэтому ждём коммита пачки
+        return await self._writer.submit(
+            _INSERT_HISTORY,
             {
                 "patient_id": patient_id,
-                "file_path": ctg_history.dir_path,
-                "archive_path": ctg_history.archive_path,
-            }
-        )).scalar_one()
-        await self._session.commit()
-        return id
+                "file_path": history.dir_path,
+                "archive_path": history.archive_path,
+            },
+            returning=True,
+        )
@@ -1,11 +1,32 @@
 from typing import Sequence
 
-from sqlalchemy import text
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.core.domain.patient import Patient, PatientAdditionalInfo
+from app.modules.core.domain.patient import Patient, PatientAdditionalInfo, PatientCursor, PatientPage
+from app.modules.core.infra.adapters.ctg import RESULT
+from app.modules.core.infra.tables import Projection, ctg_history, ctg_results, patient_info, patients
 from app.modules.core.usecases.ports.patients import PatientPort
 
+_PATIENT = Projection(patients, Patient, fio="full_name")
+_ADDITIONAL_INFO = Projection(patient_info, PatientAdditionalInfo)
+
+# последний итог среди всех КТГ пациента
+_history = ctg_history.alias("history")
+_latest = ctg_results.alias("latest")
+_LAST_RESULT_ID = (
+    select(func.max(_latest.c.id))
+    .select_from(_latest.join(_history, _history.c.id == _latest.c.ctg_id))
+    .where(_history.c.patient_id == patients.c.id)
+    .correlate(patients)
+    .scalar_subquery()
+)
+
+
+def _prefix_end(prefix: str) -> str:
+    # верхняя граница диапазона строк с этим префиксом: поиск идёт по индексу, а не LIKE
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
 
 class PatientRepository(PatientPort):
 
@@ -13,60 +34,70 @@ class PatientRepository(PatientPort):
         self._session = session
 
     async def get_by_id(self, patient_id: int) -> Patient | None:
-        stmt = text(
-            """
-            SELECT * FROM patients WHERE id = :patient_id
-            """
+        stmt = (
+            select(*_PATIENT.columns)
+            .where(patients.c.id == patient_id)
         )
-        res = await self._session.execute(stmt, {"patient_id": patient_id})
-        patient_row = res.one_or_none()
-        patient = None
-        if patient_row is not None:
-            patient = Patient(
-                id=patient_row[0],
-                fio=patient_row[1],
-            )
-        return patient
+        row = (await self._session.execute(stmt)).one_or_none()
+        return None if row is None else _PATIENT.build(row)
 
     async def get_additional_info(self, patient_id: int) -> PatientAdditionalInfo | None:
-        stmt = text(
-            """
-            SELECT * FROM patient_info WHERE patient_id = :patient_id
-            """
+        stmt = (
+            select(*_ADDITIONAL_INFO.columns)
+            .where(patient_info.c.patient_id == patient_id)
         )
-        res = await self._session.execute(stmt, {"patient_id": patient_id})
-        add_info_row = res.one_or_none()
-        add_info = None
-        if add_info_row is not None:
-            add_info = PatientAdditionalInfo(
-                diagnosis=add_info_row[2],
-                blood_gas_ph=add_info_row[3],
-                blood_gas_co2=add_info_row[4],
-                blood_gas_glu=add_info_row[5],
-                blood_gas_lac=add_info_row[6],
-                blood_gas_be=add_info_row[7],
-                anamnesis=add_info_row[8],
-            )
-
-        return add_info
+        row = (await self._session.execute(stmt)).one_or_none()
+        return None if row is None else _ADDITIONAL_INFO.build(row)
 
     async def get_ctgs(self, patient_id: int) -> Sequence[int]:
-        stmt = text(
-            """
-            SELECT id FROM ctg_history WHERE patient_id = :patient_id
-            """
+        stmt = (
+            select(ctg_history.c.id)
+            .where(ctg_history.c.patient_id == patient_id)
         )
-        res = await self._session.execute(stmt, {"patient_id": patient_id})
+        res = await self._session.execute(stmt)
         return res.scalars().all()
 
-    async def get_all(self) -> Sequence[Patient]:
-        stmt = text("SELECT * FROM patients")
-        res = await self._session.execute(stmt)
-        rows = res.fetchall()
-        return [
-            Patient(
-                id=row[0],
-                fio=row[1],
+    async def list_patients(
+            self,
+            limit: int,
+            cursor: PatientCursor | None = None,
+            prefix: str | None = None,
+            with_last_result: bool = False,
+    ) -> PatientPage:
+        # порядок и поиск — по name_key (casefold имени): индекс ix_patients_name_key
+        name_key = patients.c.name_key
+        stmt = (
+            select(*_PATIENT.columns)
+            .order_by(name_key, patients.c.id)
+            .limit(limit + 1)  # лишняя строка — признак следующей страницы
+        )
+        if with_last_result:
+            stmt = (
+                stmt.add_columns(*RESULT.columns)
+                .select_from(patients.outerjoin(ctg_results, ctg_results.c.id == _LAST_RESULT_ID))
             )
-            for row in rows
-        ]
\ No newline at end of file
+        if prefix:
+            stmt = stmt.where(name_key >= prefix, name_key < _prefix_end(prefix))
+        if cursor is not None:
+            after = cursor.full_name.casefold()
+            stmt = stmt.where(or_(
+                name_key > after,
+                and_(name_key == after, patients.c.id > cursor.id),
+            ))
+
+        rows = (await self._session.execute(stmt)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = PatientCursor(full_name=rows[-1].fio, id=rows[-1].id)
+
+        if not with_last_result:
+            return PatientPage(items=_PATIENT.build_many(rows), next_cursor=next_cursor)
+        items = []
+        n = len(_PATIENT)
+        for row in rows:
+            patient = _PATIENT.build(row)
+            if row[n] is not None:
+                patient.last_result = RESULT.build(row[n:])
+            items.append(patient)
+        return PatientPage(items=items, next_cursor=next_cursor)
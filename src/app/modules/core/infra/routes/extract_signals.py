@@ -1,8 +1,10 @@
 import httpx
+from dishka.integrations.fastapi import FromDishka, inject
 from fastapi import APIRouter, UploadFile, HTTPException, File
 from starlette import status
 
 from app.common.settings import app_settings
+from app.common.uploads import MultipartStream, UploadTooLarge
 
 router = APIRouter()
 
@@ -10,21 +12,30 @@ router = APIRouter()
     '/extract-signals',
     description="Запуск эмулятора"
 )
+@inject
 async def extract_bpm_uc_signals(
+        client: FromDishka[httpx.AsyncClient],
         archive: UploadFile = File(...),
 ):
+    body = MultipartStream(
+        'archive', archive, app_settings.upload_chunk_size, app_settings.max_upload_size
+    )
     try:
-        content = await archive.read()
-        async with httpx.AsyncClient(base_url=str(app_settings.emulator_uri)[:-1], timeout=None) as client:
-            resp = await client.post(
-                '/start',
-                files={"archive": content}
+        resp = await client.post(
+            httpx.URL(str(app_settings.emulator_uri)).join('start'),
+            content=body,
+            headers={'Content-Type': body.content_type},
+        )
+        if resp.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail='Не удалось запустить эмулятор'
             )
-            if resp.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail='Не удалось запустить эмулятор'
-                )
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail='Архив превышает допустимый размер'
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
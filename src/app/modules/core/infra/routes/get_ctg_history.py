@@ -1,18 +1,32 @@
 from collections.abc import Iterable
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from dishka.integrations.fastapi import FromDishka, inject
 
-from app.modules.core.domain.ctg import CTGHistory
-from app.modules.core.usecases.get_patient_ctgs import get_patient_ctgs
+from app.modules.core.domain.ctg import CTGCursor, CTGHistory, CTGOverviewPage
+from app.modules.core.usecases.get_patient_ctgs import get_patient_ctgs, get_patient_ctg_overview
 from app.modules.core.usecases.ports.ctg import CTGPort
-from app.modules.core.usecases.ports.patients import PatientPort
 
 router = APIRouter()
 
 @router.get("/ctg_histories")
 @inject
-async def patient_ctgs(
-        patient: int, patient_repo: FromDishka[PatientPort], ctg_repo: FromDishka[CTGPort]
-) -> Iterable[CTGHistory]:
-    return await get_patient_ctgs(patient, patient_repo, ctg_repo)
+async def patient_ctgs(patient: int, ctg_repo: FromDishka[CTGPort]) -> Iterable[CTGHistory]:
+    return await get_patient_ctgs(patient, ctg_repo)
+
+
+@router.get(
+    "/ctg_overview",
+    description="КТГ пациента с итогами одним запросом; страницы по дате итога "
+                "(курсор — next_cursor предыдущей страницы)"
+)
+@inject
+async def patient_ctg_overview(
+        patient: int,
+        ctg_repo: FromDishka[CTGPort],
+        limit: int = Query(50, ge=1, le=500),
+        before_day: str | None = None,
+        before_id: int | None = None,
+) -> CTGOverviewPage:
+    cursor = CTGCursor(day=before_day, ctg_id=before_id) if before_id is not None else None
+    return await get_patient_ctg_overview(patient, ctg_repo, limit, cursor)
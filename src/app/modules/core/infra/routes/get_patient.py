@@ -1,11 +1,11 @@
 from dishka.integrations.fastapi import FromDishka, inject
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from starlette import status
 
 from app.common.patient import CurrentPatientID
-from app.modules.core.domain.patient import Patient
+from app.modules.core.domain.patient import Patient, PatientCursor, PatientPage
 from app.modules.core.usecases.exceptions import NotFoundObject
-from app.modules.core.usecases.get_patient import get_patient, get_all_patients
+from app.modules.core.usecases.get_patient import get_patient, list_patients
 from app.modules.core.usecases.ports.patients import PatientPort
 
 router = APIRouter()
@@ -23,14 +23,24 @@ async def get_patient_info(patient_id: int, patient_repo: FromDishka[PatientPort
         )
     return patient
 
-@router.get('/patients')
+@router.get(
+    '/patients',
+    description="Пациенты по имени, страницами (курсор — next_cursor предыдущей страницы); "
+                "q — начало имени без учёта регистра; with_last_result — последний итог КТГ каждого пациента"
+)
 @inject
-async def get_all_patients_endpoint(patient_repo: FromDishka[PatientPort]) -> list[Patient]:
-    try:
-        patients = await get_all_patients(patient_repo)
-    except NotFoundObject:
+async def list_patients_endpoint(
+        patient_repo: FromDishka[PatientPort],
+        limit: int = Query(100, ge=1, le=500),
+        after_name: str | None = None,
+        after_id: int | None = None,
+        q: str | None = Query(None, max_length=255),
+        with_last_result: bool = False,
+) -> PatientPage:
+    if (after_name is None) != (after_id is None):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Patients cannot be retrieved"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_name and after_id must be passed together"
         )
-    return patients
+    cursor = PatientCursor(full_name=after_name, id=after_id) if after_id is not None else None
+    return await list_patients(patient_repo, limit, cursor, q, with_last_result)
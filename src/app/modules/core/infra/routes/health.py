@@ -0,0 +1,84 @@
+import secrets
+from typing import Any
+
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from pydantic import BaseModel
+
+from app.common.cache import ReadCache
+from app.common.write_behind import WriteBehindWriter
+
+router = APIRouter()
+
+
+class CacheInvalidation(BaseModel):
+    """Что поменялось в БД в обход этого процесса (storage_server).
+
+    Кэш у каждого процесса свой: запрос сбрасывает его только в воркере,
+    который запрос принял. Остальные воркеры увидят изменение не позже
+    READ_CACHE_TTL секунд — при нескольких воркерах это и есть граница
+    устаревания, а не мгновенный сброс.
+    """
+
+    patient_id: int | None = None      # изменена карточка пациента
+    new_patient: bool = False          # добавлен пациент — меняется только список
+    ctg_patient_id: int | None = None  # у пациента новая запись КТГ
+    ctg_id: int | None = None          # у КТГ новый итог
+
+
+@router.get('/health', description="Процесс жив и принимает запросы")
+async def health() -> dict[str, str]:
+    return {'status': 'ok'}
+
+
+@router.get('/ready', description="Модели загружены и прогреты, воркер готов принимать сессии")
+async def ready(request: Request) -> dict[str, str]:
+    warmup = getattr(request.app.state, 'ml_warmup', None)
+    if warmup is not None:
+        if not warmup.done():
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Модели ещё загружаются")
+        if warmup.cancelled() or warmup.exception() is not None:
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Прогрев моделей завершился ошибкой")
+    return {'status': 'ready'}
+
+
+@router.get('/metrics/db', description="Пакетная запись в БД: очередь, число сбросов, задержка сброса")
+@inject
+async def db_metrics(writer: FromDishka[WriteBehindWriter]) -> dict[str, Any]:
+    return writer.to_dict()
+
+
+@router.get('/metrics/cache', description="Кэш чтения пациентов и КТГ: попадания, промахи, вытеснения")
+@inject
+async def cache_metrics(cache: FromDishka[ReadCache]) -> dict[str, Any]:
+    return cache.to_dict()
+
+
+@router.post(
+    '/cache/invalidate',
+    status_code=status.HTTP_204_NO_CONTENT,
+    description=(
+        "Сброс кэша чтения после записи в БД другим процессом. Нужен заголовок X-Cache-Token "
+        "с READ_CACHE_INVALIDATE_TOKEN. Сбрасывает кэш только принявшего запрос воркера, "
+        "остальные догоняют по TTL"
+    ),
+)
+@inject
+async def invalidate_cache(
+        body: CacheInvalidation,
+        cache: FromDishka[ReadCache],
+        x_cache_token: str | None = Header(default=None),
+) -> None:
+    expected = cache.settings.invalidate_token
+    if (
+        expected is None
+        or x_cache_token is None
+        or not secrets.compare_digest(x_cache_token.encode(), expected.get_secret_value().encode())
+    ):
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Неверный или не настроенный токен сброса кэша")
+    if body.patient_id is not None or body.new_patient:
+        cache.invalidate_patient(body.patient_id)
+    if body.ctg_patient_id is not None:
+        cache.invalidate_patient_ctgs(body.ctg_patient_id)
+    if body.ctg_id is not None:
+        cache.invalidate_ctg(body.ctg_id)
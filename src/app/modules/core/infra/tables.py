@@ -0,0 +1,148 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import MISSING, fields
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from sqlalchemy import (
+    Column,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    TypeDecorator,
+)
+from sqlalchemy.sql.elements import ColumnElement
+
+T = TypeVar("T")
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+class IsoDateTime(TypeDecorator):
+    """Дата-время в SQLite как ISO-строка (с часовым поясом, разной точности).
+
+    Стандартный DateTime диалекта SQLite не разбирает смещение '+03:00',
+    поэтому строка разбирается datetime.fromisoformat в процессоре результата —
+    один вызов на значение, без обёрток TypeDecorator.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.isoformat(" ") if isinstance(value, datetime) else value
+
+    def result_processor(self, dialect, coltype):
+        return _parse_iso
+
+
+metadata = MetaData()
+
+patients = Table(
+    "patients", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("full_name", String(255), nullable=False),
+    Column("name_key", String(255), nullable=False),  # full_name.casefold(), пишется вместе с ним
+)
+
+patient_info = Table(
+    "patient_info", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("patient_id", Integer, ForeignKey("patients.id"), nullable=False),
+    Column("diagnosis", Text),
+    Column("blood_gas_ph", Float),
+    Column("blood_gas_co2", Float),
+    Column("blood_gas_glu", Float),
+    Column("blood_gas_lac", Float),
+    Column("blood_gas_be", Float),
+    Column("anamnesis", Text),
+)
+
+ctg_history = Table(
+    "ctg_history", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("patient_id", Integer, ForeignKey("patients.id"), nullable=False),
+    Column("file_path", String(255), nullable=False),
+    Column("archive_path", String(255)),
+)
+
+ctg_results = Table(
+    "ctg_results", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("ctg_id", Integer, ForeignKey("ctg_history.id"), nullable=False),
+    Column("gest_age", String(255), nullable=False),
+    Column("bpm", Float),
+    Column("uc", Float),
+    Column("figo", String(20)),
+    Column("figo_prognosis", String(20)),
+    Column("bhr", Float),
+    Column("amplitude_oscillations", Float),
+    Column("oscillation_frequency", Float),
+    Column("ltv", Integer),
+    Column("stv", Integer),
+    Column("stv_little", Integer),
+    Column("accelerations", Integer),
+    Column("decelerations", Integer),
+    Column("uterine_contractions", Integer),
+    Column("fetal_movements", Integer),
+    Column("fetal_movements_little", Integer),
+    Column("accelerations_little", Integer),
+    Column("deceleration_little", Integer),
+    Column("high_variability", Integer),
+    Column("low_variability", Integer),
+    Column("loss_signals", Float),
+    Column("created_at", IsoDateTime, nullable=False),
+)
+
+
+class Projection(Generic[T]):
+    """Колонки table для dataclass entity и сборка entity из строк результата.
+
+    Колонки идут в порядке полей entity; renamed: поле -> колонка, если имена
+    расходятся. Поля с умолчанием, которых нет в таблице, получают умолчание
+    (они должны идти последними). Поле без колонки и без умолчания — ошибка при
+    импорте, а не молча съехавшие позиционные индексы.
+
+    Сборка пишет значения прямо в слоты, минуя __init__: у frozen-dataclass он
+    идёт через object.__setattr__ на каждое поле, и на списках в тысячи строк
+    это заметная доля времени запроса.
+    """
+
+    def __init__(self, table: Table, entity: type[T], **renamed: str):
+        self.entity = entity
+        columns, setters, defaults = [], [], []
+        for f in fields(entity):
+            name = renamed.get(f.name, f.name)
+            setter = getattr(entity, f.name).__set__  # слот (entity — slots=True)
+            if name in table.c:
+                if defaults:
+                    raise TypeError(f"{entity.__name__}.{f.name}: поле с колонкой после полей без колонок")
+                columns.append(table.c[name].label(f.name))
+                setters.append(setter)
+            elif f.default is not MISSING:
+                defaults.append((setter, f.default))
+            else:
+                raise LookupError(f"{entity.__name__}.{f.name}: нет колонки {table.name}.{name}")
+        self.columns: tuple[ColumnElement, ...] = tuple(columns)
+        self._setters = tuple(setters)
+        self._defaults = tuple(defaults)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def build(self, row: Sequence) -> T:
+        obj = object.__new__(self.entity)
+        for setter, value in zip(self._setters, row):
+            setter(obj, value)
+        for setter, value in self._defaults:
+            setter(obj, value)
+        return obj
+
+    def build_many(self, rows: Iterable[Sequence]) -> list[T]:
+        build = self.build
+        return [build(row) for row in rows]
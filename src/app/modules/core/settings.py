@@ -1,6 +1,7 @@
 import functools
 import os
 
+from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -24,4 +25,55 @@ class DatabaseSettings(BaseSettings):
             f"/{self.database_name}"
         )
 
-    model_config = SettingsConfigDict(env_prefix='DB_', extra='allow')
\ No newline at end of file
+    model_config = SettingsConfigDict(env_prefix='DB_', extra='allow')
+
+class HTTPClientSettings(BaseSettings):
+    """Настройки общего HTTP-клиента для исходящих запросов (эмулятор, storage_server)."""
+
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    retries: int = 3
+
+    model_config = SettingsConfigDict(env_prefix='HTTP_CLIENT_', extra='allow')
+
+class WriteBehindSettings(BaseSettings):
+    """Пакетная запись одиночных INSERT'ов (итоги КТГ, история записей)."""
+
+    # сколько дополнительно ждать попутчиков после первой строки, сек; при 0 пачку
+    # составляют строки, пришедшие, пока шёл предыдущий сброс (group commit)
+    flush_interval: float = 0.0
+    max_batch: int = 500           # пачка пишется сразу, не дожидаясь интервала
+    slow_flush: float = 0.5        # порог предупреждения в логах, сек
+    latency_window: int = 1024     # по скольким последним сбросам считаются квантили
+
+    model_config = SettingsConfigDict(env_prefix='DB_WRITE_BEHIND_', extra='allow')
+
+class SQLiteSettings(BaseSettings):
+    """Профиль SQLite: применяется к каждому новому соединению (см. app.common.sqlite)."""
+
+    journal_mode: str = 'WAL'        # читатели не блокируют писателя
+    synchronous: str = 'NORMAL'      # в WAL fsync только на checkpoint
+    busy_timeout_ms: int = 5000      # ждать лок вместо немедленного "database is locked"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024  # на соединение
+    reader_pool_size: int = 8
+    reader_max_overflow: int = 8
+
+    model_config = SettingsConfigDict(env_prefix='DB_SQLITE_', extra='allow')
+
+class ReadCacheSettings(BaseSettings):
+    """Кэш чтения пациентов и списков КТГ в памяти процесса (см. app.common.cache)."""
+
+    enabled: bool = True
+    ttl: float = 30.0          # верхняя граница устаревания, если инвалидация не дошла, сек
+    max_entries: int = 4096    # сверх этого вытесняются самые давние по обращению
+    max_ctg_owners: int = 65536  # запомненных владельцев КТГ (ctg_id -> пациент), тоже LRU
+    # общий секрет для POST /cache/invalidate (заголовок X-Cache-Token); без него эндпоинт закрыт
+    invalidate_token: SecretStr | None = None
+
+    model_config = SettingsConfigDict(env_prefix='READ_CACHE_', extra='allow')
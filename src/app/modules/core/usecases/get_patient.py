@@ -1,4 +1,4 @@
-from app.modules.core.domain.patient import Patient
+from app.modules.core.domain.patient import Patient, PatientCursor, PatientPage
 from app.modules.core.usecases.exceptions import NotFoundObject
 from app.modules.core.usecases.ports.patients import PatientPort
 
@@ -12,5 +12,14 @@ async def get_patient(patient_id: int, patient_repo: PatientPort) -> Patient:
     return patient
 
 
-async def get_all_patients(patient_repo: PatientPort) -> list[Patient]:
-    return await patient_repo.get_all()
+async def list_patients(
+        patient_repo: PatientPort,
+        limit: int,
+        cursor: PatientCursor | None = None,
+        name_prefix: str | None = None,
+        with_last_result: bool = False,
+) -> PatientPage:
+    if name_prefix is not None:
+        # поиск без учёта регистра: сравнивается с patients.name_key (full_name.casefold())
+        name_prefix = name_prefix.strip().casefold() or None
+    return await patient_repo.list_patients(limit, cursor, name_prefix, with_last_result)
@@ -1,20 +1,14 @@
 from collections.abc import Iterable
 
-from sqlalchemy.util import await_only
-
-from app.modules.core.domain.ctg import CTGHistory
+from app.modules.core.domain.ctg import CTGCursor, CTGHistory, CTGOverviewPage
 from app.modules.core.usecases.ports.ctg import CTGPort
-from app.modules.core.usecases.ports.patients import PatientPort
 
 
-async def get_patient_ctgs(
-        patient_id: int, patient_repo: PatientPort, ctg_repo: CTGPort
-) -> Iterable[CTGHistory]:
-    ctgs_ids = await patient_repo.get_ctgs(patient_id)
+async def get_patient_ctgs(patient_id: int, ctg_repo: CTGPort) -> Iterable[CTGHistory]:
+    return (await ctg_repo.list_patient_overview(patient_id)).items
 
-    ctg_dict = {ctg.id: ctg for ctg in await ctg_repo.list_ctg(ctgs_ids)}
-    for result in await ctg_repo.list_results(ctgs_ids):
-        if result.ctg_id in ctg_dict.keys():
-            ctg_dict[result.ctg_id].result = result
 
-    return ctg_dict.values()
+async def get_patient_ctg_overview(
+        patient_id: int, ctg_repo: CTGPort, limit: int, cursor: CTGCursor | None = None
+) -> CTGOverviewPage:
+    return await ctg_repo.list_patient_overview(patient_id, limit=limit, cursor=cursor)
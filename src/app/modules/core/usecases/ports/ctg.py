@@ -1,6 +1,6 @@
 from typing import Protocol
 
-from app.modules.core.domain.ctg import CTGHistory, CTGResult
+from app.modules.core.domain.ctg import CTGCursor, CTGHistory, CTGOverviewPage, CTGResult
 
 
 class CTGPort(Protocol):
@@ -9,4 +9,8 @@ class CTGPort(Protocol):
 
     async def list_results(self, ctg_ids: list[int]) -> list[CTGResult]: ...
 
+    async def list_patient_overview(
+            self, patient_id: int, limit: int | None = None, cursor: CTGCursor | None = None
+    ) -> CTGOverviewPage: ...
+
     async def add_history(self, ctg_history: CTGHistory, patient_id: int) -> int: ...
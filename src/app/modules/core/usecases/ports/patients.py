@@ -1,6 +1,6 @@
 from typing import Protocol
 
-from app.modules.core.domain.patient import Patient, PatientAdditionalInfo
+from app.modules.core.domain.patient import Patient, PatientAdditionalInfo, PatientCursor, PatientPage
 
 
 class PatientPort(Protocol):
@@ -11,4 +11,10 @@ class PatientPort(Protocol):
 
     async def get_ctgs(self, patient_id: int) -> list[int]: ...
 
-    async def get_all(self) -> list[Patient]: ...
\ No newline at end of file
+    async def list_patients(
+            self,
+            limit: int,
+            cursor: PatientCursor | None = None,
+            prefix: str | None = None,
+            with_last_result: bool = False,
+    ) -> PatientPage: ...
\ No newline at end of file
@@ -1,34 +1,65 @@
-import pandas as pd
+import time
+
+import numpy as np
+import structlog
 
 from app.common.ctg import CurrentCtgID
+from app.common.provider import get_container
 from app.modules.ingest.entities.ctg import CardiotocographyPoint
 from app.modules.ml.application.interfaces.fetal_monitoring import IFetalMonitoring
+from app.modules.ml.application.interfaces.notifications import NotificationPort
+from app.modules.ml.application.interfaces.results import ResultPort
 from app.modules.ml.domain.entities.process import Process
-from app.modules.ml.infrastucture.services.result_repo import ResultRepository
+from app.modules.ml.settings import notification_settings
+
+logger = structlog.get_logger('ml')
 
 
 class FetalMonitoringHandler:
     def __init__(self, fetal_monitoring_service: IFetalMonitoring):
         self.fetal_monitoring_service = fetal_monitoring_service
-        self._df = pd.DataFrame()
-        self._result_repo = ResultRepository()
+        self._last_flush = time.monotonic()
 
     def process_stream(self, points: list[CardiotocographyPoint]) -> Process:
-        start_ts = points[0].timestamp
-        rows = []
-        for p in points:
-            # time_sec = p.timestamp - start_ts
-            # print(time_sec, p.timestamp, start_ts)
-            rows.append({
-                "time_sec": p.timestamp,
-                "value_bpm": float(p.bpm) if p.bpm is not None else None,
-                "value_uterus": float(p.uc) if p.uc is not None else None,
-            })
-        self._df = pd.DataFrame(rows, columns=["time_sec", "value_bpm", "value_uterus"])
-
-        result: Process = self.fetal_monitoring_service.process_stream(self._df)
+        n = len(points)
+        times = np.fromiter((p.timestamp for p in points), dtype=float, count=n)
+        fhr = np.fromiter(
+            (np.nan if p.bpm is None else p.bpm for p in points), dtype=float, count=n
+        )
+        uc = np.fromiter(
+            (np.nan if p.uc is None else p.uc for p in points), dtype=float, count=n
+        )
+        result: Process = self.fetal_monitoring_service.process_stream(times, fhr, uc)
         return result
 
+    async def flush_notifications(self, force: bool = False) -> None:
+        """Пачкой пишет накопленные уведомления в ctg_notifications."""
+        service = self.fetal_monitoring_service
+        pending = service.pending_notifications()
+        if not pending:
+            return
+        if not force and pending < notification_settings.flush_batch and (
+                time.monotonic() - self._last_flush < notification_settings.flush_interval
+        ):
+            return
+
+        batch = service.drain_notifications()
+        self._last_flush = time.monotonic()
+        if CurrentCtgID.is_empty():
+            return  # сессия не привязана к КТГ — сохранять некуда
+
+        try:
+            async with get_container('async')() as di:
+                repo = await di.get(NotificationPort)
+                await repo.add_many(CurrentCtgID.get(), batch)
+        except Exception:
+            logger.exception('notifications_flush_failed', count=len(batch))
+            service.requeue_notifications(batch)
+
     async def finalize(self) -> None:
+        await self.flush_notifications(force=True)
         result = self.fetal_monitoring_service.finalize_process()
-        await self._result_repo.add_result(CurrentCtgID.get(), result)
+        # сессия берётся из общего пула приложения и закрывается по выходу из scope
+        async with get_container('async')() as di:
+            repo = await di.get(ResultPort)
+            await repo.add_result(CurrentCtgID.get(), result)
@@ -1,14 +1,20 @@
-from typing import Protocol
+from __future__ import annotations
 
-import pandas as pd
+from typing import TYPE_CHECKING, Protocol
 
-from app.modules.ml.domain.entities.process import Process, ProcessResults
+import numpy as np
+
+from app.modules.ml.domain.entities.process import Notification, Process, ProcessResults
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class IFetalMonitoring(Protocol):
-    def process_stream(self, df: pd.DataFrame) -> Process:
+    def process_stream(self, times: np.ndarray, fhr: np.ndarray, uc: np.ndarray) -> Process:
         """
-        Вызывается раз в секунду. Обновляет внутреннее состояние и отдаёт last_notification.
+        Вызывается раз в секунду с пачкой новых отсчётов (time_sec, bpm, uc; пропуски — NaN).
+        Обновляет внутреннее состояние и отдаёт last_notification.
         """
         ...
 
@@ -43,4 +49,16 @@ class IFetalMonitoring(Protocol):
         """
         ...
 
-    def finalize_process(self) -> ProcessResults: ...
\ No newline at end of file
+    def finalize_process(self) -> ProcessResults: ...
+
+    def pending_notifications(self) -> int:
+        """Сколько уведомлений ещё не сброшено в хранилище."""
+        ...
+
+    def drain_notifications(self) -> list[tuple[int, Notification]]:
+        """Забирает накопленные уведомления (time_sec, уведомление) для записи."""
+        ...
+
+    def requeue_notifications(self, batch: list[tuple[int, Notification]]) -> None:
+        """Возвращает пачку, которую не удалось записать."""
+        ...
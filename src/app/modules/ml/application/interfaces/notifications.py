@@ -0,0 +1,18 @@
+from collections.abc import Sequence
+from typing import Protocol
+
+from app.modules.ml.domain.entities.process import Notification, NotificationRecord
+
+
+class NotificationPort(Protocol):
+
+    async def add_many(self, ctg_id: int, notifications: Sequence[tuple[int, Notification]]) -> None: ...
+
+    async def list_notifications(
+            self,
+            ctg_id: int,
+            time_from: int | None = None,
+            time_to: int | None = None,
+            after_id: int | None = None,
+            limit: int = 100,
+    ) -> list[NotificationRecord]: ...
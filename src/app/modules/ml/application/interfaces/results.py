@@ -0,0 +1,8 @@
+from typing import Protocol
+
+from app.modules.ml.domain.entities.process import ProcessResults
+
+
+class ResultPort(Protocol):
+
+    async def add_result(self, ctg_id: int, result: ProcessResults) -> None: ...
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ContractionRef:
+    contraction_start: int
+    contraction_peak: int
+
+
+@dataclass(frozen=True, slots=True)
+class Contraction:
+    start: int
+    end: int
+    peak: int
+    peak_value: float
+    base: float
+    thr: float
+    amp: float
+
+
+@dataclass(frozen=True, slots=True)
+class Acceleration:
+    start: int
+    end: int
+    amp_bpm: float
+    dur_s: int
+
+
+@dataclass(frozen=True, slots=True)
+class Deceleration:
+    start: int
+    end: int
+    amp_bpm: float
+    dur_s: int
+    type: str  # "early" | "late" | "variable"
+    grade: str | None
+    uc_ref: ContractionRef | None
@@ -8,7 +8,7 @@ class TimeRange:
     end: int
 
 
-class Color(Enum):
+class Color(str, Enum):
     RED = "red"
     GREEN = "green"
     YELLOW = "yellow"
@@ -21,6 +21,20 @@ class Notification:
     color: Color
 
 
+@dataclass(frozen=True, slots=True)
+class NotificationRecord:
+    id: int
+    time_sec: int
+    message: str
+    color: Color
+
+
+@dataclass(frozen=True, slots=True)
+class NotificationPage:
+    items: list[NotificationRecord]
+    next_after_id: int | None
+
+
 @dataclass(frozen=True, slots=True)
 class Process:
     time_sec: int
@@ -1,22 +1,86 @@
-import os
 import pickle
+import time
+from functools import cache
+from importlib import import_module
 from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import structlog
 
 from app.modules.ml.application.handlers.fetal_monitoring_handler import (
     FetalMonitoringHandler,
 )
-from app.modules.ml.infrastucture.services.fetal_monitoring import (
-    FetalMonitoringService,
-)
+from app.modules.ml.infrastucture.services.instrumentation import pipeline_metrics
 
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_HYPOXIA_CONFIG_PATH = BASE_DIR / "services" / "model_hypoxia_config.pkl"
 MODEL_STV_CONFIG_PATH = BASE_DIR / "services" / "model_stv_config.pkl"
 
 
+# стадии тянут numpy/scipy, а конфиги — catboost; импортируются при первой сессии
+# или заранее в фоне (warm_up), но не при импорте роутеров
+ML_MODULES = (
+    "app.modules.ml.infrastucture.services.fetal_monitoring",
+    "catboost",
+)
+
+
+logger = structlog.get_logger('ml')
+
+
+@cache
+def load_model_configs() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Конфиги моделей (гипоксия, STV); загружаются один раз на процесс и общие для сессий."""
+    with open(MODEL_HYPOXIA_CONFIG_PATH, "rb") as f:
+        model_hypoxia_config = pickle.load(f)
+    with open(MODEL_STV_CONFIG_PATH, "rb") as f:
+        model_stv_config = pickle.load(f)
+    return model_hypoxia_config, model_stv_config
+
+
+def warm_up() -> None:
+    """Готовит воркер к первой сессии; вызывается из lifespan в отдельном потоке.
+
+    Импортирует ML-модули, загружает модели и прогоняет predict/predict_proba на
+    синтетическом окне, чтобы первый тик ModelsStage не платил за ленивую
+    инициализацию CatBoost.
+    """
+    started = time.perf_counter()
+    for name in ML_MODULES:
+        import_module(name)
+    import numpy as np
+
+    from app.modules.ml.infrastucture.services.features import (
+        extract_window_features,
+        feature_row,
+    )
+
+    model_hypoxia_config, model_stv_config = load_model_configs()
+    fs, window = model_hypoxia_config.get("fs", 5), model_stv_config["window_size"]
+    t = np.arange(window * fs) / fs
+    fhr = 140 + 5 * np.sin(2 * np.pi * t / 40)
+    uc = 10 + 30 * np.clip(np.sin(2 * np.pi * t / 180), 0, None)
+    feats = extract_window_features(fhr, uc, window)
+
+    for spec in model_stv_config["models"].values():
+        spec["model"].predict(feature_row(feats, spec["features"]))
+    hypoxia_model = model_hypoxia_config["model"]
+    hypoxia_model.predict_proba(feature_row(
+        feats, model_hypoxia_config.get("features") or hypoxia_model.feature_names_
+    ))
+    logger.info('ml_warmup_done', seconds=round(time.perf_counter() - started, 3))
+
+
 def get_fetal_monitoring_handler() -> FetalMonitoringHandler:
-    model_hypoxia_config = pickle.load(open(MODEL_HYPOXIA_CONFIG_PATH, "rb"))
-    model_stv_config = pickle.load(open(MODEL_STV_CONFIG_PATH, "rb"))
-    processor = FetalMonitoringService(model_hypoxia_config, model_stv_config)
+    from app.modules.ml.infrastucture.services.fetal_monitoring import (
+        FetalMonitoringService,
+    )
+
+    model_hypoxia_config, model_stv_config = load_model_configs()
+    processor = FetalMonitoringService(
+        model_hypoxia_config,
+        model_stv_config,
+        metrics=pipeline_metrics.session() if pipeline_metrics is not None else None,
+    )
     handler = FetalMonitoringHandler(fetal_monitoring_service=processor)
     return handler
@@ -4,10 +4,12 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Deque, Dict, List, Optional, Tuple
 
-import numpy as np
-import pandas as pd
-
-from app.modules.ml.infrastucture.services.utils import mean_last_second
+from app.modules.ml.domain.entities.process import Color, Notification
+from app.modules.ml.settings import notification_settings
+from app.modules.ml.infrastucture.services.events import EventStore
+from app.modules.ml.infrastucture.services.samples import Columns, SampleBuffer
+from app.modules.ml.infrastucture.services.stv import STVTracker
+from app.modules.ml.infrastucture.services.window import WindowCache
 
 
 @dataclass
@@ -22,20 +24,36 @@ class HypoxiaModelConfig:
     model: Any
     fs: int = 5
     ewma_alpha: float = 0.01
+    # порядок признаков, на котором обучалась модель
+    features: Tuple[str, ...] = ()
 
 
 class NotificationCenter:
-    def __init__(self):
-        self.notifications: Dict[int, List[Dict[str, str]]] = {}
+    """Состояние для кадра + уведомления сессии.
+
+    В notifications живут только последние ring_size уведомлений (их и видит
+    фронт); все уведомления дополнительно копятся в outbox до сброса в БД.
+    """
+
+    def __init__(
+            self,
+            ring_size: int = notification_settings.ring_size,
+            outbox_limit: int = notification_settings.outbox_limit,
+    ):
+        self.notifications: Dict[int, List[Notification]] = {}
+        self._ring: Deque[int] = deque()  # now_t каждого уведомления в порядке поступления
+        self._ring_size = ring_size
+        self.outbox: Deque[Tuple[int, Notification]] = deque(maxlen=outbox_limit)
+        self.events = EventStore()
         self.last_notification: Dict[str, Any] = {
             "tachycardia": "Недостаточно данных",
             "hypoxia_proba": None,
             "hypoxia_proba_ewma": None,
-            # детальные события
-            "accelerations": [],
-            "decelerations": [],
+            # детальные события (те же индексы, что и в self.events)
+            "accelerations": self.events.accelerations,
+            "decelerations": self.events.decelerations,
             # обнаруженные схватки (по UC)
-            "contractions": [],
+            "contractions": self.events.contractions,
             # оценка по Савельевой
             "savelyeva_score": None,
             "savelyeva_category": None,  # "Норма" | "Начальные нарушения" | "Выраженные изменения"
@@ -54,17 +72,41 @@ class NotificationCenter:
             "time_sec": 0,
         }
 
-    def notify(self, now_t: int, message: str, color: str = "yellow"):
+    def notify(self, now_t: int, message: str, color: Color = Color.YELLOW):
+        notification = Notification(message=message, color=Color(color))
         if now_t not in self.notifications:
             self.notifications[now_t] = []
-        self.notifications[now_t].append({"message": message, "color": color})
+        self.notifications[now_t].append(notification)
+        self.outbox.append((now_t, notification))
+
+        self._ring.append(now_t)
+        if len(self._ring) > self._ring_size:
+            oldest = self._ring.popleft()
+            bucket = self.notifications[oldest]
+            bucket.pop(0)
+            if not bucket:
+                del self.notifications[oldest]
+
+    def drain_outbox(self) -> List[Tuple[int, Notification]]:
+        batch = list(self.outbox)
+        self.outbox.clear()
+        return batch
+
+    def requeue(self, batch: List[Tuple[int, Notification]]) -> None:
+        """Возвращает неотправленную пачку в начало outbox (лишние старые отбрасываются)."""
+        pending = batch + list(self.outbox)
+        self.outbox.clear()
+        self.outbox.extend(pending[-self.outbox.maxlen:])
 
 
 @dataclass
 class StreamContext:
     # time & data
     now_t: int = 0
-    current_df: Optional[pd.DataFrame] = None
+    # пачка, пришедшая в этом тике (забирает IngestionStage)
+    incoming: Optional[Columns] = None
+    # отсчёты за последние buffer_seconds (создаётся в __post_init__ под fs)
+    samples: Optional[SampleBuffer] = None
 
     # second-wise buffers (ring)
     sec_fhr: Deque[Tuple[int, float]] = field(
@@ -93,6 +135,19 @@ class StreamContext:
     # io / events
     nc: NotificationCenter = field(default_factory=NotificationCenter)
 
+    # потоковый STV (создаётся в __post_init__ под fs)
+    stv: Optional[STVTracker] = None
+
+    # счётчики изменений входов стадий (см. StageScheduler):
+    # samples — новые отсчёты, fhr/uc — новое непустое посекундное значение,
+    # median_fhr_10min — пересчитана 10-минутная медиана (TachyBradyStage)
+    versions: Dict[str, int] = field(
+        default_factory=lambda: {"samples": 0, "fhr": 0, "uc": 0, "median_fhr_10min": 0}
+    )
+
+    # окна FHR текущего тика (статистики окна считаются один раз за тик)
+    windows: WindowCache = field(default_factory=WindowCache)
+
     # parameters
     fs: int = 5
     accel_delta_bpm: int = 15
@@ -103,17 +158,11 @@ class StreamContext:
     tachy_eval_every_sec: int = 10
     brady_threshold_bpm: int = 110
     brady_eval_every_sec: int = 10
-
-    def mean_last_second(self) -> Tuple[float, float]:
-        if self.current_df is None or self.current_df.empty:
-            return (np.nan, np.nan)
-        return mean_last_second(self.current_df, self.now_t)
-
-    def create_window_df(self) -> pd.DataFrame:
-        w = self.stv_cfg["window_size"]
-        df = self.current_df
-        sl = df[
-            (df["time_sec"] >= self.now_t - w) & (df["time_sec"] <= self.now_t)
-            ].copy()
-        sl["window_time_max"] = self.now_t
-        return sl
+    # самое длинное окно стадий — 20 мин у шкалы Фишера
+    buffer_seconds: int = 30 * 60
+
+    def __post_init__(self):
+        if self.stv is None:
+            self.stv = STVTracker(fs=self.fs)
+        if self.samples is None:
+            self.samples = SampleBuffer(self.fs * self.buffer_seconds)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Generic, Iterator, List, Optional, TypeVar
+
+from app.modules.ml.domain.entities.events import Acceleration, Contraction, Deceleration
+
+E = TypeVar("E", Acceleration, Deceleration, Contraction)
+
+
+class EventIndex(Generic[E]):
+    """События одного вида, упорядоченные по времени начала.
+
+    Запросы «с момента t» и «пересекающиеся с [t0, t1]» идут через bisect по
+    списку стартов, поэтому их стоимость зависит от числа событий в окне, а не
+    от длины всей записи.
+    """
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._items: List[E] = []
+        self._max_duration = 0
+        self.last_time: Optional[int] = None  # максимальный end
+
+    def add(self, event: E) -> None:
+        start = event.start
+        if not self._starts or start >= self._starts[-1]:
+            self._starts.append(start)
+            self._items.append(event)
+        else:
+            i = bisect_right(self._starts, start)
+            self._starts.insert(i, start)
+            self._items.insert(i, event)
+
+        self._max_duration = max(self._max_duration, event.end - start)
+        if self.last_time is None or event.end > self.last_time:
+            self.last_time = event.end
+
+    def since(self, t: int) -> List[E]:
+        """События со start >= t."""
+        return self._items[bisect_left(self._starts, t):]
+
+    def count_since(self, t: int) -> int:
+        return len(self._starts) - bisect_left(self._starts, t)
+
+    def overlapping(self, t0: int, t1: int) -> List[E]:
+        """События, пересекающиеся с [t0, t1]."""
+        lo = bisect_left(self._starts, t0 - self._max_duration)
+        hi = bisect_right(self._starts, t1)
+        return [e for e in self._items[lo:hi] if e.end >= t0]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[E]:
+        return iter(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+
+class EventStore:
+    """Акцелерации, децелерации и схватки сессии с индексом по времени начала."""
+
+    def __init__(self) -> None:
+        self.accelerations: EventIndex[Acceleration] = EventIndex()
+        self.decelerations: EventIndex[Deceleration] = EventIndex()
+        self.contractions: EventIndex[Contraction] = EventIndex()
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return {
+            "accelerations": len(self.accelerations),
+            "decelerations": len(self.decelerations),
+            "contractions": len(self.contractions),
+        }
@@ -1,16 +1,15 @@
 import numpy as np
-import pandas as pd
 from scipy import signal
 from scipy.stats import kurtosis, skew
 
+from app.modules.ml.infrastucture.services.utils import rolling_median
+
 
 def detect_baseline(fhr, window_size=50):
     """Calculate baseline FHR using moving median"""
     if len(fhr) < window_size:
         return np.median(fhr)
-    return np.median(
-        pd.Series(fhr).rolling(window=window_size, center=True, min_periods=1).median()
-    )
+    return np.median(rolling_median(fhr, window_size))
 
 
 def detect_accelerations(fhr, baseline, threshold=15, duration=2):
@@ -232,11 +231,26 @@ def extract_features(window_df):
     """
     if window_df.empty:
         return {}
+    return extract_window_features(
+        window_df["value_bpm"].values,
+        window_df["value_uterus"].values,
+        window_df["window_time_max"].values[0],
+    )
+
+
+def feature_row(features, names):
+    """One-row matrix of features in the model's training order"""
+    return np.array([[features[name] for name in names]], dtype=float)
 
-    fhr = window_df["value_bpm"].values
-    uc = window_df["value_uterus"].values
-    window_time = window_df["window_time_max"].values[0]
 
+def extract_window_features(fhr, uc, window_time):
+    """
+    Same features as extract_features, but from plain arrays (streaming path)
+
+    Args:
+        fhr, uc: non-empty float arrays of the window
+        window_time: end of the window, sec
+    """
     # Basic statistics
     median_fhr = np.median(fhr)
     mean_fhr = np.mean(fhr)
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LinearRegression
 
 from app.modules.ml.application.interfaces.fetal_monitoring import IFetalMonitoring
-from app.modules.ml.domain.entities.process import Process, ProcessResults
+from app.modules.ml.domain.entities.process import Notification, Process, ProcessResults
 from app.modules.ml.infrastucture.services.context import StreamContext, HypoxiaModelConfig
+from app.modules.ml.infrastucture.services.instrumentation import SessionMetrics
 from app.modules.ml.infrastucture.services.stages import (
     AdvancedAccelDecelStage,
     ContractionStage,
@@ -22,27 +22,44 @@ from app.modules.ml.infrastucture.services.stages import (
     STV10MinStage,
     TachyBradyStage,
 )
-from app.modules.ml.infrastucture.services.utils import (
-    calculate_stv,
-    median_last_seconds,
-    rolling_stv_mean_10min,
-)
+from app.modules.ml.infrastucture.services.scheduler import StageScheduler
+from app.modules.ml.infrastucture.services.stv import nan_to_none, tail_baseline
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class StreamingPipeline:
-    """Соединяет стадии вместе; один .step(df) = одна секунда обработки."""
+    """Соединяет стадии вместе; один .step(df) = одна секунда обработки.
+
+    Какие стадии запускать в эту секунду, решает StageScheduler.
+    """
 
-    def __init__(self, ctx: StreamContext, stages: List[Stage]):
+    def __init__(
+            self, ctx: StreamContext, stages: List[Stage], metrics: Optional[SessionMetrics] = None
+    ):
         self.ctx = ctx
         self.stages = stages
-
-    def step(self, df: pd.DataFrame) -> Process:
-        # update source df (new rows may have arrived)
-        self.ctx.current_df = df if df is not None else self.ctx.current_df
-
-        # run stages in order
-        for stage in self.stages:
-            stage.tick(self.ctx)
+        self.metrics = metrics
+        self.scheduler = StageScheduler(stages, ctx)
+
+    def step(
+            self,
+            times: Optional[np.ndarray] = None,
+            fhr: Optional[np.ndarray] = None,
+            uc: Optional[np.ndarray] = None,
+    ) -> Process:
+        # new samples (if any) are picked up by IngestionStage
+        if times is not None:
+            self.ctx.incoming = (times, fhr, uc)
+
+        # run due stages in order
+        if self.metrics is None:
+            for slot in self.scheduler.slots:
+                if slot.should_run(self.ctx):
+                    slot.stage.tick(self.ctx)
+        else:
+            self._step_instrumented(self.metrics)
 
         # snapshot -> Process
         ln = self.ctx.nc.last_notification
@@ -65,12 +82,28 @@ class StreamingPipeline:
             hypoxia_proba=ln.get("hypoxia_proba"),
         )
 
+    def _step_instrumented(self, metrics: SessionMetrics) -> None:
+        perf = time.perf_counter
+        profiler = metrics.start_tick()
+        tick_start = perf()
+        for slot in self.scheduler.slots:
+            if not slot.should_run(self.ctx):
+                continue
+            t0 = perf()
+            slot.stage.tick(self.ctx)
+            metrics.observe_stage(slot.name, perf() - t0)
+        metrics.finish_tick(perf() - tick_start, profiler, self.ctx.now_t)
+
 
 def finalize_results(ctx: StreamContext) -> ProcessResults:
-    df = ctx.current_df
-    if df is None or df.empty:
+    samples = ctx.samples
+    if not samples.total:
         return ProcessResults(
             last_figo=None,
+            last_savelyeva=None,
+            last_savelyeva_category=None,
+            last_fischer=None,
+            last_fischer_category=None,
             baseline_bpm=None,
             stv_all=None,
             stv_10min_mean=None,
@@ -78,61 +111,45 @@ def finalize_results(ctx: StreamContext) -> ProcessResults:
             decelerations_count=0,
             uterus_mean=None,
         )
-    last_figo = ctx.nc.last_notification.get("figo_situation")
-    last_savelyeva = ctx.nc.last_notification.get("savelyeva_score")
-    last_savelyeva_category = ctx.nc.last_notification.get("savelyeva_category")
-    last_fischer = ctx.nc.last_notification.get("fischer_score")
-    last_fischer_category = ctx.nc.last_notification.get("fischer_category")
-
-    baseline_bpm = median_last_seconds(ctx.sec_fhr, ctx.now_t, 1200)
-    if baseline_bpm is not None:
-        baseline_bpm = float(round(baseline_bpm, 1))
-
-    fhr_all = df["value_bpm"].astype(float).values
-    stv_all = calculate_stv(fhr_all, fs=ctx.fs)
-    stv_all = None if np.isnan(stv_all) else float(round(stv_all, 2))
-
-    stv_10min_mean = rolling_stv_mean_10min(fhr_all, fs=ctx.fs)
-    stv_10min_mean = (
-        None if np.isnan(stv_10min_mean) else float(round(stv_10min_mean, 2))
-    )
+    ln = ctx.nc.last_notification
 
-    accelerations_count = sum(
-        1 for a in ctx.nc.last_notification["accelerations"] if a["start"] is not None
-    )
-    decelerations_count = sum(
-        1 for d in ctx.nc.last_notification["decelerations"] if d["start"] is not None
-    )
+    # STV — из потокового трекера, средняя UC — накопленная по всей записи,
+    # базальный ритм — по хвосту буфера (секунды выровнены от начала записи)
+    skip = -(samples.total - len(samples)) % ctx.fs
+    baseline_bpm = nan_to_none(tail_baseline(samples.fhr[skip:], ctx.fs, 1200))
+    stv_all = nan_to_none(ctx.stv.total_stv())
+    stv_10min_mean = nan_to_none(ctx.stv.rolling_mean_stv())
+    uterus_mean = nan_to_none(samples.uc_mean())
 
-    uterus_mean = (
-        float(df["value_uterus"].astype(float).mean())
-        if not df["value_uterus"].empty
-        else None
-    )
-    if uterus_mean is not None and not pd.isna(uterus_mean):
-        uterus_mean = float(round(uterus_mean, 2))
-    else:
-        uterus_mean = None
+    accelerations_count = len(ctx.nc.events.accelerations)
+    decelerations_count = len(ctx.nc.events.decelerations)
 
     return ProcessResults(
-        last_figo=last_figo,
-        last_savelyeva=last_savelyeva,
-        last_savelyeva_category=last_savelyeva_category,
-        last_fischer=last_fischer,
-        last_fischer_category=last_fischer_category,
-        baseline_bpm=baseline_bpm,
-        stv_all=stv_all,
-        stv_10min_mean=stv_10min_mean,
+        last_figo=ln.get("figo_situation"),
+        last_savelyeva=ln.get("savelyeva_score"),
+        last_savelyeva_category=ln.get("savelyeva_category"),
+        last_fischer=ln.get("fischer_score"),
+        last_fischer_category=ln.get("fischer_category"),
+        baseline_bpm=_round(baseline_bpm, 1),
+        stv_all=_round(stv_all, 2),
+        stv_10min_mean=_round(stv_10min_mean, 2),
         accelerations_count=int(accelerations_count),
         decelerations_count=int(decelerations_count),
-        uterus_mean=uterus_mean,
+        uterus_mean=_round(uterus_mean, 2),
     )
 
 
+def _round(value: Optional[float], ndigits: int) -> Optional[float]:
+    return None if value is None else float(round(value, ndigits))
+
+
 class FetalMonitoringService(IFetalMonitoring):
 
     def __init__(
-            self, model_hypoxia_config: Dict[str, Any], model_stv_config: Dict[str, Any]
+            self,
+            model_hypoxia_config: Dict[str, Any],
+            model_stv_config: Dict[str, Any],
+            metrics: Optional[SessionMetrics] = None,
     ):
         fs = model_hypoxia_config.get("fs", 5)
         self.ctx = StreamContext(
@@ -142,6 +159,10 @@ class FetalMonitoringService(IFetalMonitoring):
                 model=model_hypoxia_config["model"],
                 fs=fs,
                 ewma_alpha=model_hypoxia_config.get("ewma_alpha", 0.01),
+                features=tuple(
+                    model_hypoxia_config.get("features")
+                    or model_hypoxia_config["model"].feature_names_
+                ),
             ),
         )
         self.pipeline = StreamingPipeline(
@@ -158,17 +179,30 @@ class FetalMonitoringService(IFetalMonitoring):
                 StatusComposerStage(),
                 FisherClassicStage(),
             ],
+            metrics=metrics,
         )
 
-    def process_stream(self, df: pd.DataFrame) -> Process:
-        return self.pipeline.step(df)
+    def process_stream(self, times: np.ndarray, fhr: np.ndarray, uc: np.ndarray) -> Process:
+        return self.pipeline.step(times, fhr, uc)
 
     def finalize_process(self) -> ProcessResults:
         return finalize_results(self.ctx)
 
+    def pending_notifications(self) -> int:
+        return len(self.ctx.nc.outbox)
+
+    def drain_notifications(self) -> List[Tuple[int, Notification]]:
+        return self.ctx.nc.drain_outbox()
+
+    def requeue_notifications(self, batch: List[Tuple[int, Notification]]) -> None:
+        self.ctx.nc.requeue(batch)
+
     # === Optional: keep your static analyzer for day-level dynamics ===
     @staticmethod
     def analyze_patient_dynamics(df: pd.DataFrame) -> str:
+        # офлайн-аналитика: sklearn (и pandas за ним) не нужны потоковому пути
+        from sklearn.linear_model import LinearRegression
+
         notes = []
         last_baseline = df["baseline_bpm"].iloc[-1]
         if last_baseline > 160:
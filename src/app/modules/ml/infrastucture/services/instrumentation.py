@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import cProfile
+import heapq
+import io
+import itertools
+import pstats
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.modules.ml.settings import PipelineMetricsSettings, pipeline_metrics_settings
+
+# верхние границы бакетов, сек
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+LATENESS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Гистограмма в духе Prometheus: счётчики по бакетам + sum/count/max."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "max")
+
+    def __init__(self, buckets: Sequence[float] = DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # последний бакет: +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> List[tuple[str, int]]:
+        out, acc = [], 0
+        for le, c in zip((*map(repr, self.buckets), "+Inf"), self.counts):
+            acc += c
+            out.append((le, acc))
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "max": self.max,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class SessionMetrics:
+    """Метрики одной стриминговой сессии; передаётся в StreamingPipeline."""
+
+    def __init__(self, registry: PipelineMetrics, session_id: int):
+        self.registry = registry
+        self.session_id = session_id
+        self.tick_duration = Histogram(DURATION_BUCKETS)
+        self.lateness = Histogram(LATENESS_BUCKETS)
+        self.ticks = 0
+        self._origin: Optional[float] = None
+
+    def start_tick(self) -> Optional[cProfile.Profile]:
+        """Фиксирует опоздание тика относительно расписания сессии.
+
+        Возвращает запущенный профайлер, если этот тик попал в выборку.
+        """
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = now
+        expected = self._origin + self.ticks * self.registry.settings.tick_interval
+        self.lateness.observe(max(0.0, now - expected))
+
+        every = self.registry.settings.profile_every
+        if every and self.ticks % every == 0:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # уже работает другой профайлер
+                return None
+            return profiler
+        return None
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        self.registry.observe_stage(name, seconds)
+
+    def finish_tick(self, seconds: float, profiler: Optional[cProfile.Profile], now_t: int) -> None:
+        if profiler is not None:
+            profiler.disable()
+            self.registry.offer_profile(seconds, self.session_id, now_t, profiler)
+        self.tick_duration.observe(seconds)
+        self.ticks += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "tick_seconds": self.tick_duration.to_dict(),
+            "lateness_seconds": self.lateness.to_dict(),
+        }
+
+
+class PipelineMetrics:
+    """Реестр метрик пайплайна: стадии (общие), тики и опоздания (по сессиям)."""
+
+    def __init__(self, settings: PipelineMetricsSettings):
+        self.settings = settings
+        self.stages: Dict[str, Histogram] = {}
+        self._sessions: "OrderedDict[int, SessionMetrics]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._slow: List[tuple[float, int, Dict[str, Any]]] = []  # min-heap по длительности
+        self._seq = itertools.count()
+
+    def session(self) -> SessionMetrics:
+        sm = SessionMetrics(self, next(self._ids))
+        self._sessions[sm.session_id] = sm
+        while len(self._sessions) > self.settings.max_sessions:
+            self._sessions.popitem(last=False)
+        return sm
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        hist = self.stages.get(name)
+        if hist is None:
+            hist = self.stages[name] = Histogram(DURATION_BUCKETS)
+        hist.observe(seconds)
+
+    def offer_profile(self, seconds: float, session_id: int, now_t: int, profiler: cProfile.Profile) -> None:
+        keep = self.settings.profile_keep
+        if keep <= 0:
+            return
+        if len(self._slow) >= keep and seconds <= self._slow[0][0]:
+            return  # быстрее уже сохранённых — не тратим время на форматирование
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(25)
+        item = (seconds, next(self._seq), {
+            "session": session_id,
+            "time_sec": now_t,
+            "seconds": seconds,
+            "profile": buf.getvalue(),
+        })
+        if len(self._slow) < keep:
+            heapq.heappush(self._slow, item)
+        else:
+            heapq.heapreplace(self._slow, item)
+
+    def slow_ticks(self) -> List[Dict[str, Any]]:
+        return [item[2] for item in sorted(self._slow, reverse=True)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": {name: h.to_dict() for name, h in self.stages.items()},
+            "sessions": {str(sid): sm.to_dict() for sid, sm in self._sessions.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+
+        def hist(metric: str, help_: str, series: List[tuple[str, Histogram]]) -> None:
+            lines.append(f"# HELP {metric} {help_}")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, h in series:
+                for le, acc in h.cumulative():
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {acc}')
+                lines.append(f"{metric}_sum{{{labels}}} {h.sum}")
+                lines.append(f"{metric}_count{{{labels}}} {h.count}")
+
+        hist(
+            "ctg_pipeline_stage_seconds",
+            "Wall time of a single stage tick.",
+            [(f'stage="{name}"', h) for name, h in self.stages.items()],
+        )
+        hist(
+            "ctg_pipeline_tick_seconds",
+            "Wall time of StreamingPipeline.step.",
+            [(f'session="{sid}"', sm.tick_duration) for sid, sm in self._sessions.items()],
+        )
+        hist(
+            "ctg_pipeline_tick_lateness_seconds",
+            "Delay of a tick relative to the session schedule.",
+            [(f'session="{sid}"', sm.lateness) for sid, sm in self._sessions.items()],
+        )
+        return "\n".join(lines) + "\n"
+
+
+# None, если инструментирование выключено: пайплайн тогда не тратит на него ничего
+pipeline_metrics: Optional[PipelineMetrics] = (
+    PipelineMetrics(pipeline_metrics_settings) if pipeline_metrics_settings.enabled else None
+)
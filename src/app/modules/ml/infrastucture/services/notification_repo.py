@@ -0,0 +1,72 @@
+from collections.abc import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.sqlite import WriterSession
+from app.modules.ml.application.interfaces.notifications import NotificationPort
+from app.modules.ml.domain.entities.process import Color, Notification, NotificationRecord
+
+
+class NotificationRepository(NotificationPort):
+
+    def __init__(self, session: AsyncSession, writer_session: WriterSession):
+        self._session = session
+        self._writer_session = writer_session
+
+    async def add_many(self, ctg_id: int, notifications: Sequence[tuple[int, Notification]]) -> None:
+        if not notifications:
+            return
+        stmt = text(
+            """
+            INSERT INTO ctg_notifications (ctg_id, time_sec, message, color)
+            VALUES (:ctg_id, :time_sec, :message, :color)
+            """
+        )
+        await self._writer_session.execute(
+            stmt,
+            [
+                {
+                    "ctg_id": ctg_id,
+                    "time_sec": time_sec,
+                    "message": n.message,
+                    "color": Color(n.color).value,
+                }
+                for time_sec, n in notifications
+            ]
+        )
+        await self._writer_session.commit()
+
+    async def list_notifications(
+            self,
+            ctg_id: int,
+            time_from: int | None = None,
+            time_to: int | None = None,
+            after_id: int | None = None,
+            limit: int = 100,
+    ) -> list[NotificationRecord]:
+        stmt = text(
+            """
+            SELECT id, time_sec, message, color FROM ctg_notifications
+            WHERE ctg_id = :ctg_id
+              AND (:time_from IS NULL OR time_sec >= :time_from)
+              AND (:time_to IS NULL OR time_sec <= :time_to)
+              AND (:after_id IS NULL OR id > :after_id)
+            ORDER BY id
+            LIMIT :limit
+            """
+        )
+        res = await self._session.execute(
+            stmt,
+            {
+                "ctg_id": ctg_id,
+                "time_from": time_from,
+                "time_to": time_to,
+                "after_id": after_id,
+                "limit": limit,
+            }
+        )
+        return [
+            NotificationRecord(id=row[0], time_sec=row[1], message=row[2], color=Color(row[3]))
+            for row in res.all()
+        ]
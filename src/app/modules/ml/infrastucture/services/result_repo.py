@@ -1,35 +1,32 @@
-import os
-from collections.abc import AsyncIterator
 from datetime import datetime
 
 import pytz
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
+from app.common.cache import ReadCache
+from app.common.write_behind import WriteBehindWriter
+from app.modules.ml.application.interfaces.results import ResultPort
 from app.modules.ml.domain.entities.process import ProcessResults
 
-db_driver = os.getenv("DB_DRIVER", '')
-db_url = os.getenv("DB_DATABASE_NAME", '')
 
-class ResultRepository:
-    def __init__(self) -> None:
-        self._engine = create_async_engine(db_driver + ":///" + db_url)
-        self._session_factory = async_sessionmaker(self._engine, expire_on_commit=True)
+# один объект на процесс: WriteBehindWriter группирует строки по statement
+_INSERT_RESULT = text(
+    """
+    INSERT INTO ctg_results (ctg_id, gest_age, bpm, uc, figo, stv, stv_little, accelerations, decelerations, created_at) VALUES 
+    (:ctg_id, :gest_age, :bpm, :uc, :figo, :stv, :stv_little, :accelerations, :decelerations, :created_at)
+    """
+)
 
-    async def get_session(self) -> AsyncIterator[AsyncSession]:
-        async with self._session_factory() as session:
-            yield session
+
+class ResultRepository(ResultPort):
+
+    def __init__(self, writer: WriteBehindWriter, cache: ReadCache):
+        self._writer = writer
+        self._cache = cache
 
     async def add_result(self, ctg_id: int, result: ProcessResults) -> None:
-        session = await anext(self.get_session())
-        stmt = text(
-            """
-            INSERT INTO ctg_results (ctg_id, gest_age, bpm, uc, figo, stv, stv_little, acceleration, deceleration, created_at) VALUES 
-            (:ctg_id, :gest_age, :bpm, :uc, :figo, :stv, :stv_little, :acceleration, :deceleration, :created_at)
-            """
-        )
-        await session.execute(
-            stmt, {
+        await self._writer.submit(
+            _INSERT_RESULT, {
                 'ctg_id': ctg_id,
                 'gest_age': '38+2 нед',
                 'bpm': result.baseline_bpm,
@@ -37,9 +34,10 @@ class ResultRepository:
                 'figo': result.last_figo,
                 'stv': result.stv_all,
                 'stv_little': result.stv_10min_mean,
-                'acceleration': result.accelerations_count,
-                'deceleration': result.decelerations_count,
+                'accelerations': result.accelerations_count,
+                'decelerations': result.decelerations_count,
                 'created_at': datetime.now(pytz.timezone('Europe/Moscow')),
             }
         )
-        await session.commit()
+        # строка закоммичена — обзор КТГ пациента в кэше устарел
+        self._cache.invalidate_ctg(ctg_id)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+Columns = Tuple[np.ndarray, np.ndarray, np.ndarray]  # time_sec, fhr (bpm), uc
+
+
+def newer_than(times: np.ndarray, last_time: float) -> np.ndarray:
+    """Маска отсчётов, которые строго позже всех предыдущих — и принятых, и в этой пачке.
+
+    Общее правило для SampleBuffer и STVTracker: повтор метки времени и откат
+    назад отбрасываются, поэтому окна признаков и STV строятся по одним отсчётам.
+    """
+    if not len(times):
+        return np.ones(0, dtype=bool)
+    prev = np.maximum.accumulate(np.concatenate(([last_time], times[:-1])))
+    return times > prev
+
+
+class SampleBuffer:
+    """Последние отсчёты сессии (time_sec, FHR, UC) в массивах NumPy.
+
+    Хранит не больше capacity отсчётов; окна отдаются срезами без копирования.
+    Под данные выделено 2 * capacity строк: новые дописываются в конец, а при
+    заполнении последние capacity строк переносятся в начало — сдвиг раз в
+    capacity добавлений, поэтому окно всегда непрерывно и отсортировано по времени.
+
+    Дополнительно копит сумму и число валидных UC по всей записи (для средней UC
+    в итогах, когда старые отсчёты уже вытеснены).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.empty((3, 2 * capacity))
+        self._start = 0
+        self._end = 0
+        self.total = 0  # принято отсчётов за всю запись
+        self._uc_sum = 0.0
+        self._uc_n = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._data[0, self._start:self._end]
+
+    @property
+    def fhr(self) -> np.ndarray:
+        return self._data[1, self._start:self._end]
+
+    @property
+    def uc(self) -> np.ndarray:
+        return self._data[2, self._start:self._end]
+
+    @property
+    def last_time(self) -> float:
+        return self._data[0, self._end - 1] if self._end > self._start else -np.inf
+
+    def extend(self, times: np.ndarray, fhr: np.ndarray, uc: np.ndarray) -> int:
+        """Дописывает отсчёты; не более поздние, чем уже принятые, отбрасываются (newer_than).
+
+        Возвращает число добавленных строк.
+        """
+        keep = newer_than(times, self.last_time)
+        if not keep.all():
+            times, fhr, uc = times[keep], fhr[keep], uc[keep]
+        n = len(times)
+        if n == 0:
+            return 0
+        if n > self.capacity:
+            # в буфер попадёт только хвост, но в итог UC идут все отсчёты
+            self._account(uc[:n - self.capacity])
+            self.total += n - self.capacity
+            times, fhr, uc = times[-self.capacity:], fhr[-self.capacity:], uc[-self.capacity:]
+            n = self.capacity
+        if self._end + n > self._data.shape[1]:
+            tail = max(0, self.capacity - n)
+            self._data[:, :tail] = self._data[:, self._end - tail:self._end]
+            self._start, self._end = 0, tail
+        self._data[0, self._end:self._end + n] = times
+        self._data[1, self._end:self._end + n] = fhr
+        self._data[2, self._end:self._end + n] = uc
+        self._end += n
+        self._start = max(self._start, self._end - self.capacity)
+        self.total += n
+        self._account(uc)
+        return n
+
+    def _account(self, uc: np.ndarray) -> None:
+        valid = uc[~np.isnan(uc)]
+        self._uc_sum += float(valid.sum())
+        self._uc_n += len(valid)
+
+    def since(self, t0: float) -> Columns:
+        """Отсчёты с time_sec >= t0 (срезы буфера, не копии)."""
+        i = self._start + int(np.searchsorted(self.times, t0, side="left"))
+        return (
+            self._data[0, i:self._end],
+            self._data[1, i:self._end],
+            self._data[2, i:self._end],
+        )
+
+    def second_means(self, t: int) -> Tuple[float, float]:
+        """Средние FHR и UC по отсчётам из (t - 1, t]; NaN, если значений нет."""
+        times = self.times
+        lo = self._start + int(np.searchsorted(times, t - 1, side="right"))
+        hi = self._start + int(np.searchsorted(times, t, side="right"))
+        return _nanmean(self._data[1, lo:hi]), _nanmean(self._data[2, lo:hi])
+
+    def uc_mean(self) -> float:
+        """Средняя UC по всей записи."""
+        return self._uc_sum / self._uc_n if self._uc_n else np.nan
+
+
+def _nanmean(x: np.ndarray) -> float:
+    valid = x[~np.isnan(x)]
+    return valid.mean() if valid.size else np.nan
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.modules.ml.infrastucture.services.context import StreamContext
+from app.modules.ml.infrastucture.services.stages import Stage
+from app.modules.ml.settings import StageSchedulerSettings, stage_scheduler_settings
+
+# порядковый номер сессии в процессе — из него выводится фаза тяжёлых стадий
+_sessions = itertools.count()
+
+
+def _fresh_offsets(
+        every: int, inputs: Tuple[str, ...], produced: Dict[str, Tuple[int, int]]
+) -> List[int]:
+    """Секунды периода, в которые все входы с кратным периодом только что обновлены."""
+    aligned = [produced[key] for key in inputs if key in produced and every % produced[key][0] == 0]
+    return [o for o in range(every) if all(o % period == at for period, at in aligned)]
+
+
+@dataclass(slots=True)
+class ScheduledStage:
+    stage: Stage
+    name: str
+    every: int
+    offset: int
+    inputs: Tuple[str, ...]
+    seen: Optional[Tuple[int, ...]] = None
+
+    def should_run(self, ctx: StreamContext) -> bool:
+        """Стадия в расписании на эту секунду и её входы изменились с прошлого запуска."""
+        t = ctx.now_t
+        if self.every > 1 and t % self.every != self.offset:
+            return False
+        if self.inputs:
+            versions = tuple(ctx.versions[key] for key in self.inputs)
+            if versions == self.seen:
+                return False
+            self.seen = versions
+        return True
+
+
+class StageScheduler:
+    """Расписание стадий одной сессии.
+
+    Стадия может объявить:
+      - every — период в секундах (по умолчанию каждую секунду);
+      - staggered — разрешён сдвиг фазы: такие стадии разных сессий
+        срабатывают на разных секундах, а внутри сессии — на соседних;
+      - inputs — ключи ctx.versions; если ни один не изменился, тик пропускается;
+      - outputs — {ключ ctx.versions: период обновления, сек} для входов других стадий;
+      - bind(ctx) — вызывается один раз до построения расписания (период из конфига).
+
+    Первый запуск — в секунду offset, а не через целый период. Сдвиг стадии,
+    читающей чужой output, выбирается только среди секунд, когда производитель
+    его обновил: стадия видит свежее значение, а не устаревшее на период
+    производителя. Производитель должен стоять в списке раньше потребителя.
+    """
+
+    def __init__(
+            self,
+            stages: Sequence[Stage],
+            ctx: StreamContext,
+            settings: StageSchedulerSettings = stage_scheduler_settings,
+    ):
+        phase = next(_sessions) * settings.phase_stride if settings.stagger else 0
+        for stage in stages:
+            bind = getattr(stage, "bind", None)
+            if bind is not None:
+                bind(ctx)
+
+        self.slots: List[ScheduledStage] = []
+        # ключ ctx.versions -> (период обновления, секунда внутри периода)
+        produced: Dict[str, Tuple[int, int]] = {}
+        producers = {
+            key: type(stage).__name__
+            for stage in stages
+            for key in getattr(stage, "outputs", {})
+        }
+        shift = 0
+        for stage in stages:
+            name = type(stage).__name__
+            every = max(1, int(getattr(stage, "every", 1)))
+            inputs = tuple(getattr(stage, "inputs", ()))
+            for key in inputs:
+                if key in producers and key not in produced:
+                    raise ValueError(f"{name} читает {key} раньше, чем его обновляет {producers[key]}")
+            offset = 0
+            if settings.stagger and every > 1 and getattr(stage, "staggered", False):
+                offsets = _fresh_offsets(every, inputs, produced)
+                if not offsets:
+                    raise ValueError(f"{name}: нет секунды, где все входы {inputs} свежие")
+                offset = offsets[(phase + shift) % len(offsets)]
+                shift += 1
+            for key, period in getattr(stage, "outputs", {}).items():
+                produced[key] = (period, offset % period)
+            self.slots.append(ScheduledStage(
+                stage=stage,
+                name=name,
+                every=every,
+                offset=offset,
+                inputs=inputs,
+            ))
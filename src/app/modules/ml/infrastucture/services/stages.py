@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import math
 from typing import Optional, Protocol
 
 import numpy as np
-import pandas as pd
 
+from app.modules.ml.domain.entities.events import (
+    Acceleration,
+    Contraction,
+    ContractionRef,
+    Deceleration,
+)
+from app.modules.ml.domain.entities.process import Color
 from app.modules.ml.infrastucture.services.context import StreamContext
-from app.modules.ml.infrastucture.services.features import extract_features
+from app.modules.ml.infrastucture.services.features import extract_window_features, feature_row
 from app.modules.ml.infrastucture.services.utils import (
-    calculate_stv,
     median_last_seconds,
     slice_last_seconds,
 )
+from app.modules.ml.infrastucture.services.window import SignalWindow
 
 
 class Stage(Protocol):
+    """Стадия пайплайна.
+
+    Расписание (every/staggered/inputs/outputs/bind) необязательно и читается StageScheduler;
+    проверку «пора ли» делает планировщик, а не сама стадия.
+    """
+
     def tick(self, ctx: StreamContext) -> None: ...
 
 
@@ -23,22 +36,32 @@ class IngestionStage:
 
     def tick(self, ctx: StreamContext) -> None:
         ctx.now_t += 1
-        if ctx.current_df is not None:
-            ctx.current_df = ctx.current_df[
-                ctx.current_df["time_sec"] <= ctx.now_t
-            ].copy()
-
-        curr_fhr, curr_uc = ctx.mean_last_second()
-        ctx.sec_fhr.append(
-            (ctx.now_t, float(curr_fhr) if pd.notna(curr_fhr) else np.nan)
-        )
-        ctx.sec_uc.append((ctx.now_t, float(curr_uc) if pd.notna(curr_uc) else np.nan))
+        if ctx.incoming is not None:
+            times, fhr, uc = ctx.incoming
+            ctx.incoming = None
+            visible = times <= ctx.now_t
+            if not visible.all():
+                times, fhr, uc = times[visible], fhr[visible], uc[visible]
+            ctx.samples.extend(times, fhr, uc)
+            seen = ctx.stv.samples
+            ctx.stv.push(times, fhr)
+            if ctx.stv.samples != seen:
+                ctx.versions["samples"] += 1
+
+        curr_fhr, curr_uc = ctx.samples.second_means(ctx.now_t)
+        fhr_ok, uc_ok = not math.isnan(curr_fhr), not math.isnan(curr_uc)
+        if fhr_ok:
+            ctx.versions["fhr"] += 1
+        if uc_ok:
+            ctx.versions["uc"] += 1
+        ctx.sec_fhr.append((ctx.now_t, float(curr_fhr)))
+        ctx.sec_uc.append((ctx.now_t, float(curr_uc)))
 
         ctx.nc.last_notification["current_fhr"] = (
-            None if pd.isna(curr_fhr) else float(round(curr_fhr, 2))
+            float(round(curr_fhr, 2)) if fhr_ok else None
         )
         ctx.nc.last_notification["current_uterus"] = (
-            None if pd.isna(curr_uc) else float(round(curr_uc, 2))
+            float(round(curr_uc, 2)) if uc_ok else None
         )
         ctx.nc.last_notification["time_sec"] = ctx.now_t
 
@@ -46,11 +69,18 @@ class IngestionStage:
 class TachyBradyStage:
     """Оценивает тахикардию и брадикардию."""
 
+    def bind(self, ctx: StreamContext) -> None:
+        # планировщик будит стадию с шагом НОД двух периодов, дальше решает она сама
+        self.every = math.gcd(ctx.tachy_eval_every_sec, ctx.brady_eval_every_sec)
+        # 10-минутная медиана обновляется с периодом тахикардии; её читают оценочные стадии
+        self.outputs = {"median_fhr_10min": ctx.tachy_eval_every_sec}
+
     def tick(self, ctx: StreamContext) -> None:
         # Tachy (every N sec)
         if ctx.now_t % ctx.tachy_eval_every_sec == 0:
             median_10 = median_last_seconds(ctx.sec_fhr, ctx.now_t, 600)
             ctx.nc.last_notification["median_fhr_10min"] = median_10
+            ctx.versions["median_fhr_10min"] += 1
 
             if median_10 is None:
                 ctx.nc.last_notification["tachycardia"] = "Недостаточно данных"
@@ -64,7 +94,7 @@ class TachyBradyStage:
                     ctx.nc.notify(
                         ctx.now_t,
                         f"Тахикардия: базальная ≈ {median_10:.1f} bpm",
-                        color="red",
+                        color=Color.RED,
                     )
                     ctx.state_flags["tachy_active"] = True
             else:
@@ -72,7 +102,7 @@ class TachyBradyStage:
                     f"Нет признаков тахикардии (базальная ≈ {median_10:.1f} bpm)."
                 )
                 if ctx.state_flags["tachy_active"]:
-                    ctx.nc.notify(ctx.now_t, "Тахикардия прекратилась", color="green")
+                    ctx.nc.notify(ctx.now_t, "Тахикардия прекратилась", color=Color.GREEN)
                 ctx.state_flags["tachy_active"] = False
 
         # Brady (every M sec)
@@ -84,30 +114,25 @@ class TachyBradyStage:
                         ctx.nc.notify(
                             ctx.now_t,
                             f"Брадикардия: базальная ≈ {median_10:.1f} bpm",
-                            color="red",
+                            color=Color.RED,
                         )
                         ctx.state_flags["brady_active"] = True
                 else:
                     if ctx.state_flags["brady_active"]:
                         ctx.nc.notify(
-                            ctx.now_t, "Брадикардия прекратилась", color="green"
+                            ctx.now_t, "Брадикардия прекратилась", color=Color.GREEN
                         )
                     ctx.state_flags["brady_active"] = False
 
 
 class STV10MinStage:
-    """Вычисляет STV за последние 10 минут каждые 10 секунд."""
+    """Публикует STV за последние 10 минут каждые 10 секунд (из ctx.stv)."""
+
+    every = 10
+    inputs = ("samples",)
 
     def tick(self, ctx: StreamContext) -> None:
-        if ctx.now_t % 10 != 0:
-            return
-        if ctx.current_df is None or ctx.current_df.empty:
-            ctx.nc.last_notification["stv"] = None
-            return
-        last_10_fhr = slice_last_seconds(
-            ctx.current_df["value_bpm"].values, ctx.now_t, 600
-        )
-        stv = calculate_stv(np.array(last_10_fhr), fs=ctx.fs)
+        stv = ctx.stv.window_stv()
         ctx.nc.last_notification["stv"] = (
             None if np.isnan(stv) else float(round(stv, 2))
         )
@@ -116,26 +141,28 @@ class STV10MinStage:
 class ModelsStage:
     """STV прогнозы (3/5/10m) и вероятность гипоксии на скользящем окне признаков."""
 
+    staggered = True
+
+    def bind(self, ctx: StreamContext) -> None:
+        self.every = ctx.stv_cfg["step_size"]
+
     def tick(self, ctx: StreamContext) -> None:
-        step = ctx.stv_cfg["step_size"]
-        if ctx.now_t % step != 0:
-            return
         if ctx.now_t < ctx.stv_cfg["window_size"]:
             return
-        window_df = ctx.create_window_df()
-        if window_df.empty:
+        _, fhr, uc = ctx.samples.since(ctx.now_t - ctx.stv_cfg["window_size"])
+        if not len(fhr):
             return
 
-        feats = extract_features(window_df)
-        model_input = pd.DataFrame([feats])
+        feats = extract_window_features(fhr, uc, ctx.now_t)
 
         # --- STV forecasts ---
         forecasts = {"stv_3m": None, "stv_5m": None, "stv_10m": None}
         for name, spec in ctx.stv_cfg["models"].items():
-            val = spec["model"].predict(model_input).item()
+            val = spec["model"].predict(feature_row(feats, spec["features"])).item()
             forecasts[name] = float(val) if val is not None else None
 
         # --- Hypoxia proba + EWMA ---
+        model_input = feature_row(feats, ctx.hypoxia_cfg.features)
         proba = ctx.hypoxia_cfg.model.predict_proba(model_input)[:, 1].item()
         ewma = self._update_ewma(ctx, proba)
         ctx.nc.last_notification["hypoxia_proba"] = ewma
@@ -145,13 +172,13 @@ class ModelsStage:
         if ewma is not None and ewma >= 0.8:
             if not ctx.state_flags["hypoxia_active"]:
                 ctx.nc.notify(
-                    ctx.now_t, f"Высокая вероятность гипоксии: {ewma:.2f}", color="red"
+                    ctx.now_t, f"Высокая вероятность гипоксии: {ewma:.2f}", color=Color.RED
                 )
                 ctx.state_flags["hypoxia_active"] = True
         else:
             if ctx.state_flags["hypoxia_active"]:
                 ctx.nc.notify(
-                    ctx.now_t, "Вероятность гипоксии снизилась", color="green"
+                    ctx.now_t, "Вероятность гипоксии снизилась", color=Color.GREEN
                 )
             ctx.state_flags["hypoxia_active"] = False
 
@@ -179,6 +206,10 @@ class FigoStage:
                      патология — периодические выраженные поздние (>=2 late за 10 мин с амплитудой ≥15 bpm)
     """
 
+    every = 60
+    staggered = True
+    inputs = ("median_fhr_10min",)
+
     def __init__(self, variab_win_sec: int = 600, long_thr_sec: int = 40 * 60):
         self.variab_win_sec = variab_win_sec  # окно для оценки амплитуды (10 мин)
         self.long_thr_sec = long_thr_sec  # 40 минут
@@ -190,17 +221,15 @@ class FigoStage:
 
     # ---------- helpers ----------
 
-    def _fhr_last(self, ctx: StreamContext, sec: int) -> Optional[np.ndarray]:
-        vals = slice_last_seconds(ctx.sec_fhr, ctx.now_t, sec)
-        x = np.array([v for v in vals if pd.notna(v)], dtype=float)
-        return x if x.size else None
+    def _fhr_last(self, ctx: StreamContext, sec: int) -> Optional[SignalWindow]:
+        return ctx.windows.fhr_seconds(ctx, sec)
 
-    def _amp_band(self, fhr: np.ndarray) -> float:
+    def _amp_band(self, fhr: SignalWindow) -> float:
         # амплитуда как половина междецильного размаха (устойчиво к выбросам)
-        p10, p90 = np.nanpercentile(fhr, 10), np.nanpercentile(fhr, 90)
+        p10, p90 = fhr.percentiles(10, 90)
         return float(max(0.0, (p90 - p10) / 2.0))
 
-    def _sinusoidal_like(self, fhr: Optional[np.ndarray]) -> bool:
+    def _sinusoidal_like(self, fhr: Optional[SignalWindow]) -> bool:
         # грубая эвристика: очень узкая полоса + регулярность
         if fhr is None or len(fhr) < 60:
             return False
@@ -209,39 +238,20 @@ class FigoStage:
             amp >= 5
         ):  # у синусоидального амплитуда обычно ~5–15, но вариабельность "монотонная".
             # попробуем проверить "монотонность": мало смен знака вокруг сглаженной линии
-            trend = (
-                pd.Series(fhr).rolling(15, min_periods=1, center=True).median().values
-            )
-            y = fhr - trend
-            crossings = np.where(np.diff(np.signbit(y)))[0]
+            crossings = fhr.crossings(15)
             per_min = len(fhr) / 5 / 60.0
-            return (amp < 10) and (len(crossings) / max(1.0, per_min) <= 2.0)
+            return (amp < 10) and (crossings / max(1.0, per_min) <= 2.0)
         return amp < 5  # очень узкая — допустим как прокси к плохому паттерну
 
     def _accels_last(self, ctx: StreamContext, sec: int) -> int:
-        lo = ctx.now_t - sec
-        return sum(
-            1
-            for a in ctx.nc.last_notification["accelerations"]
-            if a.get("start") is not None and a["start"] >= lo
-        )
+        return ctx.nc.events.accelerations.count_since(ctx.now_t - sec)
 
     def _last_accel_time(self, ctx: StreamContext) -> Optional[int]:
-        acc = ctx.nc.last_notification["accelerations"]
-        if not acc:
-            return None
-        # берём время конца, если есть, иначе старт
-        return max(
-            (a.get("end") if a.get("end") is not None else a["start"]) for a in acc
-        )
+        # время конца последней акцелерации, если есть, иначе старт
+        return ctx.nc.events.accelerations.last_time
 
-    def _decels_last10(self, ctx: StreamContext) -> List[dict]:
-        lo = ctx.now_t - 600
-        return [
-            d
-            for d in ctx.nc.last_notification["decelerations"]
-            if d.get("start") is not None and d["start"] >= lo
-        ]
+    def _decels_last10(self, ctx: StreamContext) -> list[Deceleration]:
+        return ctx.nc.events.decelerations.since(ctx.now_t - 600)
 
     # -------- per-parameter categories --------
 
@@ -255,7 +265,7 @@ class FigoStage:
         return "norm", None  # 110–150
 
     def _variability_cat(
-        self, ctx: StreamContext, fhr10: Optional[np.ndarray]
+        self, ctx: StreamContext, fhr10: Optional[SignalWindow]
     ) -> Tuple[str, Optional[str]]:
         if fhr10 is None or len(fhr10) < 5 * 60:  # <1 мин данных — мало для оценки
             return "unknown", "Недостаточно данных для вариабельности"
@@ -321,25 +331,20 @@ class FigoStage:
         if not dec10:
             return "norm", None
         # есть поздние выраженные периодические? (берём как ≥2 late с амплитудой ≥15 bpm за 10 мин)
-        late_expr = [
-            d for d in dec10 if d.get("type") == "late" and (d.get("amp_bpm", 0) >= 15)
-        ]
+        late_expr = [d for d in dec10 if d.type == "late" and d.amp_bpm >= 15]
         if len(late_expr) >= 2:
             return "path", "Периодические выраженные поздние децелерации"
         # иначе — спорадические любого типа => препатология
         # (нормой считаем «неглубокие спорадические»: ≤1 эпизод и amp<15, не late)
         if (
             len(dec10) == 1
-            and dec10[0].get("amp_bpm", 0) < 15
-            and dec10[0].get("type") != "late"
+            and dec10[0].amp_bpm < 15
+            and dec10[0].type != "late"
         ):
             return "norm", "Спорадическая неглубокая децелерация"
         return "pre", "Спорадические децелерации"
 
     def tick(self, ctx: StreamContext) -> None:
-
-        if ctx.now_t % 60 != 0:
-            return
         baseline = ctx.nc.last_notification.get(
             "median_fhr_10min"
         )  # ДОЛЖНО быть за 600с
@@ -363,15 +368,15 @@ class FigoStage:
         n_pre = sum(1 for _, c, _ in cats if c == "pre")
 
         if n_path >= 1:
-            status, color = "Патологическое", "red"
+            status, color = "Патологическое", Color.RED
         elif n_pre >= 1:
-            status, color = "Сомнительное", "yellow"
+            status, color = "Сомнительное", Color.YELLOW
         else:
             # если всё norm/unknown и нет достаточных данных — считаем «Препатология» (сомнительное)
             if any(c == "unknown" for _, c, _ in cats):
-                status, color = "Сомнительное", "yellow"
+                status, color = "Сомнительное", Color.YELLOW
             else:
-                status, color = "Нормальное", "green"
+                status, color = "Нормальное", Color.GREEN
 
         for name, c, r in cats:
             if (c in ("pre", "path")) and r:
@@ -395,6 +400,8 @@ class ContractionStage:
     - Сглаживание: медианная фильтрация коротким окном.
     """
 
+    inputs = ("uc",)
+
     def __init__(
         self,
         baseline_win=180,
@@ -420,7 +427,7 @@ class ContractionStage:
         vals = slice_last_seconds(arr, now, sec)
         if not vals:
             return None
-        x = np.array([v for v in vals if pd.notna(v)], dtype=float)
+        x = np.array(vals, dtype=float)
         return float(np.subtract(*np.nanpercentile(x, [75, 25]))) if x.size else None
 
     def tick(self, ctx: StreamContext) -> None:
@@ -428,7 +435,7 @@ class ContractionStage:
             return
         now = ctx.now_t
         uc = ctx.sec_uc[-1][1]
-        if pd.isna(uc):
+        if math.isnan(uc):
             return
 
         # сглаживание медианным окном по последним smooth_win секундам
@@ -455,7 +462,7 @@ class ContractionStage:
                     "thr": thr_dyn,
                 }
                 ctx.nc.notify(
-                    now, f"Старт схватки (UC↑ ≥ {thr_dyn:.1f})", color="yellow"
+                    now, f"Старт схватки (UC↑ ≥ {thr_dyn:.1f})", color=Color.YELLOW
                 )
         else:
             # обновляем пик
@@ -466,14 +473,21 @@ class ContractionStage:
             if not above:
                 dur = now - self.active["start"]
                 if dur >= self.min_len:
-                    self.active["end"] = now
                     amp = float(self.active["peak_value"] - self.active["base"])
-                    self.active["amp"] = float(round(amp, 1))
-                    ctx.nc.last_notification["contractions"].append(self.active)
+                    contraction = Contraction(
+                        start=self.active["start"],
+                        end=now,
+                        peak=self.active["peak"],
+                        peak_value=self.active["peak_value"],
+                        base=self.active["base"],
+                        thr=self.active["thr"],
+                        amp=float(round(amp, 1)),
+                    )
+                    ctx.nc.events.contractions.add(contraction)
                     ctx.nc.notify(
                         now,
-                        f"Схватка: amp≈{self.active['amp']} UC, {dur}s",
-                        color="yellow",
+                        f"Схватка: amp≈{contraction.amp} UC, {dur}s",
+                        color=Color.YELLOW,
                     )
                     self.last_end = now
                 self.active = None
@@ -489,6 +503,8 @@ class AdvancedAccelDecelStage:
     - Классификация децелераций по привязке к схваткам улучшена.
     """
 
+    inputs = ("fhr",)
+
     def __init__(
         self,
         local_baseline_window_sec=90,
@@ -518,7 +534,7 @@ class AdvancedAccelDecelStage:
         vals = slice_last_seconds(arr, now, sec)
         if not vals:
             return None, None
-        x = np.array([v for v in vals if pd.notna(v)], dtype=float)
+        x = np.array(vals, dtype=float)
         if x.size == 0:
             return None, None
         base = float(np.nanmedian(x))
@@ -526,12 +542,9 @@ class AdvancedAccelDecelStage:
         return base, iqr
 
     def _nearest_contraction(self, ctx: StreamContext, t0: int, t1: int):
-        overlaps = []
-        for c in ctx.nc.last_notification["contractions"]:
-            if c.get("end") is not None and c["end"] >= t0 and c["start"] <= t1:
-                overlaps.append(c)
+        overlaps = ctx.nc.events.contractions.overlapping(t0, t1)
         return (
-            max(overlaps, key=lambda c: min(t1, c["end"]) - max(t0, c["start"]))
+            max(overlaps, key=lambda c: min(t1, c.end) - max(t0, c.start))
             if overlaps
             else None
         )
@@ -540,34 +553,23 @@ class AdvancedAccelDecelStage:
         c = self._nearest_contraction(ctx, start, end)
         if c is None:
             return "variable", None, None
-        lag_start = start - c["start"]
+        lag_start = start - c.start
+        uc_ref = ContractionRef(contraction_start=c.start, contraction_peak=c.peak)
         # поздняя: начало спустя ≥30с от старта схватки и возврат после конца схватки
-        if lag_start >= 30 and end >= c["end"]:
+        if lag_start >= 30 and end >= c.end:
             grade = "mild" if amp <= 15 else "moderate" if amp <= 45 else "severe"
-            return (
-                "late",
-                grade,
-                {"contraction_start": c["start"], "contraction_peak": c["peak"]},
-            )
+            return "late", grade, uc_ref
         # ранняя: примерно синхронна со схваткой
-        if abs(lag_start) <= 10 and c["start"] <= start <= c["peak"] <= end <= c["end"]:
-            return (
-                "early",
-                None,
-                {"contraction_start": c["start"], "contraction_peak": c["peak"]},
-            )
-        return (
-            "variable",
-            None,
-            {"contraction_start": c["start"], "contraction_peak": c["peak"]},
-        )
+        if abs(lag_start) <= 10 and c.start <= start <= c.peak <= end <= c.end:
+            return "early", None, uc_ref
+        return "variable", None, uc_ref
 
     def tick(self, ctx: StreamContext) -> None:
         if not ctx.sec_fhr or ctx.sec_fhr[-1][0] != ctx.now_t:
             return
         now = ctx.now_t
         curr = ctx.sec_fhr[-1][1]
-        if pd.isna(curr):
+        if math.isnan(curr):
             return
 
         base, iqr = self._robust_base_iqr(ctx.sec_fhr, now, self.win)
@@ -585,7 +587,7 @@ class AdvancedAccelDecelStage:
                 self.accel_active = {"start": now, "peak": curr, "amp": 0.0, "auc": 0.0}
                 self._accel_gap = 0
                 ctx.nc.notify(
-                    now, f"Старт акцелерации (Δ≥{accel_thr:.1f} bpm)", color="yellow"
+                    now, f"Старт акцелерации (Δ≥{accel_thr:.1f} bpm)", color=Color.YELLOW
                 )
             else:
                 if curr > self.accel_active["peak"]:
@@ -609,16 +611,16 @@ class AdvancedAccelDecelStage:
                     ):
                         amp = float(round(self.accel_active["amp"], 1))
                         end_t = now - self._accel_gap
-                        ctx.nc.last_notification["accelerations"].append(
-                            {
-                                "start": self.accel_active["start"],
-                                "end": end_t,
-                                "amp_bpm": amp,
-                                "dur_s": int(dur),
-                            }
+                        ctx.nc.events.accelerations.add(
+                            Acceleration(
+                                start=self.accel_active["start"],
+                                end=end_t,
+                                amp_bpm=amp,
+                                dur_s=int(dur),
+                            )
                         )
                         ctx.nc.notify(
-                            end_t, f"Акцелерация: +{amp} bpm, {dur}s", color="yellow"
+                            end_t, f"Акцелерация: +{amp} bpm, {dur}s", color=Color.YELLOW
                         )
                     self.accel_active = None
                     ctx.active_accel = None
@@ -635,7 +637,7 @@ class AdvancedAccelDecelStage:
                 }
                 self._decel_gap = 0
                 ctx.nc.notify(
-                    now, f"Старт децелерации (Δ≤{decel_thr:.1f} bpm)", color="yellow"
+                    now, f"Старт децелерации (Δ≤{decel_thr:.1f} bpm)", color=Color.YELLOW
                 )
             else:
                 if curr < self.decel_active["nadir"]:
@@ -661,16 +663,16 @@ class AdvancedAccelDecelStage:
                         dec_type, grade, uc_ref = self._classify_decel(
                             ctx, self.decel_active["start"], end_t, amp
                         )
-                        ctx.nc.last_notification["decelerations"].append(
-                            {
-                                "start": self.decel_active["start"],
-                                "end": end_t,
-                                "amp_bpm": amp,
-                                "dur_s": int(dur),
-                                "type": dec_type,
-                                "grade": grade,
-                                "uc_ref": uc_ref,
-                            }
+                        ctx.nc.events.decelerations.add(
+                            Deceleration(
+                                start=self.decel_active["start"],
+                                end=end_t,
+                                amp_bpm=amp,
+                                dur_s=int(dur),
+                                type=dec_type,
+                                grade=grade,
+                                uc_ref=uc_ref,
+                            )
                         )
                         label = f"Децелерация ({dec_type}"
                         if grade:
@@ -679,19 +681,15 @@ class AdvancedAccelDecelStage:
                         ctx.nc.notify(
                             end_t,
                             label,
-                            color="yellow" if dec_type != "late" else "red",
+                            color=Color.YELLOW if dec_type != "late" else Color.RED,
                         )
                     self.decel_active = None
                     ctx.active_decel = None
                     self._decel_gap = 0
 
         # обновим счетчики
-        ctx.nc.last_notification["accelerations_count"] = len(
-            ctx.nc.last_notification["accelerations"]
-        )
-        ctx.nc.last_notification["decelerations_count"] = len(
-            ctx.nc.last_notification["decelerations"]
-        )
+        ctx.nc.last_notification["accelerations_count"] = len(ctx.nc.events.accelerations)
+        ctx.nc.last_notification["decelerations_count"] = len(ctx.nc.events.decelerations)
 
 
 class SavelyevaScoreStage:
@@ -699,44 +697,39 @@ class SavelyevaScoreStage:
     Шкала Фишера (модиф. Савельевой) каждые 60с по последним 10 мин.
     """
 
+    staggered = True
+    inputs = ("median_fhr_10min",)
+
     def __init__(self, window_sec=600, eval_every=60):
         self.window_sec = window_sec
-        self.eval_every = eval_every
+        self.every = eval_every
 
-    def _fhr_window(self, ctx: StreamContext):
+    def _fhr_window(self, ctx: StreamContext) -> Optional[SignalWindow]:
         # берём из df, чтобы иметь максимальную частоту
-        if ctx.current_df is None or ctx.current_df.empty:
-            return None
-        df = ctx.current_df
-        lo = max(0, ctx.now_t - self.window_sec + 1)
-        sl = df[(df["time_sec"] >= lo) & (df["time_sec"] <= ctx.now_t)]
-        return sl["value_bpm"].astype(float).values if not sl.empty else None
+        return ctx.windows.fhr_samples(ctx, self.window_sec)
 
-    def _sinusoidal_like(self, fhr: np.ndarray) -> bool:
+    def _sinusoidal_like(self, fhr: SignalWindow) -> bool:
         # очень грубо: низкая вариабельность и квазисинус (1–5 циклов на 10 мин)
         if fhr is None or len(fhr) < 60:
             return False
-        rng = np.nanpercentile(fhr, 95) - np.nanpercentile(fhr, 5)
-        if rng < 10:  # амплитуда <10 уд/мин
+        p5, p95 = fhr.percentiles(5, 95)
+        if p95 - p5 < 10:  # амплитуда <10 уд/мин
             return True
         return False
 
-    def _freq_of_osc_per_min(self, fhr: np.ndarray) -> float:
+    def _freq_of_osc_per_min(self, fhr: SignalWindow) -> float:
         # считаем «пересечения» вокруг сглаженной «плавающей линии»
         if fhr is None or len(fhr) < 60:
             return 0.0
-        x = pd.Series(fhr).rolling(15, min_periods=1, center=True).median().values
-        y = fhr - x
-        signs = np.sign(y)
-        crossings = np.where(np.diff(np.signbit(y)))[0]
+        crossings = fhr.crossings(15)
         minutes = max(1.0, (len(fhr) / 5) / 60.0)  # ctx.fs доступен во вне, см. ниже
-        return float(len(crossings) / max(1.0, minutes))
+        return float(crossings / max(1.0, minutes))
 
-    def _amplitude_band(self, fhr: np.ndarray) -> float:
+    def _amplitude_band(self, fhr: SignalWindow) -> float:
         # оценим амплитуду осцилляций как половину межквартильного размаха*1.35 ~ калибровано под 10–25
         if fhr is None or len(fhr) < 60:
             return 0.0
-        p10, p90 = np.nanpercentile(fhr, 10), np.nanpercentile(fhr, 90)
+        p10, p90 = fhr.percentiles(10, 90)
         return float((p90 - p10) / 2.0)
 
     def _score_baseline(self, baseline: Optional[float]) -> int:
@@ -769,22 +762,17 @@ class SavelyevaScoreStage:
             return 1  # периодические (условная трактовка)
         return 0
 
-    def _score_decels(self, decels: list, now: int) -> int:
-        # смотрим только последние 10 мин
-        recent = [
-            d
-            for d in decels
-            if d["start"] is not None and d["start"] >= now - self.window_sec
-        ]
+    def _score_decels(self, recent: list) -> int:
+        # recent — децелерации только за последние 10 мин
         if not recent:
             return 2  # отсутствуют
         # если есть ранние и нет поздних/вариабельных → 2
-        if all(d.get("type") == "early" for d in recent):
+        if all(d.type == "early" for d in recent):
             return 2
         # если есть поздние краткие/вариабельные → 1
         # считаем «краткой» < 60 с
         if any(
-            (d.get("type") in ("late", "variable")) and d.get("dur_s", 0) < 60
+            d.type in ("late", "variable") and d.dur_s < 60
             for d in recent
         ):
             return 1
@@ -792,8 +780,6 @@ class SavelyevaScoreStage:
         return 0
 
     def tick(self, ctx: StreamContext) -> None:
-        if ctx.now_t % self.eval_every != 0:
-            return
         fhr = self._fhr_window(ctx)
         baseline = ctx.nc.last_notification.get("median_fhr_10min")
 
@@ -804,25 +790,22 @@ class SavelyevaScoreStage:
         sinus = self._sinusoidal_like(fhr) if fhr is not None else False
 
         # акцелерации за 10 мин
-        accels10 = sum(
-            1
-            for a in ctx.nc.last_notification["accelerations"]
-            if a["start"] >= ctx.now_t - self.window_sec
-        )
+        lo = ctx.now_t - self.window_sec
+        accels10 = ctx.nc.events.accelerations.count_since(lo)
 
         s_bas = self._score_baseline(baseline)
         s_frq = self._score_freq(freq)
         s_amp = self._score_amp(amp, sinus)
         s_acc = self._score_accels(accels10)
-        s_dec = self._score_decels(ctx.nc.last_notification["decelerations"], ctx.now_t)
+        s_dec = self._score_decels(ctx.nc.events.decelerations.since(lo))
 
         total = int(s_bas + s_frq + s_amp + s_acc + s_dec)
         if total >= 8:
-            cat, color = "Нормальное", "green"
+            cat, color = "Нормальное", Color.GREEN
         elif total >= 5:
-            cat, color = "Сомнительное", "yellow"
+            cat, color = "Сомнительное", Color.YELLOW
         else:
-            cat, color = "Патологическое", "red"
+            cat, color = "Патологическое", Color.RED
 
         if ctx.nc.last_notification["savelyeva_score"] != total:
             ctx.nc.notify(ctx.now_t, f"Савельева: {total} баллов ({cat})", color=color)
@@ -843,41 +826,30 @@ class FisherClassicStage:
       - Decelerations: поздние -> 0; ранние -> 1; нет или вариабельные -> 2
     """
 
+    staggered = True
+    inputs = ("median_fhr_10min",)
+
     def __init__(self, window_sec: int = 20 * 60, eval_every: int = 60):
         self.window_sec = window_sec
-        self.eval_every = eval_every
+        self.every = eval_every
 
     # ---- helpers ----
-    def _fhr_window(self, ctx):
-        if ctx.current_df is None or ctx.current_df.empty:
-            return None
-        lo = max(0, ctx.now_t - self.window_sec + 1)
-        sl = ctx.current_df[
-            (ctx.current_df["time_sec"] >= lo)
-            & (ctx.current_df["time_sec"] <= ctx.now_t)
-        ]
-        return sl["value_bpm"].astype(float).values if not sl.empty else None
+    def _fhr_window(self, ctx) -> Optional[SignalWindow]:
+        return ctx.windows.fhr_samples(ctx, self.window_sec)
 
     def _bandwidth_bpm(self, fhr):
         # приближенно берем междецильный размах как «полосу» вариабельности
         if fhr is None or len(fhr) < 60:
             return 0.0
-        p10, p90 = np.nanpercentile(fhr, 10), np.nanpercentile(fhr, 90)
+        p10, p90 = fhr.percentiles(10, 90)
         return float(max(0.0, p90 - p10))
 
     def _zero_crossings_per_min(self, fhr, fs):
         if fhr is None or len(fhr) < fs * 60:
             return 0.0
-        trend = (
-            pd.Series(fhr)
-            .rolling(int(fs * 15), min_periods=1, center=True)
-            .median()
-            .values
-        )
-        y = fhr - trend
-        crossings = np.where(np.diff(np.signbit(y)))[0]
+        crossings = fhr.crossings(int(fs * 15))
         minutes = max(1e-9, len(fhr) / fs / 1.0 / 60.0)  # защита от деления на ноль
-        return float(len(crossings) / minutes)
+        return float(crossings / minutes)
 
     def _score_baseline(self, baseline):
         if baseline is None:  # нет данных -> консервативно 0
@@ -905,13 +877,7 @@ class FisherClassicStage:
     def _score_accels(self, ctx):
         # Эвристика под антенатальный 20-мин тест: ≥2 акцелерации за 20 мин — «реактивность есть».
         # «Периодическими» считаем частые/шаблонные (≈≥1 на 3 мин), «спорадические» — редкие, но присутствуют.
-        lo = ctx.now_t - self.window_sec
-        accels = [
-            a
-            for a in ctx.nc.last_notification["accelerations"]
-            if a["start"] is not None and a["start"] >= lo
-        ]
-        n = len(accels)
+        n = ctx.nc.events.accelerations.count_since(ctx.now_t - self.window_sec)
         if n == 0:
             return 0
         per_min = n / max(1.0, self.window_sec / 60.0)
@@ -920,24 +886,16 @@ class FisherClassicStage:
         return 2  # спорадические
 
     def _score_decels(self, ctx):
-        lo = ctx.now_t - self.window_sec
-        recent = [
-            d
-            for d in ctx.nc.last_notification["decelerations"]
-            if d["start"] is not None and d["start"] >= lo
-        ]
+        recent = ctx.nc.events.decelerations.since(ctx.now_t - self.window_sec)
         if not recent:
             return 2  # «нет»
-        if any(d.get("type") == "late" for d in recent):
+        if any(d.type == "late" for d in recent):
             return 0
-        if any(d.get("type") == "early" for d in recent):
+        if any(d.type == "early" for d in recent):
             return 1
         return 2  # только вариабельные
 
     def tick(self, ctx) -> None:
-        if ctx.now_t % self.eval_every != 0:
-            return
-
         fhr = self._fhr_window(ctx)
         bw = self._bandwidth_bpm(fhr)
         zc = self._zero_crossings_per_min(
@@ -955,11 +913,11 @@ class FisherClassicStage:
 
         total = int(s_bas + s_bw + s_zc + s_acc + s_dec)
         if total >= 8:
-            cat, color = "Нормальное", "green"
+            cat, color = "Нормальное", Color.GREEN
         elif total >= 5:
-            cat, color = "Сомнительное", "yellow"
+            cat, color = "Сомнительное", Color.YELLOW
         else:
-            cat, color = "Патологическое", "red"
+            cat, color = "Патологическое", Color.RED
 
         if ctx.nc.last_notification["fischer_score"] != total:
             ctx.nc.notify(ctx.now_t, f"Фишер: {total} баллов ({cat})", color=color)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional
+
+import numpy as np
+
+from app.modules.ml.infrastucture.services.samples import newer_than
+
+# STV по Dawes-Redman: эпохи по 1/16 минуты (3.75 с)
+EPOCHS_PER_MINUTE = 16
+STV_WINDOW_MIN = 10
+STV_STEP_MIN = 1
+
+
+def epoch_means(x: np.ndarray, fs: int = 5) -> np.ndarray:
+    """Средние по эпохам 1/16 минуты за один проход; NaN внутри эпохи пропускаются.
+
+    При fs=5 эпоха — 18.75 отсчёта, поэтому границы эпох округляются вниз, а
+    суммы считаются через np.add.reduceat. Неполная последняя эпоха отбрасывается.
+    """
+    x = np.asarray(x, dtype=float)
+    samples_per_min = fs * 60
+    n_epochs = len(x) * EPOCHS_PER_MINUTE // samples_per_min
+    if n_epochs == 0:
+        return np.empty(0)
+    starts = np.arange(n_epochs) * samples_per_min // EPOCHS_PER_MINUTE
+    end = n_epochs * samples_per_min // EPOCHS_PER_MINUTE
+
+    valid = ~np.isnan(x[:end])
+    sums = np.add.reduceat(np.where(valid, x[:end], 0.0), starts)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def _diff_prefix_sums(means: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Префиксные суммы |Δ| между соседними эпохами и число валидных разностей."""
+    d = np.abs(np.diff(means))
+    valid = ~np.isnan(d)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, d, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    return sums, counts
+
+
+def stv_from_epochs(means: np.ndarray) -> float:
+    """STV всей записи: среднее |Δ| между соседними эпохами (не меньше минуты данных)."""
+    if len(means) < EPOCHS_PER_MINUTE:
+        return np.nan
+    sums, counts = _diff_prefix_sums(means)
+    return float(sums[-1] / counts[-1]) if counts[-1] else np.nan
+
+
+def rolling_stv_from_epochs(
+        means: np.ndarray,
+        window_min: int = STV_WINDOW_MIN,
+        step_min: int = STV_STEP_MIN,
+) -> np.ndarray:
+    """STV каждого окна window_min минут с шагом step_min; окна без данных — NaN."""
+    w = window_min * EPOCHS_PER_MINUTE
+    if len(means) < w:
+        return np.empty(0)
+    sums, counts = _diff_prefix_sums(means)
+    starts = np.arange(0, len(means) - w + 1, step_min * EPOCHS_PER_MINUTE)
+    # в окне из w эпох w-1 разностей: d[s] .. d[s+w-2]
+    win_sums = sums[starts + w - 1] - sums[starts]
+    win_counts = counts[starts + w - 1] - counts[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(win_counts > 0, win_sums / win_counts, np.nan)
+
+
+def nan_to_none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def tail_baseline(fhr: np.ndarray, fs: int = 5, seconds: int = 1200) -> float:
+    """Базальный ритм — медиана посекундных средних за последние seconds секунд.
+
+    Секунды отсчитываются блоками по fs от начала fhr, неполный хвост отбрасывается.
+    """
+    fhr = np.asarray(fhr, dtype=float)
+    n_sec = len(fhr) // fs
+    first = max(0, n_sec - seconds)
+    tail = fhr[first * fs : n_sec * fs].reshape(-1, fs)
+    valid = (~np.isnan(tail)).sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        per_sec = np.nansum(tail, axis=1)[valid > 0] / valid[valid > 0]
+    return float(np.median(per_sec)) if len(per_sec) else np.nan
+
+
+class STVTracker:
+    """Потоковый STV: закрывает по одной эпохе 3.75 с и обновляет суммы за O(1).
+
+    Хранит сумму |Δ| между соседними эпохами в скользящем 10-минутном окне, общую
+    сумму по всей записи и накопленное среднее 10-минутных окон (с шагом в минуту),
+    поэтому текущий STV, STV записи и средний 10-минутный STV читаются без проходов
+    по истории. Границы эпох совпадают с epoch_means для той же записи.
+    """
+
+    def __init__(self, fs: int = 5, window_min: int = STV_WINDOW_MIN, step_min: int = STV_STEP_MIN):
+        self.fs = fs
+        self._samples_per_min = fs * 60
+        self._window = window_min * EPOCHS_PER_MINUTE
+        self._step = step_min * EPOCHS_PER_MINUTE
+
+        self.samples = 0          # принято отсчётов
+        self.epochs = 0           # закрыто эпох
+        self._last_ts = -np.inf
+        self._next_boundary = self._boundary(1)
+        self._acc_sum = 0.0
+        self._acc_n = 0
+        self._prev_mean = np.nan
+
+        # |Δ| последних window-1 пар эпох (NaN — пара с пустой эпохой)
+        self._diffs: Deque[float] = deque()
+        self._win_sum = 0.0
+        self._win_n = 0
+        self._total_sum = 0.0
+        self._total_n = 0
+        self._rolling_sum = 0.0
+        self._rolling_n = 0
+
+    def _boundary(self, k: int) -> int:
+        return k * self._samples_per_min // EPOCHS_PER_MINUTE
+
+    def push(self, times: np.ndarray, values: np.ndarray) -> None:
+        """Добавляет отсчёты; не более поздние, чем уже принятые, отбрасываются (newer_than)."""
+        keep = newer_than(times, self._last_ts)
+        if not keep.all():
+            times, values = times[keep], values[keep]
+        if len(times):
+            self._last_ts = times[-1]
+        for v in values:
+            if v == v:  # not NaN
+                self._acc_sum += v
+                self._acc_n += 1
+            self.samples += 1
+            if self.samples == self._next_boundary:
+                self._close_epoch()
+
+    def _close_epoch(self) -> None:
+        mean = self._acc_sum / self._acc_n if self._acc_n else np.nan
+        self._acc_sum, self._acc_n = 0.0, 0
+        self.epochs += 1
+        self._next_boundary = self._boundary(self.epochs + 1)
+
+        if self.epochs > 1:
+            d = abs(mean - self._prev_mean)
+            self._diffs.append(d)
+            if d == d:
+                self._win_sum += d
+                self._win_n += 1
+                self._total_sum += d
+                self._total_n += 1
+            if len(self._diffs) > self._window - 1:
+                old = self._diffs.popleft()
+                if old == old:
+                    self._win_sum -= old
+                    self._win_n -= 1
+        self._prev_mean = mean
+
+        # закрылось очередное полное окно, начинающееся на границе минуты
+        if self.epochs >= self._window and (self.epochs - self._window) % self._step == 0 and self._win_n:
+            self._rolling_sum += self._win_sum / self._win_n
+            self._rolling_n += 1
+
+    def window_stv(self) -> float:
+        """STV за последние 10 минут (нужна хотя бы минута данных)."""
+        if self.epochs < EPOCHS_PER_MINUTE or not self._win_n:
+            return np.nan
+        return self._win_sum / self._win_n
+
+    def total_stv(self) -> float:
+        """STV по всей записи."""
+        if self.epochs < EPOCHS_PER_MINUTE or not self._total_n:
+            return np.nan
+        return self._total_sum / self._total_n
+
+    def rolling_mean_stv(self) -> float:
+        """Среднее STV 10-минутных окон с шагом в минуту."""
+        return self._rolling_sum / self._rolling_n if self._rolling_n else np.nan
@@ -3,14 +3,16 @@ from __future__ import annotations
 from collections import deque
 
 import numpy as np
-import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.modules.ml.infrastucture.services.stv import epoch_means, rolling_stv_from_epochs
 
 
 def slice_last_seconds(arr, now_t, seconds):
     lo = now_t - seconds + 1
     lo = max(0, lo)
     if isinstance(arr, deque):
-        vals = [v for (t, v) in arr if t >= lo and t <= now_t and pd.notna(v)]
+        vals = [v for (t, v) in arr if t >= lo and t <= now_t and v == v]  # v == v: не NaN
     else:
         vals = arr[lo : now_t + 1]
     return vals
@@ -35,20 +37,37 @@ def calculate_stv(fhr: np.ndarray, fs: int = 5) -> float:
     return float(np.nanmean(diffs))
 
 
-def mean_last_second(df, end_second):
-    start = end_second - 1
-    sl = df[(df["time_sec"] > start) & (df["time_sec"] <= end_second)]
-    return sl["value_bpm"].mean(), sl["value_uterus"].mean()
-
-
 def rolling_stv_mean_10min(fhr: np.ndarray, fs: int = 5) -> float:
     if fhr is None or len(fhr) < fs * 600:
         return np.nan
-    win = fs * 600
-    step = fs * 60
-    stvs = []
-    for start in range(0, len(fhr) - win + 1, step):
-        stv = calculate_stv(fhr[start : start + win], fs=fs)
-        if not np.isnan(stv):
-            stvs.append(stv)
-    return float(np.nanmean(stvs)) if stvs else np.nan
+    stvs = rolling_stv_from_epochs(epoch_means(fhr, fs))
+    stvs = stvs[~np.isnan(stvs)]
+    return float(stvs.mean()) if len(stvs) else np.nan
+
+
+def rolling_median(x: np.ndarray, win: int) -> np.ndarray:
+    """Центрированная скользящая медиана на NumPy.
+
+    Совпадает с pd.Series(x).rolling(win, center=True, min_periods=1).median():
+    окно [i - win//2, i + (win-1)//2], на краях — по неполному окну, NaN пропускаются.
+    Края дополняются NaN, все окна сортируются одним np.sort (NaN уходят в конец),
+    медиана берётся по числу валидных значений в окне.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n == 0:
+        return np.empty(0)
+    win = max(1, int(win))
+    left = win // 2
+    right = win - 1 - left
+
+    padded = np.concatenate((np.full(left, np.nan), x, np.full(right, np.nan)))
+    windows = np.sort(sliding_window_view(padded, win), axis=1)
+    valid = np.concatenate(([0], np.cumsum(~np.isnan(padded))))
+    count = valid[win:] - valid[:-win]
+
+    rows = np.arange(n)
+    lo = np.maximum((count - 1) // 2, 0)
+    hi = count // 2
+    # пустое окно: на позиции 0 стоит NaN, медиана тоже NaN
+    return (windows[rows, lo] + windows[rows, hi]) / 2
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.modules.ml.infrastucture.services.utils import rolling_median, slice_last_seconds
+
+if TYPE_CHECKING:
+    from app.modules.ml.infrastucture.services.context import StreamContext
+
+_MISSING = object()
+
+
+class SignalWindow:
+    """Окно сигнала на текущий тик; статистики считаются при первом обращении и запоминаются."""
+
+    __slots__ = ("values", "_percentiles", "_trends", "_crossings")
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        self._percentiles: Dict[float, float] = {}
+        self._trends: Dict[int, np.ndarray] = {}
+        self._crossings: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def percentiles(self, *qs: float) -> Tuple[float, ...]:
+        missing = [q for q in qs if q not in self._percentiles]
+        if missing:
+            for q, value in zip(missing, np.nanpercentile(self.values, missing)):
+                self._percentiles[q] = float(value)
+        return tuple(self._percentiles[q] for q in qs)
+
+    def trend(self, win: int) -> np.ndarray:
+        """Скользящая медиана (центрированная, по неполному окну на краях)."""
+        trend = self._trends.get(win)
+        if trend is None:
+            trend = self._trends[win] = rolling_median(self.values, win)
+        return trend
+
+    def crossings(self, win: int) -> int:
+        """Число смен знака отклонения от trend(win)."""
+        n = self._crossings.get(win)
+        if n is None:
+            y = self.values - self.trend(win)
+            n = self._crossings[win] = len(np.where(np.diff(np.signbit(y)))[0])
+        return n
+
+
+class WindowCache:
+    """Окна FHR текущего тика для оценочных стадий (FIGO, Савельева, Фишер).
+
+    Ключ — источник и длина окна; кеш сбрасывается при смене ctx.now_t.
+    Стадии запрашивают разные окна и срабатывают в разные секунды, так что
+    выигрыш — в SignalWindow: перцентили и тренд окна считаются один раз,
+    сколько бы проверок стадии их ни читали.
+    """
+
+    def __init__(self) -> None:
+        self._t: Optional[int] = None
+        self._windows: Dict[Tuple[str, int], Optional[SignalWindow]] = {}
+
+    def _lookup(self, ctx: StreamContext, key: Tuple[str, int]):
+        if self._t != ctx.now_t:
+            self._t = ctx.now_t
+            self._windows.clear()
+        return self._windows.get(key, _MISSING)  # None — окно посчитано и пустое
+
+    def fhr_seconds(self, ctx: StreamContext, sec: int) -> Optional[SignalWindow]:
+        """Посекундные средние FHR за последние sec секунд (без пропусков)."""
+        key = ("seconds", sec)
+        window = self._lookup(ctx, key)
+        if window is _MISSING:
+            x = np.array(slice_last_seconds(ctx.sec_fhr, ctx.now_t, sec), dtype=float)
+            window = self._windows[key] = SignalWindow(x) if x.size else None
+        return window
+
+    def fhr_samples(self, ctx: StreamContext, sec: int) -> Optional[SignalWindow]:
+        """Исходные отсчёты FHR за последние sec секунд (с NaN)."""
+        key = ("samples", sec)
+        window = self._lookup(ctx, key)
+        if window is _MISSING:
+            # в буфере только отсчёты с time_sec <= now_t (см. IngestionStage)
+            _, fhr, _ = ctx.samples.since(max(0, ctx.now_t - sec + 1))
+            window = self._windows[key] = SignalWindow(fhr) if len(fhr) else None
+        return window
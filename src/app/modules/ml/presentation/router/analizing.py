@@ -1,11 +1,7 @@
-import pandas as pd
 from dishka.integrations.fastapi import inject, FromDishka
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
 
 from app.modules.core.usecases.ports.ctg import CTGPort
-from app.modules.core.usecases.ports.patients import PatientPort
-from app.modules.ml.application.handlers.fetal_monitoring_handler import FetalMonitoringHandler
-from app.modules.ml.infrastucture.di import get_fetal_monitoring_handler
 
 router = APIRouter()
 
@@ -13,28 +9,30 @@ router = APIRouter()
 @inject
 async def analyze(
         patient_id: int,
-        patient_repo: FromDishka[PatientPort],
         ctg_repo: FromDishka[CTGPort],
-        fetal_monitoring_handler: FetalMonitoringHandler = Depends(get_fetal_monitoring_handler)
 ):
-    df = pd.DataFrame(columns=["day", "baseline_bpm", "stv_all", "accelerations_count"])
-    ctgs = await patient_repo.get_ctgs(patient_id)
+    # pandas/sklearn нужны только этой офлайн-аналитике — импортируем по месту;
+    # анализ статический, модели для него не загружаются
+    import pandas as pd
 
-    ctg_ids = [ctg.id for ctg in await ctg_repo.list_ctg(ctgs)]
+    from app.modules.ml.infrastucture.services.fetal_monitoring import FetalMonitoringService
+
+    overview = await ctg_repo.list_patient_overview(patient_id)
     result_list = [
         {
-            "day": result.timestamp,
-            "baseline_bpm": result.bpm,
-            "stv_all": result.stv or 100,
-            "accelerations_count": result.accelerations
+            "day": ctg.result.timestamp,
+            "baseline_bpm": ctg.result.bpm,
+            "stv_all": ctg.result.stv or 100,
+            "accelerations_count": ctg.result.accelerations
         }
-        for result in await ctg_repo.list_results(ctg_ids)
+        for ctg in overview.items
+        if ctg.result is not None
     ]
     df = pd.DataFrame(result_list).sort_values(by="day")
     print(df.head())
     try:
         return {
-            "analysis": fetal_monitoring_handler.fetal_monitoring_service.analyze_patient_dynamics(df)
+            "analysis": FetalMonitoringService.analyze_patient_dynamics(df)
         }
     except Exception as e:
         print(e)
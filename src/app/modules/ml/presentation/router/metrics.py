@@ -0,0 +1,37 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from starlette import status
+
+from app.modules.ml.infrastucture.services.instrumentation import PipelineMetrics, pipeline_metrics
+
+router = APIRouter()
+
+
+def _metrics() -> PipelineMetrics:
+    if pipeline_metrics is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Инструментирование пайплайна выключено (ML_METRICS_ENABLED)'
+        )
+    return pipeline_metrics
+
+
+@router.get(
+    "/metrics",
+    description="Время стадий, длительность и опоздание тиков пайплайна"
+)
+async def get_pipeline_metrics(format: Literal['prometheus', 'json'] = 'prometheus'):
+    metrics = _metrics()
+    if format == 'json':
+        return metrics.to_dict()
+    return PlainTextResponse(metrics.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+@router.get(
+    "/metrics/slow-ticks",
+    description="Профили самых медленных тиков (ML_METRICS_PROFILE_EVERY > 0)"
+)
+async def get_slow_ticks():
+    return _metrics().slow_ticks()
@@ -0,0 +1,29 @@
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter, Query
+
+from app.modules.ml.application.interfaces.notifications import NotificationPort
+from app.modules.ml.domain.entities.process import NotificationPage
+
+router = APIRouter()
+
+
+@router.get(
+    "/notifications/{ctg_id}",
+    description="История уведомлений КТГ: фильтр по времени записи (сек) и постраничная выдача по after_id"
+)
+@inject
+async def get_notifications(
+        ctg_id: int,
+        notification_repo: FromDishka[NotificationPort],
+        time_from: int | None = None,
+        time_to: int | None = None,
+        after_id: int | None = None,
+        limit: int = Query(100, ge=1, le=1000),
+) -> NotificationPage:
+    items = await notification_repo.list_notifications(
+        ctg_id, time_from=time_from, time_to=time_to, after_id=after_id, limit=limit
+    )
+    return NotificationPage(
+        items=items,
+        next_after_id=items[-1].id if len(items) == limit else None,
+    )
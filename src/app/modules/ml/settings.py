@@ -0,0 +1,63 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class PipelineMetricsSettings(BaseSettings):
+    """Инструментирование StreamingPipeline.step (по умолчанию выключено)."""
+
+    enabled: bool = False
+    # ожидаемый интервал между тиками одной сессии, сек
+    tick_interval: float = 1.0
+    # сколько последних сессий держать в реестре
+    max_sessions: int = 32
+    # профилировать каждый N-й тик через cProfile (0 - не профилировать)
+    profile_every: int = 0
+    # сколько самых медленных профилированных тиков хранить
+    profile_keep: int = 10
+
+    model_config = SettingsConfigDict(env_prefix='ML_METRICS_', extra='ignore')
+
+
+pipeline_metrics_settings = PipelineMetricsSettings()
+
+
+class NotificationSettings(BaseSettings):
+    """Живая история уведомлений сессии и их сброс в ctg_notifications."""
+
+    # сколько последних уведомлений держать в памяти и отдавать в кадре
+    ring_size: int = 200
+    # сбрасывать в БД пачками не меньше flush_batch ...
+    flush_batch: int = 50
+    # ... или раз в flush_interval секунд, если что-то накопилось
+    flush_interval: float = 30.0
+    # предел неотправленных уведомлений (при недоступной БД старые отбрасываются)
+    outbox_limit: int = 5000
+
+    model_config = SettingsConfigDict(env_prefix='ML_NOTIFICATIONS_', extra='ignore')
+
+
+notification_settings = NotificationSettings()
+
+
+class StageSchedulerSettings(BaseSettings):
+    """Расписание стадий StreamingPipeline."""
+
+    # разносить тяжёлые периодические стадии разных сессий по разным секундам
+    stagger: bool = True
+    # сдвиг фазы между соседними сессиями, сек (взаимно прост с 60 — сессии не совпадают)
+    phase_stride: int = 7
+
+    model_config = SettingsConfigDict(env_prefix='ML_SCHEDULER_', extra='ignore')
+
+
+stage_scheduler_settings = StageSchedulerSettings()
+
+
+class WarmupSettings(BaseSettings):
+    """Фоновая подгрузка ML-модулей после старта воркера."""
+
+    enabled: bool = True
+
+    model_config = SettingsConfigDict(env_prefix='ML_WARMUP_', extra='ignore')
+
+
+warmup_settings = WarmupSettings()
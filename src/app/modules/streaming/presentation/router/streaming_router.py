@@ -1,16 +1,16 @@
 import asyncio
 from dataclasses import asdict
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.params import Depends
 
 from app.modules.ingest.entities.ctg import CardiotocographyPoint
 from app.modules.ingest.infra.queue import signal_queue
-from app.modules.ml.application.handlers.fetal_monitoring_handler import FetalMonitoringHandler
-from app.modules.ml.domain.entities.process import Process
-from app.modules.ml.infrastucture.di import get_fetal_monitoring_handler
 from app.modules.streaming.presentation.dto import CardiotocographyPointDTO, ProcessDTO
 
+if TYPE_CHECKING:
+    from app.modules.ml.domain.entities.process import Process
+
 streaming_router = APIRouter()
 
 
@@ -23,20 +23,23 @@ async def clear_queue(q: asyncio.Queue):
 
 
 @streaming_router.websocket("/")
-async def frontend_ws(
-        websocket: WebSocket,
-        get_fetal_monitoring_handler: FetalMonitoringHandler = Depends(get_fetal_monitoring_handler)
-):
+async def frontend_ws(websocket: WebSocket):
+    # обработчик и numpy-стек импортируются при первом подключении,
+    # чтобы импорт роутера не замедлял холодный старт
+    from app.modules.ml.infrastucture.di import get_fetal_monitoring_handler
+
+    handler = get_fetal_monitoring_handler()
     await websocket.accept()
     await clear_queue(signal_queue)
     try:
         while True:
             points: list[CardiotocographyPoint] = await signal_queue.get()
             if points == [{'type': 'end'}]:
-                await get_fetal_monitoring_handler.finalize()
+                await handler.finalize()
                 break
 
-            ml_res: Process = get_fetal_monitoring_handler.process_stream(points)
+            ml_res: Process = handler.process_stream(points)
+            await handler.flush_notifications()
             process_dto = ProcessDTO.model_validate(asdict(ml_res))
 
             await websocket.send_json({
@@ -52,26 +52,35 @@ def open_excel_doc(file_path: PathLike):
                     'blood_gas_be': validate_float_cell(row[6]),
                 }
 
-def db_seed():
-    """ Заносим данные в БД """
-    engine = create_engine("sqlite:///./../../app.db")
+_INSERT_PATIENT = text("INSERT INTO patients (full_name, name_key) VALUES (:full_name, :name_key)")
+_INSERT_PATIENT_INFO = text(
+    "INSERT INTO patient_info (patient_id, diagnosis, blood_gas_ph, blood_gas_co2, blood_gas_glu, blood_gas_lac, blood_gas_be)"
+    "VALUES (:patient_id, :diagnosis, :blood_gas_ph, :blood_gas_co2, :blood_gas_glu, :blood_gas_lac, :blood_gas_be)"
+)
+
+
+def db_seed(db_url: str = "sqlite:///./../../app.db", patients: int = 210):
+    """ Заносим данные в БД
+
+    Всё одной транзакцией, строки каждой таблицы — одним executemany.
+    """
+    engine = create_engine(db_url)
 
     p = Person(Locale.RU)
-    # Заносим пациентов
-    for i in range(210):
-        full_name = p.full_name(gender=Gender.FEMALE)
-        with engine.begin() as conn:
-            conn.execute(
-                text("INSERT INTO patients (full_name) VALUES (:full_name)"),
-                {"full_name": full_name}
-            )
+    full_names = [
+        {"full_name": name, "name_key": name.casefold()}
+        for name in (p.full_name(gender=Gender.FEMALE) for _ in range(patients))
+    ]
+    # листы Excel читаются до транзакции, чтобы не держать лок БД на разборе файлов
+    patient_info = list(chain(open_excel_doc("./static/hypoxia.xlsx"), open_excel_doc("./static/regular.xlsx")))
+
+    with engine.begin() as conn:
+        # Заносим пациентов
+        conn.execute(_INSERT_PATIENT, full_names)
+        # Заносим базовую информацию
+        conn.execute(_INSERT_PATIENT_INFO, patient_info)
+    engine.dispose()
+
 
-    # Заносим базовую информацию
-    for data in chain(open_excel_doc("./static/hypoxia.xlsx"), open_excel_doc("./static/regular.xlsx")):
-        with engine.begin() as conn:
-            conn.execute(
-                text("INSERT INTO patient_info (patient_id, diagnosis, blood_gas_ph, blood_gas_co2, blood_gas_glu, blood_gas_lac, blood_gas_be)"
-                     "VALUES (:patient_id, :diagnosis, :blood_gas_ph, :blood_gas_co2, :blood_gas_glu, :blood_gas_lac, :blood_gas_be)"),
-                data
-            )
-db_seed()
\ No newline at end of file
+if __name__ == "__main__":
+    db_seed()
@@ -0,0 +1,162 @@
+""" Синтетическая БД для нагрузочной проверки запросов и кэша чтения
+
+N пациенток по M записей КТГ у каждой, итоги по записям и (по желанию) файлы
+сигналов в формате логов ingest. Строки генерируются пачками numpy и пишутся
+одной транзакцией через executemany, поэтому 10^5–10^6 записей засеиваются
+за секунды-десятки секунд, а не часы построчных коммитов.
+
+    python -m db_ceed.synthetic --db sqlite:///./app.db --patients 10000 --recordings 50
+    python -m db_ceed.synthetic --patients 1000 --recordings 10 --signals-dir /tmp/ctg_logs
+
+Новые строки дописываются после существующих id, схема должна быть уже
+создана (alembic upgrade head).
+"""
+import argparse
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import Connection, column, create_engine, func, select, table, text
+
+FS = 5
+BATCH = 20_000
+_MSK = timezone(timedelta(hours=3))
+_FIGO = np.array(["Нормальная", "Сомнительное", "Патологическое"])
+_FIGO_P = [0.7, 0.22, 0.08]
+_GEST_AGE = np.array([f"{w}+{d} нед" for w in range(36, 42) for d in range(7)])
+
+
+def _names(rng: np.random.Generator, n: int) -> list[str]:
+    from mimesis import Gender, Person
+    from mimesis.locales import Locale
+
+    # пул имён и фамилий небольшой, сочетания — из numpy: mimesis на 10^6 имён слишком медленный
+    p = Person(Locale.RU)
+    first = np.array([p.first_name(gender=Gender.FEMALE) for _ in range(300)])
+    last = np.array([p.last_name(gender=Gender.FEMALE) for _ in range(1000)])
+    return list(np.char.add(np.char.add(first[rng.integers(0, len(first), n)], " "),
+                            last[rng.integers(0, len(last), n)]))
+
+
+def _next_id(conn: Connection, name: str) -> int:
+    return (conn.execute(select(func.max(column("id"))).select_from(table(name))).scalar() or 0) + 1
+
+
+def _chunks(total: int) -> Iterator[tuple[int, int]]:
+    for lo in range(0, total, BATCH):
+        yield lo, min(lo + BATCH, total)
+
+
+def write_signal(path: Path, rng: np.random.Generator, seconds: int) -> None:
+    """CSV как у make_file_logger: timestamp,bpm,uc с частотой FS."""
+    t = np.arange(seconds * FS) / FS
+    fhr = 140 + 5 * np.sin(2 * np.pi * t / 40) + rng.normal(0, 2, t.size) + rng.normal(0, 8)
+    uc = np.clip(10 + 30 * np.sin(np.pi * (t % 240) / 240) ** 8 + rng.normal(0, 1, t.size), 0, None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write("timestamp,bpm,uc\n")
+        np.savetxt(f, np.column_stack((t, fhr, uc)), fmt=("%.1f", "%.2f", "%.2f"), delimiter=",")
+
+
+def generate(
+        db_url: str,
+        patients: int,
+        recordings: int,
+        result_ratio: float = 0.9,
+        signals_dir: Path | None = None,
+        signal_seconds: int = 60,
+        days: int = 365,
+        seed: int = 0,
+) -> dict[str, int]:
+    """Засеивает БД и возвращает число вставленных строк по таблицам."""
+    rng = np.random.default_rng(seed)
+    engine = create_engine(db_url)
+    counts = {"patients": patients, "ctg_history": patients * recordings, "ctg_results": 0}
+    now = datetime.now(_MSK).replace(microsecond=0)
+
+    with engine.begin() as conn:
+        first_patient, first_ctg = _next_id(conn, "patients"), _next_id(conn, "ctg_history")
+        insert_patient = text(
+            "INSERT INTO patients (id, full_name, name_key) VALUES (:id, :full_name, :name_key)"
+        )
+        insert_history = text(
+            "INSERT INTO ctg_history (id, patient_id, file_path, archive_path) "
+            "VALUES (:id, :patient_id, :path, NULL)"
+        )
+        insert_result = text(
+            "INSERT INTO ctg_results (ctg_id, gest_age, bpm, uc, figo, stv, stv_little, "
+            "accelerations, decelerations, created_at) VALUES "
+            "(:ctg_id, :gest_age, :bpm, :uc, :figo, :stv, :stv_little, :accelerations, :decelerations, :created_at)"
+        )
+
+        names = _names(rng, patients)
+        for lo, hi in _chunks(patients):
+            conn.execute(insert_patient, [
+                {"id": first_patient + i, "full_name": names[i], "name_key": names[i].casefold()}
+                for i in range(lo, hi)
+            ])
+
+        logs = signals_dir if signals_dir is not None else Path("/tmp/ctg_logs")
+        for lo, hi in _chunks(counts["ctg_history"]):
+            ctg_ids = np.arange(first_ctg + lo, first_ctg + hi)
+            patient_ids = first_patient + np.arange(lo, hi) // recordings
+            paths = [f"{logs}/{p}/{c}-ctg-log.csv" for p, c in zip(patient_ids.tolist(), ctg_ids.tolist())]
+            conn.execute(insert_history, [
+                {"id": c, "patient_id": p, "path": path}
+                for c, p, path in zip(ctg_ids.tolist(), patient_ids.tolist(), paths)
+            ])
+            if signals_dir is not None:
+                for path in paths:
+                    write_signal(Path(path), rng, signal_seconds)
+
+            # итоги: не у всех записей (идущие сейчас ещё без итога)
+            done = ctg_ids[rng.random(ctg_ids.size) < result_ratio]
+            n = done.size
+            seconds_ago = rng.integers(0, days * 86400, n)
+            rows = zip(
+                done.tolist(),
+                _GEST_AGE[rng.integers(0, _GEST_AGE.size, n)].tolist(),
+                np.round(rng.normal(140, 10, n), 1).tolist(),
+                np.round(rng.gamma(2.0, 6.0, n), 2).tolist(),
+                rng.choice(_FIGO, n, p=_FIGO_P).tolist(),
+                np.rint(rng.gamma(4.0, 1.5, n)).astype(int).tolist(),  # stv, stv_little — INTEGER в схеме
+                np.rint(rng.gamma(4.0, 1.5, n)).astype(int).tolist(),
+                rng.poisson(3, n).tolist(),
+                rng.poisson(0.5, n).tolist(),
+                seconds_ago.tolist(),
+            )
+            conn.execute(insert_result, [
+                {
+                    "ctg_id": c, "gest_age": g, "bpm": b, "uc": u, "figo": f, "stv": s,
+                    "stv_little": sl, "accelerations": a, "decelerations": d,
+                    # как пишет ResultRepository: ISO с миллисекундами и смещением +03:00
+                    "created_at": (now - timedelta(seconds=ago)).isoformat(" ", "milliseconds"),
+                }
+                for c, g, b, u, f, s, sl, a, d, ago in rows
+            ])
+            counts["ctg_results"] += n
+
+    engine.dispose()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Синтетические пациентки, записи КТГ и итоги")
+    parser.add_argument("--db", default="sqlite:///./app.db", help="URL БД (синхронный драйвер)")
+    parser.add_argument("--patients", type=int, default=1000)
+    parser.add_argument("--recordings", type=int, default=10, help="записей КТГ на пациентку")
+    parser.add_argument("--result-ratio", type=float, default=0.9, help="доля записей с итогом")
+    parser.add_argument("--signals-dir", type=Path, default=None, help="куда писать CSV сигналов")
+    parser.add_argument("--signal-seconds", type=int, default=60, help="длина каждого сигнала, сек")
+    parser.add_argument("--days", type=int, default=365, help="за сколько последних дней итоги")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate(
+        args.db, args.patients, args.recordings, args.result_ratio,
+        args.signals_dir, args.signal_seconds, args.days, args.seed,
+    )
+    print(", ".join(f"{name}: {n}" for name, n in counts.items()), f"за {time.perf_counter() - started:.1f} с")
@@ -6,7 +6,7 @@ from decimal import Decimal
 
 import uvicorn
 import websockets
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, HTTPException, status
 from starlette.middleware.cors import CORSMiddleware
 
 from sending_signals import sending_signals
@@ -22,6 +22,31 @@ app.add_middleware(
 
 current_task: asyncio.Task | None = None
 
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", 256 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+
+
+async def spool_upload(archive: UploadFile) -> str:
+    """Порционно сохраняет архив во временный файл и возвращает путь к нему."""
+    if archive.size is not None and archive.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="archive too large")
+
+    total = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
+        try:
+            while chunk := await archive.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="archive too large"
+                    )
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+        return tmp.name
+
 
 @app.post("/start")
 async def start(archive: UploadFile = File(...)):
@@ -34,10 +59,7 @@ async def start(archive: UploadFile = File(...)):
         except asyncio.CancelledError:
             print("Предыдущая эмуляция остановлена")
 
-    content = await archive.read()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
+    tmp_path = await spool_upload(archive)
 
     current_task = asyncio.create_task(run_emulation(tmp_path))
 
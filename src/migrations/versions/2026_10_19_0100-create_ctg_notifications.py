@@ -0,0 +1,56 @@
+"""create ctg_notifications
+
+Revision ID: 3b9d51a0c2e4
+Revises: 7ec1afc86853
+Create Date: 2026-10-19 01:00:00.000000+03:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d51a0c2e4'
+down_revision: Union[str, Sequence[str], None] = '7ec1afc86853'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'ctg_notifications',
+        sa.Column(
+            'id', sa.Integer(), autoincrement=True, nullable=False, primary_key=True,
+            comment='Идентификатор',
+        ),
+        sa.Column(
+            'ctg_id', sa.Integer(),
+            sa.ForeignKey('ctg_history.id', ondelete='CASCADE'),
+            nullable=False,
+            comment='Идентификатор КТГ'
+        ),
+        sa.Column(
+            'time_sec', sa.Integer(), nullable=False,
+            comment='Секунда записи, на которой возникло уведомление'
+        ),
+        sa.Column(
+            'message', sa.Text(), nullable=False,
+            comment='Текст уведомления'
+        ),
+        sa.Column(
+            'color', sa.String(length=16), nullable=False,
+            comment='Цвет (важность) уведомления'
+        ),
+        comment='Журнал уведомлений мониторинга КТГ'
+    )
+    op.create_index(
+        'ix_ctg_notifications_ctg_id_time_sec', 'ctg_notifications', ['ctg_id', 'time_sec']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ctg_notifications_ctg_id_time_sec', table_name='ctg_notifications')
+    op.drop_table('ctg_notifications')
@@ -0,0 +1,37 @@
+"""add lookup indexes
+
+Revision ID: 8f4c2d7a19b6
+Revises: 3b9d51a0c2e4
+Create Date: 2026-10-19 02:00:00.000000+03:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4c2d7a19b6'
+down_revision: Union[str, Sequence[str], None] = '3b9d51a0c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # записи пациента: id (rowid) и archive_path читаются прямо из индекса
+    op.create_index(
+        'ix_ctg_history_patient_id_archive_path', 'ctg_history', ['patient_id', 'archive_path']
+    )
+    # итоги по списку КТГ, в том числе за период
+    op.create_index(
+        'ix_ctg_results_ctg_id_created_at', 'ctg_results', ['ctg_id', 'created_at']
+    )
+    # итоги за период по всем КТГ
+    op.create_index('ix_ctg_results_created_at', 'ctg_results', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ctg_results_created_at', table_name='ctg_results')
+    op.drop_index('ix_ctg_results_ctg_id_created_at', table_name='ctg_results')
+    op.drop_index('ix_ctg_history_patient_id_archive_path', table_name='ctg_history')
@@ -0,0 +1,43 @@
+"""add patients name_key
+
+Revision ID: 6a3f9c1e8d52
+Revises: 8f4c2d7a19b6
+Create Date: 2026-10-19 03:00:00.000000+03:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6a3f9c1e8d52'
+down_revision: Union[str, Sequence[str], None] = '8f4c2d7a19b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # имя в str.casefold() для поиска без учёта регистра: lower() в SQLite меняет
+    # только ASCII, поэтому значение считает Python и пишет каждый, кто пишет full_name
+    op.add_column('patients', sa.Column('name_key', sa.String(length=255), nullable=True))
+    bind = op.get_bind()
+    patients = sa.table('patients', sa.column('id'), sa.column('full_name'), sa.column('name_key'))
+    rows = bind.execute(sa.select(patients.c.id, patients.c.full_name)).all()
+    if rows:
+        bind.execute(
+            patients.update().where(patients.c.id == sa.bindparam('pid')),
+            [{'pid': row.id, 'name_key': row.full_name.casefold()} for row in rows],
+        )
+    with op.batch_alter_table('patients') as batch_op:
+        batch_op.alter_column('name_key', existing_type=sa.String(length=255), nullable=False)
+    # список пациентов: keyset по (name_key, id) и поиск по префиксу
+    op.create_index('ix_patients_name_key', 'patients', ['name_key', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_patients_name_key', table_name='patients')
+    with op.batch_alter_table('patients') as batch_op:
+        batch_op.drop_column('name_key')
@@ -0,0 +1,46 @@
+"""rename columns to app schema
+
+Revision ID: d2b8e6f41a07
+Revises: 6a3f9c1e8d52
+Create Date: 2026-10-19 04:00:00.000000+03:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b8e6f41a07'
+down_revision: Union[str, Sequence[str], None] = '6a3f9c1e8d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, имя в create_database, имя в рабочей БД и app.modules.core.infra.tables)
+_RENAMES = (
+    ('ctg_history', 'dir_path', 'file_path'),
+    ('ctg_results', 'acceleration', 'accelerations'),
+    ('ctg_results', 'deceleration', 'decelerations'),
+)
+
+
+def _rename(old_index: int, new_index: int) -> None:
+    # рабочая app.db создавалась не этой цепочкой и уже называет колонки по-новому —
+    # переименовываем только то, что есть
+    inspector = sa.inspect(op.get_bind())
+    for table_name, *names in _RENAMES:
+        columns = {column['name'] for column in inspector.get_columns(table_name)}
+        old, new = names[old_index], names[new_index]
+        if old in columns and new not in columns:
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.alter_column(old, new_column_name=new)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename(0, 1)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename(1, 0)
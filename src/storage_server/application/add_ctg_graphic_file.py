@@ -1,3 +1,4 @@
+import shutil
 import tempfile
 from contextlib import contextmanager
 from pathlib import Path
@@ -13,9 +14,8 @@ def new_temp_dir() -> Path:
     with tempfile.TemporaryDirectory() as temp_dir:
         yield Path(temp_dir)
 
-def write_file(filename: str, content: bytes, dst: Path) -> None:
-    with open (dst / filename, mode='wb') as f:
-        f.write(content)
+def copy_file(filename: str, src: Path, dst: Path) -> None:
+    shutil.copyfile(src, dst / filename)
 
 async def add_ctg_graphic_file(
         graphic_file_dto: CTGGraphicFileAddInDTO,
@@ -27,9 +27,9 @@ async def add_ctg_graphic_file(
     if archive_path.exists():
         try:
             with archive.unarchive() as dir_path:
-                write_file(
+                copy_file(
                     graphic_file_dto.filename,
-                    graphic_file_dto.file,
+                    graphic_file_dto.file_path,
                     dir_path
                 )
                 new_archive = CTGGraphicArchive.archive(dir_path, archive_path)
@@ -37,9 +37,9 @@ async def add_ctg_graphic_file(
             raise UnexpectedError from err
     else:
         with new_temp_dir() as temp_dir:
-            write_file(
+            copy_file(
                 graphic_file_dto.filename,
-                graphic_file_dto.file,
+                graphic_file_dto.file_path,
                 temp_dir
             )
             new_archive = CTGGraphicArchive.archive(temp_dir, archive_path)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from pathlib import Path
 
 from pydantic import BaseModel
 
@@ -6,8 +7,8 @@ from pydantic import BaseModel
 class CTGGraphicFileAddInDTO(BaseModel):
     patient_id: int
     ctg_datetime: datetime
-    file: bytes
+    file_path: Path
 
     @property
     def filename(self) -> str:
-        return self.ctg_datetime.strftime("%Y%m%d%H%M%S") + '.csv'
\ No newline at end of file
+        return self.ctg_datetime.strftime("%Y%m%d%H%M%S") + '.csv'
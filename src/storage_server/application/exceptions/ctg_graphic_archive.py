@@ -1,2 +1,8 @@
 class ArchiveNotFound(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class UploadTooLarge(Exception):
+    pass
+
+class ArchiveMemberNotFound(Exception):
+    pass
@@ -0,0 +1,24 @@
+from storage_server.application.exceptions.application import UnexpectedError
+from storage_server.application.exceptions.ctg_graphic_archive import ArchiveNotFound, ArchiveMemberNotFound
+from storage_server.application.get_ctg_graphic_archive import get_ctg_graphic_archive_path
+from storage_server.application.ports.ctg_history_repo import CTGHistoryRepository
+from storage_server.domain.ctg_graphic_archive import CTGGraphicArchive, CTGGraphicArchiveMember
+
+
+async def get_ctg_graphic_file(
+        patient_id: int,
+        file_path_in_archive: str,
+        ctg_history_repo: CTGHistoryRepository,
+) -> CTGGraphicArchiveMember:
+    archive_path = await get_ctg_graphic_archive_path(patient_id, ctg_history_repo)
+    if not archive_path.is_file():
+        raise ArchiveNotFound
+
+    try:
+        member = CTGGraphicArchive(archive_path).member(file_path_in_archive)
+    except Exception as err:
+        raise UnexpectedError from err
+
+    if member is None:
+        raise ArchiveMemberNotFound
+    return member
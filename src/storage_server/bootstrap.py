@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from typing import Any
 
 import structlog
@@ -12,6 +13,15 @@ from storage_server.di_container import sync_container, async_container
 from storage_server.settings import HTTPServerSettings, AppSettings
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        yield
+    finally:
+        # закрывает пул и дописывает очередь WriteBehindWriter
+        await async_container.close()
+
+
 def create_server(http_server_settings: HTTPServerSettings, app_settings: AppSettings) -> FastAPI:
     app = FastAPI(
         title="storage-server",
@@ -19,6 +29,7 @@ def create_server(http_server_settings: HTTPServerSettings, app_settings: AppSet
         version=http_server_settings.api_version,
         docs_url=None if not app_settings.is_dev() else "/docs",
         redoc_url=None,
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -1,16 +1,33 @@
 import os
-from collections.abc import AsyncIterable, Iterable
+from collections.abc import AsyncIterable
 
+import httpx
 from dishka import Provider, Scope, provide, make_container, make_async_container
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, async_sessionmaker, AsyncSession
 
 from storage_server.application.ports.ctg_history_repo import CTGHistoryRepository
 from storage_server.application.ports.ctg_result_repo import CTGResultRepository
 from storage_server.application.ports.patient_repo import PatientRepository
+from storage_server.infrastructure.cache_invalidation import AppCacheNotifier
 from storage_server.infrastructure.repositories.ctg_history import SQLAlchemyCTGHistoryRepository
 from storage_server.infrastructure.repositories.ctg_result import SQLAlchemyCTGResultRepository
 from storage_server.infrastructure.repositories.patient import SQLAlchemyPatientRepository
-from storage_server.settings import DatabaseSettings, AppSettings, HTTPServerSettings
+from storage_server.infrastructure.sqlite import (
+    WriterEngine,
+    WriterSession,
+    create_reader_engine,
+    create_writer_engine,
+    is_sqlite,
+)
+from storage_server.infrastructure.write_behind import WriteBehindWriter
+from storage_server.settings import (
+    AppSettings,
+    CacheNotifierSettings,
+    DatabaseSettings,
+    HTTPServerSettings,
+    SQLiteSettings,
+    WriteBehindSettings,
+)
 
 _ENV_PATH = os.environ.get("ENV_PATH", None)
 
@@ -36,38 +53,123 @@ class SettingsProvider(Provider):
     def http_server_settings(self, app_settings: AppSettings) -> HTTPServerSettings:
         return HTTPServerSettings(_env_file=self._env_file, run_mode=app_settings.run_mode)
 
+    @provide
+    def cache_notifier_settings(self) -> CacheNotifierSettings:
+        return CacheNotifierSettings(_env_file=self._env_file)
+
+    @provide
+    def write_behind_settings(self) -> WriteBehindSettings:
+        return WriteBehindSettings(_env_file=self._env_file)
+
+    @provide
+    def sqlite_settings(self) -> SQLiteSettings:
+        return SQLiteSettings(_env_file=self._env_file)
+
 
 class DatabaseProvider(Provider):
     @provide(scope=Scope.APP)
-    def engine(self, settings: DatabaseSettings) -> Iterable[AsyncEngine]:
-        engine = create_async_engine(settings.db_url, pool_pre_ping=True)
+    async def engine(
+            self, settings: DatabaseSettings, sqlite_settings: SQLiteSettings
+    ) -> AsyncIterable[AsyncEngine]:
+        if is_sqlite(settings.db_url):
+            engine = create_reader_engine(settings.db_url, sqlite_settings)
+        else:
+            engine = create_async_engine(settings.db_url, pool_pre_ping=True)
         yield engine
+        await engine.dispose()
+
+    @provide(scope=Scope.APP)
+    async def writer_engine(
+            self, settings: DatabaseSettings, sqlite_settings: SQLiteSettings, engine: AsyncEngine
+    ) -> AsyncIterable[WriterEngine]:
+        # у SQLite один писатель на файл — отдельное соединение, остальным СУБД хватает общего пула
+        if not is_sqlite(settings.db_url):
+            yield WriterEngine(engine)
+            return
+        writer_engine = create_writer_engine(settings.db_url, sqlite_settings)
+        yield WriterEngine(writer_engine)
+        await writer_engine.dispose()
 
     @provide(scope=Scope.APP)
     def session_factory(self, engine: AsyncEngine) -> async_sessionmaker:
         return async_sessionmaker(bind=engine, expire_on_commit=False)
 
+    @provide(scope=Scope.APP)
+    async def write_behind(
+            self, engine: WriterEngine, settings: WriteBehindSettings
+    ) -> AsyncIterable[WriteBehindWriter]:
+        # очередь дописывается при закрытии контейнера в lifespan
+        writer = WriteBehindWriter(async_sessionmaker(bind=engine, expire_on_commit=False), settings)
+        writer.start()
+        yield writer
+        await writer.close()
+
     @provide(scope=Scope.REQUEST)
     async def session(self, session_factory: async_sessionmaker) -> AsyncIterable[AsyncSession]:
         async with session_factory() as session:
             yield session
 
     @provide(scope=Scope.REQUEST)
-    async def get_patient_repository(self, session: AsyncSession) -> PatientRepository:
+    async def writer_session(self, engine: WriterEngine) -> AsyncIterable[WriterSession]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield WriterSession(session)
+
+    @provide(scope=Scope.REQUEST)
+    async def get_patient_repository(
+            self, session: AsyncSession, writer_session: WriterSession
+    ) -> PatientRepository:
         return SQLAlchemyPatientRepository(
             session=session,
+            writer_session=writer_session,
         )
 
     @provide(scope=Scope.REQUEST)
-    async def get_ctg_history_repository(self, session: AsyncSession) -> CTGHistoryRepository:
+    async def get_ctg_history_repository(
+            self, session: AsyncSession, writer: WriteBehindWriter
+    ) -> CTGHistoryRepository:
         return SQLAlchemyCTGHistoryRepository(
             session=session,
+            writer=writer,
         )
 
     @provide(scope=Scope.REQUEST)
-    async def get_ctg_result_repository(self, session: AsyncSession) -> CTGResultRepository:
-        return SQLAlchemyCTGResultRepository(session)
+    async def get_ctg_result_repository(
+            self, session: AsyncSession, writer: WriteBehindWriter
+    ) -> CTGResultRepository:
+        return SQLAlchemyCTGResultRepository(session, writer)
+
+
+class NotifierProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def app_cache_notifier(
+            self, app_settings: AppSettings, settings: CacheNotifierSettings
+    ) -> AsyncIterable[AppCacheNotifier]:
+        if app_settings.app_cache_invalidate_url is None:
+            yield AppCacheNotifier(None, None)
+            return
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        # повторяются только неудачные подключения: повтор сброса кэша безопасен в любом случае
+        transport = httpx.AsyncHTTPTransport(retries=settings.retries, limits=limits)
+        async with httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                connect=settings.connect_timeout,
+                read=settings.read_timeout,
+                write=settings.write_timeout,
+                pool=settings.pool_timeout,
+            ),
+        ) as client:
+            token = app_settings.app_cache_invalidate_token
+            yield AppCacheNotifier(
+                client,
+                app_settings.app_cache_invalidate_url,
+                token.get_secret_value() if token is not None else None,
+            )
 
 
 sync_container = make_container(SettingsProvider(_ENV_PATH), DatabaseProvider())
-async_container = make_async_container(SettingsProvider(_ENV_PATH), DatabaseProvider())
\ No newline at end of file
+async_container = make_async_container(SettingsProvider(_ENV_PATH), DatabaseProvider(), NotifierProvider())
\ No newline at end of file
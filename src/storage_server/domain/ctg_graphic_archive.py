@@ -1,5 +1,7 @@
 import shutil
 import tempfile
+import zipfile
+from collections.abc import Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
@@ -7,10 +9,59 @@ from pathlib import Path
 from storage_server.domain.mixin import DataclassMixin
 
 
+@dataclass(slots=True, frozen=True)
+class CTGGraphicArchiveMember(DataclassMixin):
+    """Отдельный файл КТГ внутри архива пациента."""
+    archive_path: Path
+    name: str
+    size: int
+    crc: int
+
+    @property
+    def etag(self) -> str:
+        # Содержимое члена архива не меняется при дописывании других файлов,
+        # поэтому ETag строится по CRC и размеру, а не по mtime архива
+        return f'"{self.crc:08x}-{self.size:x}"'
+
+    def iter_bytes(self, start: int = 0, end: int | None = None, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Порционно читает байты [start, end] члена архива без распаковки на диск."""
+        end = self.size - 1 if end is None else end
+        remaining = end - start + 1
+        with zipfile.ZipFile(self.archive_path) as zf, zf.open(self.name) as member:
+            if start:
+                member.seek(start)
+            while remaining > 0:
+                chunk = member.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
 @dataclass(slots=True, frozen=True)
 class CTGGraphicArchive(DataclassMixin):
     archive_path: Path
 
+    @property
+    def etag(self) -> str:
+        stat = self.archive_path.stat()
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def member(self, name: str) -> CTGGraphicArchiveMember | None:
+        with zipfile.ZipFile(self.archive_path) as zf:
+            try:
+                info = zf.getinfo(name)
+            except KeyError:
+                return None
+        if info.is_dir():
+            return None
+        return CTGGraphicArchiveMember(
+            archive_path=self.archive_path,
+            name=info.filename,
+            size=info.file_size,
+            crc=info.CRC,
+        )
+
     @staticmethod
     def archive(dir_path: Path, archive_path: Path) -> 'CTGGraphicArchive':
         shutil.make_archive(
@@ -0,0 +1,32 @@
+from typing import Any
+
+import httpx
+import structlog
+
+logger = structlog.get_logger('http')
+
+
+class AppCacheNotifier:
+    """Сообщает основному приложению об изменениях в БД, чтобы оно сбросило кэш чтения.
+
+    Без адреса (app_cache_invalidate_url) ничего не делает — кэш приложения
+    догонит изменения по TTL. Ошибка доставки только логируется: запись уже
+    закоммичена, и отвечать клиенту ошибкой из-за кэша нельзя.
+
+    Запрос доходит до одного воркера приложения (того, кому его отдал
+    балансировщик); кэш остальных воркеров живёт до TTL.
+    """
+
+    def __init__(self, client: httpx.AsyncClient | None, url: str | None, token: str | None = None):
+        self._client = client
+        self._url = url
+        self._headers = {"X-Cache-Token": token} if token is not None else {}
+
+    async def notify(self, **changes: Any) -> None:
+        if self._client is None or self._url is None:
+            return
+        try:
+            response = await self._client.post(self._url, json=changes, headers=self._headers)
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            logger.warning('app_cache_invalidate_failed', url=self._url, changes=changes, error=str(err))
@@ -0,0 +1,46 @@
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Разбирает заголовок Range в границы [start, end] включительно.
+
+    Поддерживается только один диапазон в байтах; для отсутствующего,
+    составного или некорректного заголовка возвращается None (отдаём файл целиком).
+
+    Raises:
+        RangeNotSatisfiable: диапазон лежит за пределами файла.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if first == '':
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable
+            start, end = max(0, size - suffix), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable
+    if start < 0 or start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
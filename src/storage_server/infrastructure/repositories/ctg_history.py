@@ -5,14 +5,18 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..write_behind import WriteBehindWriter
 from ...application.ports.ctg_history_repo import CTGHistoryRepository
 from ...domain.ctg_history import CTGHistory
 from ..tables.ctg_history import ctg_history_table
 
+_INSERT_HISTORY = insert(ctg_history_table)
+
 
 class SQLAlchemyCTGHistoryRepository(CTGHistoryRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, writer: WriteBehindWriter) -> None:
         self._session = session
+        self._writer = writer
 
     async def read_by_patient_id(self, patient_id: int) -> AsyncIterable[CTGHistory]:
         stmt = (
@@ -42,9 +46,4 @@ class SQLAlchemyCTGHistoryRepository(CTGHistoryRepository):
         ctg_history_dict = ctg_history.to_dict()
         ctg_history_dict.pop("id")
 
-        stmt = (
-            insert(ctg_history_table)
-            .values({"patient_id": patient_id, **ctg_history_dict})
-        )
-        await self._session.execute(stmt)
-        await self._session.commit()
\ No newline at end of file
+        await self._writer.submit(_INSERT_HISTORY, {"patient_id": patient_id, **ctg_history_dict})
\ No newline at end of file
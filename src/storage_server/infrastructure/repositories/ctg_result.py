@@ -4,14 +4,18 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from storage_server.infrastructure.write_behind import WriteBehindWriter
 from storage_server.application.ports.ctg_result_repo import CTGResultRepository
 from storage_server.domain.ctg_result import CTGResult
 from ..tables.ctg_result import ctg_results_table
 
+_INSERT_RESULT = insert(ctg_results_table)
+
 
 class SQLAlchemyCTGResultRepository(CTGResultRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, writer: WriteBehindWriter) -> None:
         self._session = session
+        self._writer = writer
 
     @override
     async def read_by_ctg_id(self, ctg_id: int) -> AsyncIterable[CTGResult]:
@@ -32,9 +36,4 @@ class SQLAlchemyCTGResultRepository(CTGResultRepository):
         ctg_result_dict = ctg_result.to_dict()
         ctg_result_dict.pop("ctg_id")
 
-        stmt = (
-            insert(ctg_results_table)
-            .values({"ctg_id": ctg_id, **ctg_result_dict})
-        )
-        await self._session.execute(stmt)
-        await self._session.commit()
\ No newline at end of file
+        await self._writer.submit(_INSERT_RESULT, {"ctg_id": ctg_id, **ctg_result_dict})
\ No newline at end of file
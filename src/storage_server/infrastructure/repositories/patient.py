@@ -4,14 +4,17 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..sqlite import WriterSession
+
 from ..tables.patients import patients_table, patient_info_table
 from ...application.ports.patient_repo import PatientRepository
 from ...domain.patient import Patient
 
 
 class SQLAlchemyPatientRepository(PatientRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, writer_session: WriterSession) -> None:
         self._session = session
+        self._writer_session = writer_session
 
     @override
     async def read(self, patient_id: int) -> Patient | None:
@@ -38,6 +41,8 @@ class SQLAlchemyPatientRepository(PatientRepository):
         patient_base_dict = patient.to_dict()
         patient_id = patient_base_dict.pop("id")
         patient_base_dict.pop("additional_info")
+        # ключ поиска по имени без учёта регистра (SQLite lower() меняет только ASCII)
+        patient_base_dict["name_key"] = patient_base_dict["full_name"].casefold()
 
         stmt_patient_base = (
             insert(patients_table)
@@ -48,7 +53,7 @@ class SQLAlchemyPatientRepository(PatientRepository):
             )
             .returning(patients_table.c.id)
         )
-        new_patient_id = (await self._session.execute(stmt_patient_base)).scalar_one()
+        new_patient_id = (await self._writer_session.execute(stmt_patient_base)).scalar_one()
 
         if patient.has_additional_info():
             patient_add_info_dict = patient.additional_info.to_dict()
@@ -60,9 +65,9 @@ class SQLAlchemyPatientRepository(PatientRepository):
                     set_=patient_add_info_dict,
                 )
             )
-            await self._session.execute(stmt_patient_add_info, )
+            await self._writer_session.execute(stmt_patient_add_info, )
 
-        await self._session.commit()
+        await self._writer_session.commit()
 
     @override
     async def is_exists(self, patient_id: int) -> bool:
@@ -1,15 +1,24 @@
 from datetime import datetime
 
 from dishka.integrations.fastapi import inject, FromDishka
-from fastapi import APIRouter, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, status, UploadFile, File, Header
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 from storage_server.settings import AppSettings
 from storage_server.application.add_ctg_graphic_file import add_ctg_graphic_file
 from storage_server.application.dto.ctg_graphic_file import CTGGraphicFileAddInDTO
 from storage_server.application.exceptions.application import UnexpectedError
+from storage_server.application.exceptions.ctg_graphic_archive import (
+    ArchiveMemberNotFound,
+    ArchiveNotFound,
+    UploadTooLarge,
+)
 from storage_server.application.get_ctg_graphic_archive import get_ctg_graphic_archive_path
+from storage_server.application.get_ctg_graphic_file import get_ctg_graphic_file
 from storage_server.application.ports.ctg_history_repo import CTGHistoryRepository
+from storage_server.domain.ctg_graphic_archive import CTGGraphicArchive
+from storage_server.infrastructure.http_ranges import RangeNotSatisfiable, etag_matches, parse_range
+from storage_server.infrastructure.uploads import spool_upload, spooled_file
 
 router = APIRouter()
 
@@ -18,8 +27,9 @@ router = APIRouter()
 @inject
 async def get_ctg_graphic_archive(
         patient_id: int,
-        ctg_history_repo: FromDishka[CTGHistoryRepository]
-) -> FileResponse:
+        ctg_history_repo: FromDishka[CTGHistoryRepository],
+        if_none_match: str | None = Header(default=None),
+) -> Response:
     try:
         archive_path = await get_ctg_graphic_archive_path(patient_id, ctg_history_repo)
     except UnexpectedError:
@@ -27,7 +37,64 @@ async def get_ctg_graphic_archive(
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    return FileResponse(archive_path)
+    if not archive_path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Archive not found')
+
+    etag = CTGGraphicArchive(archive_path).etag
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    # FileResponse сам обслуживает Range-запросы к архиву
+    return FileResponse(archive_path, headers={'ETag': etag})
+
+@router.get("/file")
+@inject
+async def get_ctg_graphic_file_from_archive(
+        patient_id: int,
+        file_path_in_archive: str,
+        ctg_history_repo: FromDishka[CTGHistoryRepository],
+        range_header: str | None = Header(default=None, alias='Range'),
+        if_none_match: str | None = Header(default=None),
+) -> Response:
+    try:
+        member = await get_ctg_graphic_file(patient_id, file_path_in_archive, ctg_history_repo)
+    except (ArchiveNotFound, ArchiveMemberNotFound):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='File not found')
+    except UnexpectedError:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Unexpected error')
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    headers = {'ETag': member.etag, 'Accept-Ranges': 'bytes'}
+    if etag_matches(if_none_match, member.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        byte_range = parse_range(range_header, member.size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, 'Content-Range': f'bytes */{member.size}'},
+        )
+
+    if byte_range is None:
+        return StreamingResponse(
+            member.iter_bytes(),
+            media_type='text/csv',
+            headers={**headers, 'Content-Length': str(member.size)},
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        member.iter_bytes(start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type='text/csv',
+        headers={
+            **headers,
+            'Content-Length': str(end - start + 1),
+            'Content-Range': f'bytes {start}-{end}/{member.size}',
+        },
+    )
 
 @router.put("")
 @inject
@@ -42,18 +109,23 @@ async def add_ctg_graphic(
         datetime_real = datetime.strptime(ctg_datetime, "%Y%m%d%H%M%S")
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='invalid datetime')
-    try:
-        file = await upload_file.read()
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='invalid file')
-    dto = CTGGraphicFileAddInDTO(
-        patient_id=patient_id,
-        ctg_datetime=datetime_real,
-        file=file,
-    )
-    try:
-        await add_ctg_graphic_file(dto, ctg_history_repo, app_settings.archive_base_dir)
-    except UnexpectedError:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Unexpected error')
-    except Exception as err:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+    with spooled_file(suffix='.csv') as (spool, spool_path):
+        try:
+            await spool_upload(
+                upload_file, spool, app_settings.max_upload_size, app_settings.upload_chunk_size
+            )
+        except UploadTooLarge:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail='file too large')
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='invalid file')
+        dto = CTGGraphicFileAddInDTO(
+            patient_id=patient_id,
+            ctg_datetime=datetime_real,
+            file_path=spool_path,
+        )
+        try:
+            await add_ctg_graphic_file(dto, ctg_history_repo, app_settings.archive_base_dir)
+        except UnexpectedError:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Unexpected error')
+        except Exception as err:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
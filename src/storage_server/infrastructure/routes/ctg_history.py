@@ -1,5 +1,5 @@
 from dishka.integrations.fastapi import inject, FromDishka
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from starlette import status
 
 from storage_server.application.dto.ctg_history import CTGHistoryAddInDTO, CTGHistoryReadOutDTO
@@ -7,6 +7,7 @@ from storage_server.application.exceptions.application import UnexpectedError
 from storage_server.application.ports.ctg_history_repo import CTGHistoryRepository
 from storage_server.application.read_history import read_ctg_history
 from storage_server.application.save_ctg_history import save_ctg_history
+from storage_server.infrastructure.cache_invalidation import AppCacheNotifier
 
 router = APIRouter()
 
@@ -26,10 +27,14 @@ async def get_ctg_history(
 @router.put("")
 @inject
 async def create_ctg_history(
-        body: CTGHistoryAddInDTO, ctg_history_repo: FromDishka[CTGHistoryRepository]
+        body: CTGHistoryAddInDTO,
+        ctg_history_repo: FromDishka[CTGHistoryRepository],
+        notifier: FromDishka[AppCacheNotifier],
+        background_tasks: BackgroundTasks,
 ) -> None:
     try:
         await save_ctg_history(body, ctg_history_repo)
+        background_tasks.add_task(notifier.notify, ctg_patient_id=body.patient_id)
     except UnexpectedError:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Unexpected error')
     except Exception:
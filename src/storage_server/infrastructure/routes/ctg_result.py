@@ -1,5 +1,5 @@
 from dishka.integrations.fastapi import inject, FromDishka
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from starlette import status
 
 from storage_server.application.dto.ctg_result import CTGResultReadOutDTO, CTGResultAddInDTO
@@ -7,6 +7,7 @@ from storage_server.application.exceptions.application import UnexpectedError
 from storage_server.application.ports.ctg_result_repo import CTGResultRepository
 from storage_server.application.read_ctg_result import read_ctg_result
 from storage_server.application.save_ctg_result import save_ctg_result
+from storage_server.infrastructure.cache_invalidation import AppCacheNotifier
 
 router = APIRouter()
 
@@ -26,10 +27,14 @@ async def get_ctg_result(
 @router.put("")
 @inject
 async def create_ctg_result(
-        body: CTGResultAddInDTO, ctg_result_repo: FromDishka[CTGResultRepository]
+        body: CTGResultAddInDTO,
+        ctg_result_repo: FromDishka[CTGResultRepository],
+        notifier: FromDishka[AppCacheNotifier],
+        background_tasks: BackgroundTasks,
 ) -> None:
     try:
         await save_ctg_result(body, ctg_result_repo)
+        background_tasks.add_task(notifier.notify, ctg_id=body.ctg_id)
     except UnexpectedError:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Unexpected error')
     except Exception as err:
@@ -1,5 +1,5 @@
 from dishka.integrations.fastapi import inject, FromDishka
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
 
 from storage_server.application.create_patient import create_patient
 from storage_server.application.update_patient import update_patient
@@ -8,6 +8,7 @@ from storage_server.application.exceptions.application import PatientNotFound, U
 from storage_server.application.exceptions.patient_repository import PatientExists
 from storage_server.application.ports.patient_repo import PatientRepository
 from storage_server.application.read_patient import read_patient
+from storage_server.infrastructure.cache_invalidation import AppCacheNotifier
 
 router = APIRouter()
 
@@ -26,9 +27,15 @@ async def get_patient(patient_id: int, patient_repo: FromDishka[PatientRepositor
 
 @router.put("", status_code=status.HTTP_201_CREATED)
 @inject
-async def add_patient(patient: PatientAddInDTO, patient_repo: FromDishka[PatientRepository]) -> None:
+async def add_patient(
+        patient: PatientAddInDTO,
+        patient_repo: FromDishka[PatientRepository],
+        notifier: FromDishka[AppCacheNotifier],
+        background_tasks: BackgroundTasks,
+) -> None:
     try:
         await create_patient(patient, patient_repo)
+        background_tasks.add_task(notifier.notify, new_patient=True)
     except PatientExists:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Patient already exists")
     except UnexpectedError:
@@ -38,9 +45,15 @@ async def add_patient(patient: PatientAddInDTO, patient_repo: FromDishka[Patient
 
 @router.patch("")
 @inject
-async def update_patient_info(patient: PatientUpdateInDTO, patient_repo: FromDishka[PatientRepository]) -> None:
+async def update_patient_info(
+        patient: PatientUpdateInDTO,
+        patient_repo: FromDishka[PatientRepository],
+        notifier: FromDishka[AppCacheNotifier],
+        background_tasks: BackgroundTasks,
+) -> None:
     try:
         await update_patient(patient, patient_repo)
+        background_tasks.add_task(notifier.notify, patient_id=patient.id)
     except UnexpectedError as err:
         print(err)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error")
@@ -6,6 +6,7 @@ patients_table = Table(
     "patients", metadata,
     Column("id", Integer, primary_key=True),
     Column("full_name", String, nullable=False),
+    Column("name_key", String, nullable=False),  # full_name.casefold() — поиск в приложении
 )
 
 patient_info_table = Table(
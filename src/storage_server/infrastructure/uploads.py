@@ -0,0 +1,35 @@
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+from ..application.exceptions.ctg_graphic_archive import UploadTooLarge
+
+
+async def spool_upload(upload_file: UploadFile, dst: BinaryIO, max_size: int, chunk_size: int) -> int:
+    """Порционно переносит загружаемый файл в dst, не держа его целиком в памяти.
+
+    Raises:
+        UploadTooLarge: размер файла превысил max_size.
+    """
+    if upload_file.size is not None and upload_file.size > max_size:
+        raise UploadTooLarge
+
+    total = 0
+    while chunk := await upload_file.read(chunk_size):
+        total += len(chunk)
+        if total > max_size:
+            raise UploadTooLarge
+        dst.write(chunk)
+    dst.flush()
+    return total
+
+
+@contextmanager
+def spooled_file(suffix: str | None = None) -> Iterator[tuple[BinaryIO, Path]]:
+    """Временный файл на диске, удаляемый по выходу из контекста."""
+    with tempfile.NamedTemporaryFile(mode='w+b', suffix=suffix) as tmp:
+        yield tmp, Path(tmp.name)
@@ -7,7 +7,7 @@ from structlog.contextvars import bind_contextvars, unbind_contextvars
 
 from urllib.parse import parse_qsl, urlencode
 
-from app.logger import LogLike
+from storage_server.logger import LogLike
 
 
 class HTTPLogMiddleware:
@@ -2,6 +2,7 @@ from enum import Enum
 from functools import cached_property
 from pathlib import Path
 
+from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,10 +19,31 @@ class AppSettings(BaseSettings):
 
     run_mode: RunMode = 'dev'
     archive_base_dir: Path = Path(__file__).parents[2] / 'archives'
+    max_upload_size: int = 256 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
+    # POST /cache/invalidate основного приложения; без него кэш приложения живёт по TTL
+    app_cache_invalidate_url: str | None = None
+    # тот же секрет, что READ_CACHE_INVALIDATE_TOKEN у приложения
+    app_cache_invalidate_token: SecretStr | None = None
 
     def is_dev(self) -> bool:
         return self.run_mode == RunMode.DEV
 
+class CacheNotifierSettings(BaseSettings):
+    """HTTP-клиент уведомлений о сбросе кэша приложения (AppCacheNotifier)."""
+
+    # уведомление уходит фоновой задачей после ответа; долго ждать его незачем — кэш догонит по TTL
+    connect_timeout: float = 1.0
+    read_timeout: float = 2.0
+    write_timeout: float = 2.0
+    pool_timeout: float = 1.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    retries: int = 2
+
+    model_config = SettingsConfigDict(env_prefix='APP_CACHE_NOTIFIER_', extra='ignore')
+
 class HTTPServerSettings(BaseSettings):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -65,3 +87,28 @@ class DatabaseSettings(BaseSettings):
         )
 
     model_config = SettingsConfigDict(env_prefix='DB_', extra='allow')
+
+class WriteBehindSettings(BaseSettings):
+    """Пакетная запись одиночных INSERT'ов (итоги КТГ, история записей)."""
+
+    # сколько дополнительно ждать попутчиков после первой строки, сек; при 0 пачку
+    # составляют строки, пришедшие, пока шёл предыдущий сброс (group commit)
+    flush_interval: float = 0.0
+    max_batch: int = 500           # пачка пишется сразу, не дожидаясь интервала
+    slow_flush: float = 0.5        # порог предупреждения в логах, сек
+    latency_window: int = 1024     # по скольким последним сбросам считаются квантили
+
+    model_config = SettingsConfigDict(env_prefix='DB_WRITE_BEHIND_', extra='allow')
+
+class SQLiteSettings(BaseSettings):
+    """Профиль SQLite: применяется к каждому новому соединению (см. storage_server.infrastructure.sqlite)."""
+
+    journal_mode: str = 'WAL'        # читатели не блокируют писателя
+    synchronous: str = 'NORMAL'      # в WAL fsync только на checkpoint
+    busy_timeout_ms: int = 5000      # ждать лок вместо немедленного "database is locked"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024  # на соединение
+    reader_pool_size: int = 8
+    reader_max_overflow: int = 8
+
+    model_config = SettingsConfigDict(env_prefix='DB_SQLITE_', extra='allow')
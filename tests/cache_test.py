@@ -0,0 +1,138 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.common.cache import CTG_LISTS_TAG, PATIENTS_TAG, ReadCache, patient_ctgs_tag, patient_tag
+from app.modules.core.infra.routes.health import router as health_router
+from app.modules.core.settings import ReadCacheSettings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(clock: FakeClock, **settings: float) -> ReadCache:
+    return ReadCache(ReadCacheSettings(**settings), clock=clock)
+
+
+async def get(cache: ReadCache, key: tuple, value, tags=()) -> tuple[object, bool]:
+    """Значение по ключу и был ли вызван загрузчик."""
+    loaded = False
+
+    async def load():
+        nonlocal loaded
+        loaded = True
+        return value
+
+    return await cache.get_or_load(key, load, tags), loaded
+
+
+async def test_entry_expires_after_ttl() -> None:
+    clock = FakeClock()
+    cache = make_cache(clock, ttl=30)
+
+    assert await get(cache, ('patient', 1), 'a') == ('a', True)
+    clock.now = 29.9
+    assert await get(cache, ('patient', 1), 'b') == ('a', False)
+    clock.now = 30.0
+    assert await get(cache, ('patient', 1), 'b') == ('b', True)
+    assert cache.expirations == 1
+
+
+async def test_least_recently_read_entry_is_evicted() -> None:
+    cache = make_cache(FakeClock(), max_entries=2)
+
+    await get(cache, ('patient', 1), 1)
+    await get(cache, ('patient', 2), 2)
+    await get(cache, ('patient', 1), None)  # 1 прочитан позже 2
+    await get(cache, ('patient', 3), 3)
+
+    assert cache.evictions == 1
+    assert await get(cache, ('patient', 1), None) == (1, False)
+    assert await get(cache, ('patient', 2), 'reloaded') == ('reloaded', True)
+
+
+async def test_invalidate_drops_only_tagged_entries() -> None:
+    cache = make_cache(FakeClock())
+    await get(cache, ('patient', 1), 'p1', tags=(patient_tag(1),))
+    await get(cache, ('patients', None), 'page', tags=(PATIENTS_TAG,))
+    await get(cache, ('ctgs', 1), 'ctgs', tags=(patient_ctgs_tag(1),))
+
+    cache.invalidate_patient(1)
+
+    assert (await get(cache, ('patient', 1), 'new'))[1]
+    assert (await get(cache, ('patients', None), 'new'))[1]
+    assert await get(cache, ('ctgs', 1), 'new') == ('ctgs', False)
+
+
+async def test_load_racing_with_invalidation_is_not_cached() -> None:
+    cache = make_cache(FakeClock())
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await release.wait()
+        return 'stale'
+
+    task = asyncio.create_task(cache.get_or_load(('patient', 1), slow_load, (patient_tag(1),)))
+    await started.wait()
+    cache.invalidate_patient(1)  # запись закоммичена, пока загрузка читала старые данные
+    release.set()
+
+    assert await task == 'stale'
+    assert await get(cache, ('patient', 1), 'fresh') == ('fresh', True)
+    assert await get(cache, ('patient', 1), 'unused') == ('fresh', False)
+
+
+async def test_ctg_owner_map_is_bounded() -> None:
+    cache = make_cache(FakeClock(), max_ctg_owners=2)
+    await get(cache, ('ctgs', 1), 'ctgs1', tags=(patient_ctgs_tag(1),))
+    await get(cache, ('ctgs', 2), 'ctgs2', tags=(patient_ctgs_tag(2),))
+
+    cache.remember_ctgs(1, [10, 11])
+    cache.remember_ctgs(2, [20, None])
+    assert cache.to_dict()['ctg_owners'] == 2
+
+    # владелец КТГ 20 известен — сбрасываются только списки пациента 2
+    cache.invalidate_ctg(20)
+    assert await get(cache, ('ctgs', 1), None) == ('ctgs1', False)
+    assert (await get(cache, ('ctgs', 2), 'new'))[1]
+
+    # владелец КТГ 10 вытеснен — сбрасываются списки всех пациентов
+    await get(cache, ('ctg_lists', 1), 'all', tags=(patient_ctgs_tag(1), CTG_LISTS_TAG))
+    cache.invalidate_ctg(10)
+    assert (await get(cache, ('ctg_lists', 1), 'new'))[1]
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    provider = Provider(scope=Scope.APP)
+    provider.provide(
+        lambda: ReadCache(ReadCacheSettings(invalidate_token='secret')),
+        provides=ReadCache,
+    )
+    app = FastAPI()
+    app.include_router(health_router)
+    setup_dishka(make_async_container(provider), app)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize('headers', [{}, {'X-Cache-Token': 'wrong'}], ids=['missing', 'wrong'])
+def test_invalidate_endpoint_requires_token(client: TestClient, headers: dict[str, str]) -> None:
+    response = client.post('/cache/invalidate', json={'patient_id': 1}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_invalidate_endpoint_accepts_token(client: TestClient) -> None:
+    response = client.post('/cache/invalidate', json={'patient_id': 1}, headers={'X-Cache-Token': 'secret'})
+    assert response.status_code == 204
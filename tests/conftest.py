@@ -0,0 +1,5 @@
+import os
+
+# модули настроек читают окружение при импорте; test.env (pytest-dotenv) может их переопределить
+os.environ.setdefault('EMULATOR_URI', 'http://emulator:8000/')
+os.environ.setdefault('API_VERSION', '1')
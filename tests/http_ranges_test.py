@@ -0,0 +1,111 @@
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from storage_server.application.ports.ctg_history_repo import CTGHistoryRepository
+from storage_server.infrastructure.http_ranges import RangeNotSatisfiable, etag_matches, parse_range
+from storage_server.infrastructure.routes.ctg_graphic_archive import router as ctg_graphic_archive_router
+
+SIZE = 100
+
+
+@pytest.mark.parametrize(('header', 'expected'), [
+    ('bytes=0-9', (0, 9)),
+    ('bytes=90-200', (90, 99)),      # конец за пределами файла обрезается
+    ('bytes=10-', (10, 99)),         # открытый диапазон — до конца файла
+    ('bytes=-10', (90, 99)),         # последние 10 байт
+    ('bytes=-500', (0, 99)),         # суффикс длиннее файла — весь файл
+    ('BYTES = 5-5', (5, 5)),
+])
+def test_parse_range(header: str, expected: tuple[int, int]) -> None:
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize('header', [
+    None,
+    '',
+    'bytes=0-9,20-29',  # несколько диапазонов — отдаём файл целиком
+    'items=0-9',
+    'bytes=9-0',
+    'bytes=abc-',
+    'bytes=10',
+])
+def test_parse_range_falls_back_to_full_body(header: str | None) -> None:
+    assert parse_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize('header', ['bytes=100-', 'bytes=150-200', 'bytes=-0'])
+def test_parse_range_not_satisfiable(header: str) -> None:
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, SIZE)
+
+
+@pytest.mark.parametrize(('header', 'expected'), [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", W/"abc"', True),
+    ('*', True),
+    ('"x", "y"', False),
+])
+def test_etag_matches(header: str | None, expected: bool) -> None:
+    assert etag_matches(header, '"abc"') is expected
+
+
+class ArchiveRepository:
+    def __init__(self, archive_path: Path):
+        self.archive_path = archive_path
+
+    async def get_archive_path(self, patient_id: int) -> Path:
+        return self.archive_path
+
+
+@pytest.fixture
+def client(tmp_path: Path) -> Iterator[TestClient]:
+    archive_path = tmp_path / 'archive.zip'
+    with zipfile.ZipFile(archive_path, 'w') as zf:
+        zf.writestr('ctg.csv', bytes(range(SIZE)))
+
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: ArchiveRepository(archive_path), provides=CTGHistoryRepository)
+    app = FastAPI()
+    app.include_router(ctg_graphic_archive_router, prefix='/ctg_graphic_archive')
+    setup_dishka(make_async_container(provider), app)
+    with TestClient(app) as client:
+        yield client
+
+
+def get_member(client: TestClient, **headers: str):
+    return client.get(
+        '/ctg_graphic_archive/file',
+        params={'patient_id': 1, 'file_path_in_archive': 'ctg.csv'},
+        headers=headers,
+    )
+
+
+def test_range_request_returns_partial_content(client: TestClient) -> None:
+    response = get_member(client, Range='bytes=-10')
+
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f'bytes 90-99/{SIZE}'
+    assert response.headers['Content-Length'] == '10'
+    assert response.content == bytes(range(90, 100))
+
+
+def test_range_past_the_end_returns_416(client: TestClient) -> None:
+    response = get_member(client, Range=f'bytes={SIZE}-')
+
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f'bytes */{SIZE}'
+
+
+def test_matching_etag_returns_304(client: TestClient) -> None:
+    etag = get_member(client).headers['ETag']
+
+    assert get_member(client, **{'If-None-Match': f'W/{etag}'}).status_code == 304
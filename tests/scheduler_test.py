@@ -0,0 +1,84 @@
+import pytest
+
+from app.modules.ml.infrastucture.services.context import StreamContext
+from app.modules.ml.infrastucture.services.scheduler import StageScheduler
+from app.modules.ml.infrastucture.services.stages import TachyBradyStage
+from app.modules.ml.settings import StageSchedulerSettings
+
+
+class Recorder:
+    """Стадия-заглушка: запоминает секунды запусков и версию входа на момент запуска."""
+
+    def __init__(self, every: int = 1, staggered: bool = False, inputs: tuple[str, ...] = ()):
+        self.every = every
+        self.staggered = staggered
+        self.inputs = inputs
+        self.runs: list[tuple[int, int]] = []
+
+    def tick(self, ctx: StreamContext) -> None:
+        self.runs.append((ctx.now_t, ctx.versions.get('median_fhr_10min', 0)))
+
+
+def run(scheduler: StageScheduler, ctx: StreamContext, seconds: int) -> None:
+    for t in range(1, seconds + 1):
+        ctx.now_t = t
+        for slot in scheduler.slots:
+            if slot.should_run(ctx):
+                slot.stage.tick(ctx)
+
+
+def test_sessions_get_different_offsets_for_staggered_stages() -> None:
+    settings = StageSchedulerSettings(stagger=True, phase_stride=7)
+    offsets = [
+        StageScheduler([Recorder(every=60, staggered=True)], StreamContext(), settings).slots[0].offset
+        for _ in range(2)
+    ]
+    assert offsets[0] != offsets[1]
+    assert all(0 <= offset < 60 for offset in offsets)
+
+
+# каждый StageScheduler — новая сессия со своей фазой; восемь сессий покрывают разные сдвиги
+@pytest.mark.parametrize('session', range(8))
+def test_consumer_runs_only_after_producer_update(session: int) -> None:
+    ctx = StreamContext()
+    producer = TachyBradyStage()
+    consumer = Recorder(every=60, staggered=True, inputs=('median_fhr_10min',))
+    settings = StageSchedulerSettings(stagger=True, phase_stride=7)
+    scheduler = StageScheduler([producer, consumer], ctx, settings)
+
+    updates: list[int] = []
+    for t in range(1, 301):
+        ctx.now_t = t
+        for slot in scheduler.slots:
+            before = ctx.versions['median_fhr_10min']
+            if slot.should_run(ctx):
+                slot.stage.tick(ctx)
+            if ctx.versions['median_fhr_10min'] != before:
+                updates.append(t)
+
+    assert consumer.runs
+    seen = 0
+    for t, version in consumer.runs:
+        # медиана пересчитана в эту же секунду, до потребителя
+        assert t in updates
+        assert version > seen
+        seen = version
+
+
+def test_stage_skips_when_inputs_are_unchanged() -> None:
+    ctx = StreamContext()
+    stage = Recorder(inputs=('samples',))
+    scheduler = StageScheduler([stage], ctx, StageSchedulerSettings(stagger=False))
+
+    run(scheduler, ctx, 3)
+    assert [t for t, _ in stage.runs] == [1]
+
+    ctx.versions['samples'] += 1
+    run(scheduler, ctx, 3)
+    assert [t for t, _ in stage.runs] == [1, 1]
+
+
+def test_consumer_before_producer_is_rejected() -> None:
+    consumer = Recorder(every=60, staggered=True, inputs=('median_fhr_10min',))
+    with pytest.raises(ValueError, match='median_fhr_10min'):
+        StageScheduler([consumer, TachyBradyStage()], StreamContext(), StageSchedulerSettings())
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from app.modules.ml.infrastucture.services.stv import (
+    EPOCHS_PER_MINUTE,
+    STV_WINDOW_MIN,
+    STVTracker,
+    epoch_means,
+    rolling_stv_from_epochs,
+    stv_from_epochs,
+)
+
+FS = 5
+MINUTES = 45
+
+
+def nan_heavy_fhr(seed: int = 7) -> np.ndarray:
+    """45 минут FHR: треть отсчётов потеряна, плюс провал датчика на полторы минуты."""
+    rng = np.random.default_rng(seed)
+    n = MINUTES * 60 * FS
+    t = np.arange(n) / FS
+    fhr = 140 + 8 * np.sin(2 * np.pi * t / 90) + rng.normal(0, 2, n)
+    fhr[rng.random(n) < 0.35] = np.nan
+    fhr[12 * 60 * FS:int(13.5 * 60 * FS)] = np.nan
+    return fhr
+
+
+def batch_window_stv(means: np.ndarray) -> float:
+    return stv_from_epochs(means[-STV_WINDOW_MIN * EPOCHS_PER_MINUTE:])
+
+
+def batch_rolling_mean(means: np.ndarray) -> float:
+    rolling = rolling_stv_from_epochs(means)
+    rolling = rolling[~np.isnan(rolling)]
+    return float(rolling.mean()) if len(rolling) else np.nan
+
+
+@pytest.mark.parametrize('noisy', [False, True], ids=['ordered', 'duplicates_and_rollbacks'])
+def test_tracker_matches_batch_stv(noisy: bool) -> None:
+    fhr = nan_heavy_fhr()
+    times = np.arange(len(fhr)) / FS
+    rng = np.random.default_rng(11)
+    tracker = STVTracker(fs=FS)
+
+    for end in range(FS, len(fhr) + 1, FS):
+        chunk_t, chunk_v = times[end - FS:end], fhr[end - FS:end]
+        if noisy and end > FS:
+            # повтор последней принятой метки и откат назад внутри пачки — оба отбрасываются
+            back = times[max(0, end - FS - 1 - rng.integers(0, 3 * FS))]
+            chunk_t = np.concatenate(([times[end - FS - 1]], chunk_t[:2], [back], chunk_t[2:], [chunk_t[-1]]))
+            chunk_v = np.concatenate(([1000.0], chunk_v[:2], [-1000.0], chunk_v[2:], [1000.0]))
+        tracker.push(chunk_t, chunk_v)
+
+        means = epoch_means(fhr[:end], FS)
+        assert tracker.samples == end
+        assert tracker.epochs == len(means)
+        np.testing.assert_allclose(tracker.window_stv(), batch_window_stv(means), rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(tracker.total_stv(), stv_from_epochs(means), rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(tracker.rolling_mean_stv(), batch_rolling_mean(means), rtol=1e-12, equal_nan=True)
+
+    assert not np.isnan(tracker.total_stv())
+    assert not np.isnan(tracker.rolling_mean_stv())
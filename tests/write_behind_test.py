@@ -0,0 +1,90 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.common.write_behind import WriteBehindWriter
+from app.modules.core.settings import WriteBehindSettings
+
+_INSERT = text('INSERT INTO items (name) VALUES (:name)')
+_INSERT_RETURNING = text('INSERT INTO items (name) VALUES (:name) RETURNING id')
+
+
+@pytest.fixture
+async def engine(tmp_path) -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/write_behind.db')
+    async with engine.begin() as conn:
+        await conn.execute(text('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)'))
+    yield engine
+    await engine.dispose()
+
+
+def make_writer(engine: AsyncEngine, **settings: float) -> WriteBehindWriter:
+    return WriteBehindWriter(async_sessionmaker(bind=engine), WriteBehindSettings(**settings))
+
+
+async def names(engine: AsyncEngine) -> list[str]:
+    async with engine.connect() as conn:
+        return list((await conn.execute(text('SELECT name FROM items ORDER BY id'))).scalars())
+
+
+async def test_failed_batch_fails_only_the_bad_row(engine: AsyncEngine) -> None:
+    writer = make_writer(engine)
+    writer.start()
+
+    results = await asyncio.gather(
+        *(writer.submit(_INSERT, {'name': name}) for name in ('a', 'b', 'a', 'c')),
+        return_exceptions=True,
+    )
+    await writer.close()
+
+    assert results[0] is None
+    assert results[1] is None
+    assert isinstance(results[2], IntegrityError)
+    assert results[3] is None
+    assert await names(engine) == ['a', 'b', 'c']
+    assert writer.errors == 1
+
+
+async def test_returning_gives_each_caller_its_own_id(engine: AsyncEngine) -> None:
+    writer = make_writer(engine)
+    writer.start()
+
+    ids = await asyncio.gather(
+        *(writer.submit(_INSERT_RETURNING, {'name': f'n{i}'}, returning=True) for i in range(5))
+    )
+    await writer.close()
+
+    async with engine.connect() as conn:
+        by_name = dict((await conn.execute(text('SELECT name, id FROM items'))).all())
+    assert ids == [by_name[f'n{i}'] for i in range(5)]
+    assert len(set(ids)) == 5
+
+
+async def test_close_writes_queued_rows(engine: AsyncEngine) -> None:
+    # интервал больше времени теста: до close() пачка сама не сбросится
+    writer = make_writer(engine, flush_interval=60.0)
+    writer.start()
+    pending = [asyncio.create_task(writer.submit(_INSERT, {'name': name})) for name in ('x', 'y')]
+    await asyncio.sleep(0)
+    assert writer.to_dict()['pending'] == 2
+
+    await writer.close()
+
+    assert await asyncio.gather(*pending) == [None, None]
+    assert await names(engine) == ['x', 'y']
+
+
+async def test_submit_after_close_writes_immediately(engine: AsyncEngine) -> None:
+    writer = make_writer(engine, flush_interval=60.0)
+    writer.start()
+    await writer.close()
+
+    new_id = await asyncio.wait_for(writer.submit(_INSERT_RETURNING, {'name': 'late'}, returning=True), 1.0)
+
+    assert new_id == 1
+    assert await names(engine) == ['late']
+    assert writer.to_dict()['pending'] == 0